@@ -5,26 +5,105 @@ import streamlit as st
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(PROJECT_ROOT)
 
-from guardrails.decision_safety import decision_safety_engine
-from guardrails.risk_scoring import risk_aware_decision_engine
-from guardrails.safety_rules import apply_guardrails
-from temporal.trend_analysis import analyze_trend
-
-
-
-from cv.thermal_preprocessing import preprocess_thermal_image
-from cv.anomaly_detection import detect_thermal_anomaly
-from cv.fault_interpretation import interpret_motor_fault
-from rag.vector_store import MaintenanceVectorStore
-from llm.prompt_templates import build_prompt
-from llm.llama_inference import MaintenanceLLM
+from temporal.feature_store import FeatureStore
+from llm.model_client import ModelClient, ModelServerUnavailable
+from llm.decision_cache import DecisionCache
+from llm.model_server import DEFAULT_MODEL_PATH
+from pipeline.copilot import DEFAULT_QUERY, HEAVY_MODULES, build_copilot_pipeline
+from pipeline.lazy import preload
+from pipeline.metrics import MetricsRecorder, waterfall_rows
 
 st.set_page_config(page_title="Thermal Maintenance Copilot", layout="centered")
 
 st.title("🔥 Explainable Thermal Predictive Maintenance LLM")
 st.caption("Decision-support tool for industrial motor maintenance")
 
-MODEL_PATH = "C:/llama-b7613-bin-win-cuda-12.4-x64/models/mistral-7b-instruct-v0.2.Q4_K_M.gguf"
+MODEL_PATH = DEFAULT_MODEL_PATH
+
+
+# -------------------------
+# Resources (built once per process, reused by every rerun)
+# -------------------------
+@st.cache_resource
+def get_client():
+    # Warm models: served by llm.model_server, or loaded once per process
+    # on the first retrieval/generation call
+    return ModelClient(
+        local_fallback=True,
+        model_path=MODEL_PATH,
+        n_threads=8,
+        n_gpu_layers=20
+    )
+
+
+@st.cache_resource
+def get_decision_cache():
+    return DecisionCache()
+
+
+@st.cache_resource
+def get_feature_store():
+    return FeatureStore()
+
+
+@st.cache_resource
+def get_metrics_recorder():
+    # Stage metrics: JSON lines file and an optional Prometheus endpoint
+    recorder = MetricsRecorder(jsonl_path=os.environ.get("COPILOT_PIPELINE_METRICS"))
+    port = os.environ.get("COPILOT_METRICS_PORT")
+    if port:
+        recorder.serve(port=int(port))
+    return recorder
+
+
+def render_llm_stream(chunks):
+    # Schema-constrained JSON, rendered token by token
+    st.caption("🤖 LLM output (live)")
+    return st.write_stream(chunks)
+
+
+@st.cache_resource
+def get_copilot():
+    return build_copilot_pipeline(
+        get_client(),
+        decision_cache=get_decision_cache(),
+        feature_store=get_feature_store(),
+        render_stream=render_llm_stream,
+        namespace=MODEL_PATH,
+        recorder=get_metrics_recorder()
+    )
+
+
+@st.cache_resource
+def warm_up_imports():
+    # cv2/pydantic/numpy load in the background after the first render
+    return preload(*HEAVY_MODULES)
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def model_health():
+    try:
+        return get_client().health(), None
+    except ModelServerUnavailable as exc:
+        return None, str(exc)
+
+
+decision_cache = get_decision_cache()
+
+with st.sidebar:
+    st.subheader("Model server")
+    health, health_error = model_health()
+    if health_error is None:
+        st.json(health)
+    else:
+        st.info(f"{health_error} Falling back to in-process models.")
+
+    st.subheader("Decision cache")
+    bypass_cache = st.checkbox(
+        "Bypass decision cache", value=False,
+        help="Always run the LLM; the fresh decision still refreshes the cache"
+    )
+    st.json(decision_cache.stats())
 
 # -------------------------
 # Session State
@@ -32,8 +111,10 @@ MODEL_PATH = "C:/llama-b7613-bin-win-cuda-12.4-x64/models/mistral-7b-instruct-v0
 if "results" not in st.session_state:
     st.session_state.results = None
 
-if "feature_history" not in st.session_state:
-    st.session_state.feature_history = []  # for STEP-3
+asset_id = st.text_input(
+    "Asset ID", value="motor-001",
+    help="Inspections are stored per asset; the trend uses this asset's history"
+)
 
 uploaded_file = st.file_uploader(
     "Upload a motor thermal image",
@@ -46,63 +127,30 @@ if uploaded_file:
     if st.button("Analyze Thermal Image"):
         with st.spinner("Running full analysis..."):
 
-            image_path = "temp_uploaded_image.png"
-            with open(image_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-
-            # ---- CV ----
-            img = preprocess_thermal_image(image_path)
-            features, _ = detect_thermal_anomaly(img)
-
-            # ---- STEP-3: store temporal history ----
-            st.session_state.feature_history.append({
-                "severity_score": features["severity_score"],
-                "temperature_delta": features["temperature_delta"]
-            })
-
-            fault_info = interpret_motor_fault(features)
-
-            # ---- RAG ----
-            store = MaintenanceVectorStore()
-            retrieved_logs = store.retrieve(
-                "Motor bearing overheating with localized hotspot"
+            # ---- CV -> RAG -> LLM -> Guardrails -> Trend ----
+            # Decoded straight from this session's upload buffer: no temp
+            # file shared between concurrent users
+            ctx, run_metrics = get_copilot().run(
+                image_bytes=uploaded_file.getbuffer(),
+                asset_id=asset_id,
+                query=DEFAULT_QUERY,
+                bypass_cache=bypass_cache
             )
 
-            # ---- LLM ----
-            prompt = build_prompt(features, fault_info, retrieved_logs)
-            llm = MaintenanceLLM(
-                model_path=MODEL_PATH,
-                n_threads=8,
-                n_gpu_layers=20
-            )
-
-            llm_response = llm.generate(prompt)
-            final_decision = apply_guardrails(llm_response)
-
-            # ---- Guardrails ----
-            safety_report = decision_safety_engine(
-                features, fault_info, retrieved_logs,
-                final_decision.model_dump()
-            )
-
-            risk_report = risk_aware_decision_engine(
-                fault_info, retrieved_logs,
-                final_decision.model_dump()
-            )
-
-            # ---- STEP-3: Temporal Trend Analysis ----
-            trend_report = analyze_trend(st.session_state.feature_history)
+            if ctx["cached"] is not None:
+                st.caption(f"⚡ Cached decision ({ctx['cached']['age_s']:.0f}s old)")
 
             # ---- Save all results ----
             st.session_state.results = {
-                "features": features,
-                "fault_info": fault_info,
-                "retrieved_logs": retrieved_logs,
-                "llm_response": llm_response,
-                "final_decision": final_decision,
-                "safety_report": safety_report,
-                "risk_report": risk_report,
-                "trend_report": trend_report
+                "features": ctx["features"],
+                "fault_info": ctx["fault_info"],
+                "retrieved_logs": ctx["retrieved_logs"],
+                "llm_response": ctx["llm_response"],
+                "final_decision": ctx["final_decision"],
+                "safety_report": ctx["safety_report"],
+                "risk_report": ctx["risk_report"],
+                "trend_report": ctx["trend_report"],
+                "pipeline_metrics": run_metrics
             }
 
 # -------------------------
@@ -152,3 +200,26 @@ if st.session_state.results:
         st.warning("⚠️ TREND: Slowly worsening — plan maintenance")
     else:
         st.success("🟢 TREND: Stable — continue monitoring")
+
+    # -------------------------
+    # Stage latency breakdown
+    # -------------------------
+    st.subheader("⏱ Pipeline Latency Breakdown")
+    rows = waterfall_rows(r["pipeline_metrics"])
+    st.vega_lite_chart(
+        [row for row in rows if row["status"] != "skipped"],
+        {
+            "mark": {"type": "bar", "tooltip": True},
+            "encoding": {
+                "y": {"field": "stage", "type": "nominal", "sort": None, "title": None},
+                "x": {"field": "start_ms", "type": "quantitative", "title": "ms since start"},
+                "x2": {"field": "end_ms"},
+                "color": {"field": "status", "type": "nominal", "legend": None},
+            },
+        },
+        use_container_width=True
+    )
+    st.dataframe(rows, use_container_width=True)
+
+# Everything above is rendered; start importing the analysis stack
+warm_up_imports()
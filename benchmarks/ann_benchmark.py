@@ -0,0 +1,142 @@
+"""
+Recall / latency / memory benchmark of the FAISS index types in
+rag.index_factory on a synthetic maintenance-log corpus.
+
+    python benchmarks/ann_benchmark.py --records 200000 --k 5
+    python benchmarks/ann_benchmark.py --records 1000000 --random-templates
+
+The corpus expands the maintenance_logs.json schema (equipment, pattern,
+failure mode, root cause, action, downtime, cost). Distinct templates are
+embedded with the real sentence encoder; each synthetic record is its
+template's embedding plus small noise, so the corpus has the clustered
+structure of real incident text without encoding a million strings.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import faiss
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from rag.documents import EMBEDDING_MODEL, log_to_document
+from rag.index_factory import INDEX_TYPES, build_index, configure_search
+from benchmarks.synthetic import OBSERVED_TEMPERATURES, schema_combinations
+
+def synthetic_templates(n_templates, rng):
+    fields, combos = schema_combinations()
+    picks = rng.choice(len(combos), size=min(n_templates, len(combos)), replace=False)
+
+    templates = []
+    for i in picks:
+        log = dict(zip(fields, combos[i]))
+        log["observed_temperature"] = str(rng.choice(OBSERVED_TEMPERATURES))
+        log["downtime_hours"] = int(rng.integers(1, 12))
+        log["repair_cost_usd"] = int(rng.integers(100, 5000))
+        templates.append(log_to_document(log))
+    return templates
+
+
+def embed_templates(templates, random_templates, rng):
+    if random_templates:
+        vectors = rng.normal(size=(len(templates), 384)).astype(np.float32)
+    else:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(EMBEDDING_MODEL)
+        vectors = model.encode(templates, convert_to_numpy=True, batch_size=256)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def jitter(template_vectors, n, noise, rng):
+    idx = rng.integers(0, len(template_vectors), size=n)
+    vectors = template_vectors[idx] + rng.normal(
+        scale=noise, size=(n, template_vectors.shape[1])
+    ).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def measure(index, queries, k, ground_truth):
+    latencies = []
+    found = np.empty((len(queries), k), dtype=np.int64)
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], k)
+        latencies.append((time.perf_counter() - start) * 1e3)
+        found[i] = ids[0]
+
+    recall = np.mean([
+        len(set(found[i]) & set(ground_truth[i])) / k for i in range(len(queries))
+    ]) if ground_truth is not None else 1.0
+
+    return {
+        "recall_at_k": round(float(recall), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        "memory_mb": round(faiss.serialize_index(index).nbytes / 1e6, 2),
+    }, found
+
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    faiss.omp_set_num_threads(args.threads)
+
+    templates = synthetic_templates(args.templates, rng)
+    template_vectors = embed_templates(templates, args.random_templates, rng)
+    corpus = jitter(template_vectors, args.records, args.noise, rng)
+    queries = jitter(template_vectors, args.queries, args.noise, rng)
+    ids = np.arange(args.records, dtype=np.int64)
+
+    results = []
+    ground_truth = None
+    for index_type in ["flat"] + [t for t in args.index_types if t != "flat"]:
+        start = time.perf_counter()
+        index = build_index(
+            index_type, corpus[:args.train_size],
+            nlist=args.nlist, pq_m=args.pq_m, hnsw_m=args.hnsw_m
+        )
+        index.add_with_ids(corpus, ids)
+        build_s = time.perf_counter() - start
+
+        configure_search(index, nprobe=args.nprobe, ef_search=args.ef_search)
+        metrics, found = measure(index, queries, args.k, ground_truth)
+        if index_type == "flat":
+            ground_truth = found
+
+        row = {
+            "benchmark": "ann_index",
+            "index_type": index_type,
+            "records": args.records,
+            "k": args.k,
+            "build_s": round(build_s, 2),
+            **metrics,
+        }
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--templates", type=int, default=5000)
+    parser.add_argument("--noise", type=float, default=0.03)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--index-types", nargs="+", choices=INDEX_TYPES, default=list(INDEX_TYPES))
+    parser.add_argument("--train-size", type=int, default=100_000)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--random-templates", action="store_true",
+                        help="skip the sentence encoder (offline smoke runs)")
+    run(parser.parse_args())
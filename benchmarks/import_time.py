@@ -0,0 +1,112 @@
+"""
+Cold import-time report (python -X importtime) for the copilot's entry
+points and heavy backends.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py demo pipeline.copilot --top 10
+
+Each module is imported in a fresh interpreter (best of --runs), and the
+heaviest nested imports are listed so a regression can be traced to the
+dependency that caused it.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# What `streamlit run app/ui.py` and `python demo.py` pay before the first
+# render / output, then the backends that should only load on first use
+DEFAULT_MODULES = (
+    "demo",
+    "pipeline.copilot",
+    "llm.model_client",
+    "llm.decision_cache",
+    "temporal.feature_store",
+    "cv.anomaly_detection",
+    "guardrails.output_schema",
+    "rag.vector_store",
+    "llm.llama_inference",
+)
+
+
+def parse_importtime(stderr):
+    """
+    "import time: self [us] | cumulative | imported package" lines ->
+    [{"module", "depth", "self_us", "cumulative_us"}, ...] in output order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        entries.append({
+            "module": stripped.strip(),
+            # nested imports are indented by two spaces per level
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return entries
+
+
+def import_time(module, runs=3, top=5, python=sys.executable):
+    """
+    Best-of-runs cold import of `module` with the top nested imports of
+    that run, or {"error": ...} when the module cannot be imported here
+    """
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            last_line = (proc.stderr.strip().splitlines() or ["import failed"])[-1]
+            return {"module": module, "error": last_line}
+
+        entries = parse_importtime(proc.stderr)
+        # Children are printed before their parent: the module's subtree is
+        # everything after the previous top-level entry (interpreter startup)
+        end = max(i for i, e in enumerate(entries) if e["module"] == module and e["depth"] == 0)
+        start = max([i for i in range(end) if entries[i]["depth"] == 0], default=-1) + 1
+        if best is None or entries[end]["cumulative_us"] < best[0]["cumulative_us"]:
+            best = (entries[end], entries[start:end])
+
+    total, subtree = best
+    heaviest = sorted(
+        (e for e in subtree if e["depth"] == 1),
+        key=lambda e: e["cumulative_us"], reverse=True
+    )[:top]
+    return {
+        "module": module,
+        "cumulative_ms": round(total["cumulative_us"] / 1e3, 3),
+        "modules_imported": len(subtree) + 1,
+        "heaviest": {e["module"]: round(e["cumulative_us"] / 1e3, 3) for e in heaviest},
+    }
+
+
+def import_time_report(modules=DEFAULT_MODULES, runs=3, top=5):
+    return [import_time(m, runs=runs, top=top) for m in modules]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold import-time report")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5,
+                        help="Heaviest nested imports listed per module")
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    args = parser.parse_args()
+
+    for result in import_time_report(args.modules, runs=args.runs, top=args.top):
+        if args.json:
+            print(json.dumps(result))
+        elif "error" in result:
+            print(f"{result['module']:<28}{'unavailable':>12}  {result['error']}")
+        else:
+            heaviest = ", ".join(f"{m} {ms:.0f}ms" for m, ms in result["heaviest"].items())
+            print(f"{result['module']:<28}{result['cumulative_ms']:>10.1f}ms  {heaviest}")
@@ -0,0 +1,96 @@
+"""
+Stand-in LLM backend with configurable latency, so the rest of the copilot
+can be benchmarked without loading a 7B model.
+"""
+import json
+import time
+
+import numpy as np
+
+MOCK_FAILURE_MODES = ("bearing_overheating", "bearing_wear", "shaft_misalignment")
+
+
+class MockLLM:
+    """
+    Mirrors MaintenanceLLM's generate / generate_stream / generate_batch.
+
+    Latency model: prefill_s before the first token, then tokens_per_s for
+    the ~N whitespace tokens of the response. Structured mode returns a
+    schema-valid MaintenanceDecision JSON object.
+    """
+
+    batched_decoding = True
+
+    def __init__(self, prefill_s=0.05, tokens_per_s=40.0, seed=0):
+        self.prefill_s = prefill_s
+        self.tokens_per_s = tokens_per_s
+        self.rng = np.random.default_rng(seed)
+        self.calls = 0
+
+    def _response(self, structured):
+        failure_mode = str(self.rng.choice(MOCK_FAILURE_MODES))
+        confidence = round(float(self.rng.uniform(0.5, 0.95)), 2)
+        if structured:
+            return json.dumps({
+                "failure_mode": failure_mode,
+                "reasoning": "Localized hotspot consistent with the retrieved incidents.",
+                "recommended_action": "Inspect bearing condition and lubrication.",
+                "downtime_hours_min": 2,
+                "downtime_hours_max": 6,
+                "repair_cost_usd_min": 300,
+                "repair_cost_usd_max": 1500,
+                "confidence": confidence,
+            })
+        return (
+            f"- Failure mode: {failure_mode}\n"
+            "- Reasoning: Localized hotspot consistent with the retrieved incidents.\n"
+            "- Recommended action: Inspect bearing condition and lubrication.\n"
+            "- Downtime: 2-6 hours\n"
+            "- Repair cost: 300-1500 USD\n"
+            f"- Confidence level: {confidence}"
+        )
+
+    def _token_delay(self):
+        return 1.0 / self.tokens_per_s if self.tokens_per_s else 0.0
+
+    def generate_stream(self, prompt, structured=False):
+        self.calls += 1
+        time.sleep(self.prefill_s)
+        delay = self._token_delay()
+        for token in self._response(structured).split(" "):
+            time.sleep(delay)
+            yield token + " "
+
+    def generate(self, prompt, structured=False):
+        return "".join(self.generate_stream(prompt, structured)).strip()
+
+    def generate_batch(self, prompts, structured=False):
+        # One prefill for the batch, then decode steps shared by all rows
+        self.calls += len(prompts)
+        texts = [self._response(structured) for _ in prompts]
+        steps = max(len(t.split(" ")) for t in texts)
+        time.sleep(self.prefill_s + steps * self._token_delay())
+        return texts
+
+
+class MockClient:
+    """
+    ModelClient look-alike: real retrieval from a MaintenanceVectorStore
+    (or any object with retrieve()), mock generation
+    """
+
+    def __init__(self, store, llm):
+        self.store = store
+        self.llm = llm
+
+    def retrieve(self, query_text, top_k=3, filters=None):
+        return self.store.retrieve(query_text, top_k=top_k, filters=filters)
+
+    def retrieve_many(self, query_texts, top_k=3, filters=None):
+        return self.store.retrieve_many(query_texts, top_k=top_k, filters=filters)
+
+    def generate(self, prompt, structured=False):
+        return self.llm.generate(prompt, structured=structured)
+
+    def generate_stream(self, prompt, structured=False):
+        return self.llm.generate_stream(prompt, structured=structured)
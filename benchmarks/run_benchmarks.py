@@ -0,0 +1,354 @@
+"""
+Benchmark harness for the whole copilot: one microbenchmark per module and
+a macro throughput run of the full pipeline with a mock LLM.
+
+    python benchmarks/run_benchmarks.py --images 200 --size 256 --logs 5000 \
+        --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json --tolerance 0.25
+
+An import suite reports cold import times (python -X importtime) of the
+entry points. Every result is printed as a JSON line; --output writes them all, with the
+environment and configuration, to one JSON document. --compare exits with
+status 1 when a result is slower than the baseline by more than tolerance
+and by more than the measured noise (microbenchmarks run --rounds times;
+see compare).
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.import_time import DEFAULT_MODULES, import_time
+from benchmarks.mock_llm import MockClient, MockLLM
+from benchmarks.synthetic import (
+    BENCHMARK_FAULT_MIX,
+    parse_fault_mix,
+    synthetic_maintenance_logs,
+    write_image_dataset,
+    write_maintenance_logs,
+)
+from cv.thermal_preprocessing import preprocess_thermal_image
+from cv.anomaly_detection import detect_thermal_anomaly
+from cv.fault_interpretation import interpret_motor_fault
+from guardrails.safety_rules import apply_guardrails, parse_structured_decision
+from llm.prompt_templates import build_prompt
+from pipeline.copilot import build_copilot_pipeline
+from pipeline.overlapped import OverlappedPipeline
+from temporal.trend_analysis import analyze_trend
+
+RESULTS_SCHEMA_VERSION = 1
+
+# A microbenchmark regresses only if its p50 moved by more than this many
+# milliseconds and by more than NOISE_FACTOR x the rounds' spread
+DEFAULT_MIN_DELTA_MS = 0.01
+NOISE_FACTOR = 3.0
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+    }
+
+
+def time_calls(fn, args, warmup=3, rounds=3):
+    """
+    Calls fn(*a) for every a in args, `rounds` times over (after warmup
+    calls on the first ones), and summarizes the per-call latency.
+    p50_ms is the median of the per-round p50s and p50_mad_ms their
+    median absolute deviation: the run-to-run noise compare allows for.
+    """
+    args = list(args)
+    for a in args[:warmup]:
+        fn(*a)
+
+    latencies = np.empty((rounds, len(args)))
+    for r in range(rounds):
+        for i, a in enumerate(args):
+            start = time.perf_counter()
+            fn(*a)
+            latencies[r, i] = time.perf_counter() - start
+
+    round_p50s = np.percentile(latencies, 50, axis=1)
+    p50 = np.median(round_p50s)
+    return {
+        "calls": latencies.size,
+        "rounds": rounds,
+        "mean_ms": round(float(latencies.mean() * 1e3), 4),
+        "p50_ms": round(float(p50 * 1e3), 4),
+        "p50_mad_ms": round(float(np.median(np.abs(round_p50s - p50)) * 1e3), 4),
+        "p95_ms": round(float(np.percentile(latencies, 95) * 1e3), 4),
+        "p99_ms": round(float(np.percentile(latencies, 99) * 1e3), 4),
+        "ops_per_s": round(float(latencies.size / max(latencies.sum(), 1e-12)), 2),
+    }
+
+
+class _StaticStore:
+    """
+    Retrieval stand-in for --skip-retrieval: the first top_k logs
+    """
+
+    def __init__(self, logs):
+        self.logs = logs
+
+    def retrieve(self, query_text, top_k=3, filters=None):
+        return self.logs[:top_k]
+
+    def retrieve_many(self, query_texts, top_k=3, filters=None):
+        return [self.logs[:top_k] for _ in query_texts]
+
+
+def build_store(workdir, n_logs, seed, skip_retrieval):
+    if skip_retrieval:
+        return _StaticStore(synthetic_maintenance_logs(n_logs, seed))
+
+    from rag.embed_logs import embed_maintenance_logs
+    from rag.vector_store import MaintenanceVectorStore
+
+    json_path = write_maintenance_logs(
+        os.path.join(workdir, "logs.json"), n_logs, seed, equipment_types=["motor"]
+    )
+    index_path = os.path.join(workdir, "logs.index")
+    embed_maintenance_logs(json_path, index_path)
+    return MaintenanceVectorStore(index_path=index_path, json_path=json_path)
+
+
+# -------------------------
+# Microbenchmarks
+# -------------------------
+def micro_benchmarks(dataset, store, llm, config):
+    repeat = config.repeat
+    paths = [p for p, _ in dataset]
+    cycle = lambda items: list(itertools.islice(itertools.cycle(items), repeat))
+
+    imgs = [preprocess_thermal_image(p) for p in paths[:min(len(paths), 64)]]
+    features = [detect_thermal_anomaly(img)[0] for img in imgs]
+    faults = [interpret_motor_fault(f) for f in features]
+    logs = store.retrieve("Motor bearing overheating with localized hotspot")
+
+    bullet_text = llm.generate(build_prompt(features[0], faults[0], logs), structured=False)
+    json_text = llm.generate(build_prompt(features[0], faults[0], logs, True), structured=True)
+
+    rng = np.random.default_rng(config.seed)
+    history = [
+        {"severity_score": float(s), "temperature_delta": float(d)}
+        for s, d in zip(rng.random(config.history), rng.random(config.history) * 60)
+    ]
+
+    # Unique queries miss the embedding cache; the repeated one hits it
+    cold_queries = [
+        (f"Motor hotspot {i} near bearing with rising temperature",) for i in range(repeat)
+    ]
+    warm_query = [("Motor bearing overheating with localized hotspot",)] * repeat
+
+    benchmarks = [
+        ("preprocess_thermal_image", preprocess_thermal_image, [(p,) for p in cycle(paths)],
+         {"size": config.size}),
+        ("detect_thermal_anomaly", detect_thermal_anomaly, [(i,) for i in cycle(imgs)],
+         {"size": config.size}),
+        ("interpret_motor_fault", interpret_motor_fault, [(f,) for f in cycle(features)], {}),
+        ("retrieve_uncached", store.retrieve, cold_queries, {"logs": config.logs}),
+        ("retrieve_cached", store.retrieve, warm_query, {"logs": config.logs}),
+        ("build_prompt", build_prompt,
+         [(f, fi, logs, True) for f, fi in cycle(list(zip(features, faults)))], {}),
+        ("apply_guardrails", apply_guardrails, [(bullet_text,)] * repeat, {}),
+        ("parse_structured_decision", parse_structured_decision, [(json_text,)] * repeat, {}),
+        ("analyze_trend", analyze_trend, [(history,)] * repeat, {"history": config.history}),
+    ]
+
+    for name, fn, args, params in benchmarks:
+        yield {"kind": "micro", "name": name, **params,
+               **time_calls(fn, args, rounds=config.rounds)}
+
+
+# -------------------------
+# Macro throughput
+# -------------------------
+def macro_benchmarks(dataset, store, config):
+    def run_mode(mode):
+        llm = MockLLM(config.llm_prefill_s, config.llm_tokens_per_s, config.seed)
+        copilot = build_copilot_pipeline(MockClient(store, llm), profile_memory=False)
+        inputs = [{"image_path": p} for p, _ in dataset[:config.macro_assets]]
+
+        start = time.perf_counter()
+        if mode == "sequential":
+            runs = [copilot.run(item)[1] for item in inputs]
+        else:
+            runs = [m for _, m in OverlappedPipeline(copilot).run(inputs)]
+        elapsed = time.perf_counter() - start
+
+        stage_ms = {}
+        for metrics in runs:
+            for entry in metrics["stages"]:
+                if entry["status"] == "ok":
+                    stage_ms.setdefault(entry["stage"], []).append(entry["wall_s"] * 1e3)
+
+        latencies = np.array([m["total_wall_s"] for m in runs])
+        return {
+            "kind": "macro",
+            "name": f"pipeline_{mode}",
+            "assets": len(inputs),
+            "llm_prefill_s": config.llm_prefill_s,
+            "llm_tokens_per_s": config.llm_tokens_per_s,
+            "seconds": round(elapsed, 4),
+            "assets_per_s": round(len(inputs) / max(elapsed, 1e-12), 3),
+            "p50_latency_ms": round(float(np.percentile(latencies, 50) * 1e3), 3),
+            "stage_mean_ms": {k: round(float(np.mean(v)), 4) for k, v in stage_ms.items()},
+        }
+
+    yield run_mode("sequential")
+    yield run_mode("overlapped")
+
+
+# -------------------------
+# Cold imports
+# -------------------------
+def import_benchmarks(config):
+    for module in DEFAULT_MODULES:
+        result = import_time(module, runs=config.import_runs)
+        if "error" not in result:
+            yield {"kind": "import", "name": f"import_{module}", **result}
+
+
+# -------------------------
+# Regression check
+# -------------------------
+def primary_metric(result):
+    """
+    (metric name, higher_is_better) used for regression checks
+    """
+    if result["kind"] == "macro":
+        return "assets_per_s", True
+    if result["kind"] == "import":
+        return "cumulative_ms", False
+    return "p50_ms", False
+
+
+def compare(results, baseline_path, tolerance, min_delta_ms=DEFAULT_MIN_DELTA_MS,
+            noise_factor=NOISE_FACTOR):
+    """
+    Results worse than the baseline by more than `tolerance` (relative) and
+    by more than both min_delta_ms (for millisecond metrics) and
+    noise_factor x the summed p50_mad_ms of the two runs (absolute).
+    Sub-millisecond p50s jitter by far more than a fixed percentage.
+    """
+    with open(baseline_path, "r") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None:
+            continue
+
+        metric, higher_is_better = primary_metric(result)
+        old, new = previous[metric], result[metric]
+        if old <= 0:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+
+        noise = 0.0
+        if metric == "p50_ms":
+            noise = noise_factor * (previous.get("p50_mad_ms", 0.0) + result.get("p50_mad_ms", 0.0))
+        floor = min_delta_ms if metric.endswith("_ms") else 0.0
+        if worse > tolerance and abs(new - old) > max(floor, noise):
+            regressions.append({
+                "regression": result["name"],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": round(change, 4),
+                "allowed_delta": round(max(floor, noise), 4),
+            })
+    return regressions
+
+
+def run(config):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        dataset = write_image_dataset(
+            os.path.join(workdir, "images"), config.images, size=config.size,
+            fault_mix=config.fault_mix, seed=config.seed
+        )
+        store = build_store(workdir, config.logs, config.seed, config.skip_retrieval)
+        llm = MockLLM(config.llm_prefill_s, config.llm_tokens_per_s, config.seed)
+
+        suites = []
+        if not (config.skip_imports or config.macro_only or config.micro_only):
+            suites.append(import_benchmarks(config))
+        if not config.macro_only:
+            suites.append(micro_benchmarks(dataset, store, llm, config))
+        if not config.micro_only:
+            suites.append(macro_benchmarks(dataset, store, config))
+
+        for suite in suites:
+            for result in suite:
+                print(json.dumps(result), flush=True)
+                results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=64, help="Synthetic thermal images")
+    parser.add_argument("--size", type=int, default=256, help="Image side in pixels")
+    parser.add_argument("--fault-mix", type=parse_fault_mix, default=BENCHMARK_FAULT_MIX,
+                        help="e.g. normal=0.6,bearing_overheat=0.2,misalignment=0.2")
+    parser.add_argument("--logs", type=int, default=1000, help="Synthetic maintenance logs")
+    parser.add_argument("--history", type=int, default=50, help="Trend history length")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per microbenchmark round")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Rounds per microbenchmark; their spread is the noise --compare allows")
+    parser.add_argument("--macro-assets", type=int, default=32)
+    parser.add_argument("--llm-prefill-s", type=float, default=0.05)
+    parser.add_argument("--llm-tokens-per-s", type=float, default=400.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-retrieval", action="store_true",
+                        help="Do not embed the corpus; retrieval returns fixed logs")
+    parser.add_argument("--skip-imports", action="store_true",
+                        help="Do not run the cold import-time suite")
+    parser.add_argument("--import-runs", type=int, default=3,
+                        help="Fresh interpreters per import timing (best is kept)")
+    parser.add_argument("--micro-only", action="store_true")
+    parser.add_argument("--macro-only", action="store_true")
+    parser.add_argument("--output", default=None, help="Write all results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative slowdown before a regression is reported")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Smallest absolute slowdown of a millisecond metric reported")
+    config = parser.parse_args()
+
+    results = run(config)
+
+    if config.output:
+        with open(config.output, "w") as f:
+            json.dump({
+                "schema": RESULTS_SCHEMA_VERSION,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "environment": environment(),
+                "config": {k: v for k, v in vars(config).items()
+                           if k not in ("output", "compare")},
+                "results": results,
+            }, f, indent=2)
+
+    if config.compare:
+        regressions = compare(results, config.compare, config.tolerance, config.min_delta_ms)
+        for regression in regressions:
+            print(json.dumps(regression))
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,80 @@
+"""
+Frames-per-second benchmark for cv.stream_ingestion on a synthetic video.
+
+    python benchmarks/stream_benchmark.py --frames 600 --decimate 1
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "data", "synthetic_generation"))
+
+from generate_thermal import base_motor_thermal, add_bearing_overheat, IMG_SIZE
+from cv.stream_ingestion import stream_thermal_features
+
+
+def write_synthetic_video(path, n_frames, fps=30, overheat_every=10):
+    """
+    Writes a grayscale MJPG video of synthetic motor frames
+    """
+    writer = cv2.VideoWriter(
+        path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (IMG_SIZE, IMG_SIZE),
+        isColor=False
+    )
+
+    # A handful of distinct frames is enough; decoding cost is what we measure
+    normal = np.clip(base_motor_thermal(), 0, 255).astype(np.uint8)
+    overheat = np.clip(
+        add_bearing_overheat(base_motor_thermal()), 0, 255
+    ).astype(np.uint8)
+
+    for i in range(n_frames):
+        writer.write(overheat if i % overheat_every == 0 else normal)
+    writer.release()
+
+
+def run(n_frames, decimate, queue_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "synthetic_motor.avi")
+        write_synthetic_video(video_path, n_frames)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        processed = 0
+        for _ in stream_thermal_features(
+            video_path, decimate=decimate, queue_size=queue_size
+        ):
+            processed += 1
+        elapsed = time.perf_counter() - start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "benchmark": "stream_ingestion",
+        "source_frames": n_frames,
+        "processed_frames": processed,
+        "decimate": decimate,
+        "queue_size": queue_size,
+        "seconds": round(elapsed, 3),
+        "fps": round(processed / max(elapsed, 1e-9), 1),
+        "peak_traced_mb": round(peak_bytes / 1e6, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--decimate", type=int, default=1)
+    parser.add_argument("--queue-size", type=int, default=8)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.frames, args.decimate, args.queue_size)))
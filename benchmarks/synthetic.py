@@ -0,0 +1,142 @@
+"""
+Synthetic load for the benchmarks: thermal images of any resolution and
+fault mix, and a maintenance-log corpus in the maintenance_logs.json schema.
+Everything is seeded, so two runs benchmark the same data.
+
+Frames are painted by data/synthetic_generation/generate_thermal.py; only
+the benchmark's fault mix and fixed hotspot placement live here.
+"""
+import itertools
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "synthetic_generation"
+))
+
+from generate_thermal import (
+    IMG_SIZE,
+    PAINTERS,
+    add_bearing_overheat,
+    add_misalignment,
+    base_motor_thermal,
+    parse_fault_mix,
+)
+
+# Mostly healthy fleet, unlike the generator's training-set default
+BENCHMARK_FAULT_MIX = {"normal": 0.6, "bearing_overheat": 0.2, "misalignment": 0.2}
+
+SCHEMA = {
+    "equipment_type": ["motor", "pump", "transformer", "compressor", "fan", "gearbox"],
+    "thermal_pattern": [
+        "localized bearing hotspot", "intense bearing hotspot",
+        "elongated thermal region along shaft", "uniform winding heating",
+        "terminal connection hotspot", "cooling fin blockage pattern",
+    ],
+    "failure_mode": [
+        "bearing_overheating", "bearing_wear", "shaft_misalignment",
+        "winding_insulation_degradation", "loose_connection", "cooling_failure",
+    ],
+    "root_cause": [
+        "insufficient lubrication", "bearing degradation",
+        "improper alignment during installation", "overload operation",
+        "vibration loosening", "blocked airflow",
+    ],
+    "action_taken": [
+        "bearing lubrication and inspection", "bearing replacement",
+        "shaft realignment", "rewinding", "terminal re-torque", "cleaning of cooling path",
+    ],
+}
+OBSERVED_TEMPERATURES = ["70-85C", "85-100C", "90-110C", "110-130C"]
+
+
+# -------------------------
+# Thermal images
+# -------------------------
+def synthetic_thermal_image(fault, size, rng):
+    """
+    One uint8 frame with the generator's classic fixed hotspot placement,
+    scaled to `size` pixels square
+    """
+    img = base_motor_thermal(size, rng)
+
+    scale = size / IMG_SIZE
+    if fault == "bearing_overheat":
+        add_bearing_overheat(img, cx=190 * scale, cy=130 * scale, radius=22 * scale)
+    elif fault == "misalignment":
+        add_misalignment(
+            img, center=(size // 2, size // 2),
+            axes=(max(int(65 * scale), 1), max(int(18 * scale), 1))
+        )
+    elif fault != "normal":
+        raise ValueError(f"Unknown fault {fault!r}; expected normal or one of {tuple(PAINTERS)}")
+
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def fault_sequence(n, fault_mix=None, seed=0):
+    fault_mix = fault_mix or BENCHMARK_FAULT_MIX
+    names = list(fault_mix)
+    weights = np.array([fault_mix[f] for f in names], dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    return [names[i] for i in rng.choice(len(names), size=n, p=weights / weights.sum())]
+
+
+def write_image_dataset(directory, n, size=256, fault_mix=None, seed=0):
+    """
+    Writes n PNG frames and returns [(path, fault), ...]
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    dataset = []
+    for i, fault in enumerate(fault_sequence(n, fault_mix, seed)):
+        path = os.path.join(directory, f"{fault}_{i:06d}.png")
+        cv2.imwrite(path, synthetic_thermal_image(fault, size, rng))
+        dataset.append((path, fault))
+    return dataset
+
+
+# -------------------------
+# Maintenance logs
+# -------------------------
+def synthetic_maintenance_logs(m, seed=0, equipment_types=None):
+    """
+    m records in the maintenance_logs.json schema, with log_id set
+    """
+    rng = np.random.default_rng(seed)
+    schema = dict(SCHEMA)
+    if equipment_types is not None:
+        schema["equipment_type"] = list(equipment_types)
+
+    fields = list(schema)
+    picks = {f: rng.integers(0, len(schema[f]), size=m) for f in fields}
+    temps = rng.integers(0, len(OBSERVED_TEMPERATURES), size=m)
+    downtime = rng.integers(1, 12, size=m)
+    cost = rng.integers(100, 5000, size=m)
+
+    return [
+        {
+            "log_id": f"SYN-{i:07d}",
+            **{f: schema[f][picks[f][i]] for f in fields},
+            "observed_temperature": OBSERVED_TEMPERATURES[temps[i]],
+            "downtime_hours": int(downtime[i]),
+            "repair_cost_usd": int(cost[i]),
+        }
+        for i in range(m)
+    ]
+
+
+def write_maintenance_logs(path, m, seed=0, equipment_types=None):
+    with open(path, "w") as f:
+        json.dump(synthetic_maintenance_logs(m, seed, equipment_types), f)
+    return path
+
+
+def schema_combinations():
+    fields = list(SCHEMA)
+    return fields, list(itertools.product(*(SCHEMA[f] for f in fields)))
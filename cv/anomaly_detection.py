@@ -1,30 +1,165 @@
 import numpy as np
 import cv2
 
-def detect_thermal_anomaly(img):
+_LEVELS = np.arange(256, dtype=np.float64)
+
+# cv2.calcHist counts in float32, which is exact up to 2**24 per bin
+_CALCHIST_MAX_PIXELS = 2 ** 24
+
+# Depths cv2.meanStdDev/minMaxLoc read natively (radiometric frames are
+# uint16 counts or float32 degrees C)
+_CV_STATS_DTYPES = (np.uint16, np.int16, np.int32, np.float32, np.float64)
+
+# Smallest |mean| severity is normalized by on degrees C (float) frames,
+# which can average ~0 C or below: they then score their raw delta
+# instead of dividing by ~0. Integer frames (normalized 8-bit) keep the
+# plain ratio.
+SEVERITY_MIN_REFERENCE = 1.0
+
+
+def severity_reference(dtype):
     """
-    Detects hotspots using statistical thresholding
+    min_reference of severity_score for frames of this dtype
     """
-    mean_temp = np.mean(img)
-    std_temp = np.std(img)
-    max_temp = np.max(img)
+    return SEVERITY_MIN_REFERENCE if np.issubdtype(dtype, np.floating) else 0.0
 
-    # Threshold = abnormal heat
-    threshold = mean_temp + 2 * std_temp
-    hotspot_mask = img > threshold
 
-    # Connected components = number of hotspots
-    num_labels, _ = cv2.connectedComponents(
-        hotspot_mask.astype(np.uint8)
-    )
+def severity_score(max_temp, mean_temp, min_reference=0.0):
+    """
+    (max - mean) / mean; with min_reference, (max - mean) / |mean| with
+    |mean| floored at min_reference. A black frame (mean 0) scores 0.
+    """
+    if min_reference:
+        reference = max(abs(float(mean_temp)), min_reference)
+        return round(float(max_temp - mean_temp) / reference, 2)
+    if mean_temp == 0:
+        return 0.0
+    return float(round((max_temp - mean_temp) / mean_temp, 2))
+
+
+def hotspot_threshold(mean_temp, std_temp, min_contrast=0.0):
+    """
+    Abnormal heat: mean + 2 std, and at least min_contrast above the mean
+    """
+    return max(mean_temp + 2 * std_temp, mean_temp + min_contrast)
+
+
+def _fused_uint8_stats(img, mask=None):
+    """
+    Mean, std and max of a uint8 image (pixels where mask != 0) from one
+    histogram pass
+    """
+    if img.size <= _CALCHIST_MAX_PIXELS:
+        hist = cv2.calcHist([img], [0], mask, [256], [0, 256]).ravel()
+        hist = hist.astype(np.float64)
+    else:
+        pixels = img.ravel() if mask is None else img[mask.view(bool)]
+        hist = np.bincount(pixels, minlength=256).astype(np.float64)
+
+    n = hist.sum()
+
+    mean_temp = (hist @ _LEVELS) / n
+    std_temp = np.sqrt((hist @ (_LEVELS - mean_temp) ** 2) / n)
+    max_temp = _LEVELS[np.flatnonzero(hist)[-1]]
+
+    return mean_temp, std_temp, max_temp
+
 
-    # Severity score (normalized)
-    severity_score = float(round((max_temp - mean_temp) / mean_temp, 2))
+def _native_stats(img, mask=None):
+    """
+    Mean, std and max without converting the frame: OpenCV accumulates in
+    float64 over the native buffer (float32 temperatures, uint16 counts)
+    """
+    if img.ndim == 2 and img.dtype in _CV_STATS_DTYPES:
+        mean, std = cv2.meanStdDev(img, mask=mask)
+        _, max_temp, _, _ = cv2.minMaxLoc(img, mask)
+        return float(mean[0, 0]), float(std[0, 0]), max_temp
+
+    pixels = img if mask is None else img[mask.view(bool)]
+    return np.mean(pixels), np.std(pixels), np.max(pixels)
 
+
+def _hotspot_stats(img, labels, stats, centroids, keep):
+    """
+    Area, centroid and peak intensity of the kept hotspots, as a columnar
+    dict {"area": (n,), "centroid": (n, 2), "peak": (n,)}
+    """
+    inside = labels > 0
+    # Peaks in img's own dtype: ufunc.at only takes its fast path when
+    # no casting is needed
+    lowest = np.finfo(img.dtype).min if img.dtype.kind == "f" else np.iinfo(img.dtype).min
+    peaks = np.full(len(stats), lowest, dtype=img.dtype)
+    np.maximum.at(peaks, labels[inside], img[inside])
+    keep = np.flatnonzero(keep) + 1
     return {
+        "area": stats[keep, cv2.CC_STAT_AREA].astype(np.int64),
+        "centroid": np.round(centroids[keep], 2),
+        "peak": np.round(peaks[keep].astype(np.float64), 2),
+    }
+
+
+def detect_thermal_anomaly(img, return_hotspot_stats=False, mask=None,
+                           min_contrast=0.0, min_area=1):
+    """
+    Detects hotspots using statistical thresholding.
+
+    img: normalized uint8 intensities, or a radiometric frame (float32
+    degrees C, see cv.radiometric), in which case the temperature
+    features are in degrees C.
+    mask: optional region of interest (bool or uint8, nonzero = inside,
+    same shape as img); statistics and hotspots are computed inside it only.
+    min_contrast, min_area: a hotspot must also exceed the mean by
+    min_contrast (in img units) and cover min_area pixels; the defaults
+    keep the plain mean + 2 std rule.
+    """
+    if mask is not None:
+        # 0/1 uint8, usable both as an OpenCV mask and as a bool view
+        mask = (mask != 0).view(np.uint8)
+        if not mask.any():
+            raise ValueError("mask selects no pixels")
+
+    if img.dtype == np.uint8:
+        # Fused path: one histogram pass for all statistics
+        mean_temp, std_temp, max_temp = _fused_uint8_stats(img, mask)
+    else:
+        mean_temp, std_temp, max_temp = _native_stats(img, mask)
+
+    # Threshold = abnormal heat
+    threshold = hotspot_threshold(mean_temp, std_temp, min_contrast)
+
+    if img.dtype == np.uint8:
+        # 0/1 uint8 mask straight from OpenCV, no bool -> uint8 copy
+        _, mask_u8 = cv2.threshold(img, threshold, 1, cv2.THRESH_BINARY)
+        hotspot_mask = mask_u8.view(bool)
+    else:
+        hotspot_mask = img > threshold
+        mask_u8 = hotspot_mask.view(np.uint8)
+
+    if mask is not None:
+        np.bitwise_and(mask_u8, mask, out=mask_u8)
+
+    # Connected components = number of hotspots
+    if return_hotspot_stats or min_area > 1:
+        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
+            mask_u8
+        )
+        keep = stats[1:, cv2.CC_STAT_AREA] >= min_area
+        if not keep.all():
+            hotspot_mask = np.concatenate(([False], keep))[labels]
+        hotspot_count = int(keep.sum())
+    else:
+        num_labels, _ = cv2.connectedComponents(mask_u8)
+        hotspot_count = int(num_labels - 1)  # excluding background
+
+    features = {
         "mean_temperature": round(float(mean_temp), 2),
         "max_temperature": round(float(max_temp), 2),
         "temperature_delta": round(float(max_temp - mean_temp), 2),
-        "hotspot_count": int(num_labels - 1),  # excluding background
-        "severity_score": severity_score
-    }, hotspot_mask
+        "hotspot_count": hotspot_count,
+        "severity_score": severity_score(max_temp, mean_temp, severity_reference(img.dtype))
+    }
+
+    if return_hotspot_stats:
+        features["hotspots"] = _hotspot_stats(img, labels, stats, centroids, keep)
+
+    return features, hotspot_mask
@@ -0,0 +1,104 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cv.thermal_preprocessing import preprocess_thermal_image
+from cv.anomaly_detection import detect_thermal_anomaly
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+FEATURE_COLUMNS = (
+    "mean_temperature",
+    "max_temperature",
+    "temperature_delta",
+    "hotspot_count",
+    "severity_score",
+)
+
+
+def collect_image_paths(source):
+    """
+    Expands a directory, glob pattern or list of paths into sorted image paths
+    """
+    if isinstance(source, (list, tuple)):
+        paths = []
+        for item in source:
+            paths.extend(collect_image_paths(item))
+        return paths
+
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*")
+    else:
+        pattern = source
+
+    return sorted(
+        p for p in glob.glob(pattern, recursive=True)
+        if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def _analyze_one(image_path):
+    """
+    Worker: decode + blur + feature extraction for a single image.
+    Only the feature row travels back to the parent, never the pixels.
+    """
+    try:
+        img = preprocess_thermal_image(image_path)
+    except ValueError:
+        return None
+
+    features, _ = detect_thermal_anomaly(img)
+    return tuple(features[c] for c in FEATURE_COLUMNS)
+
+
+def analyze_thermal_batch(source, max_workers=None, chunksize=16):
+    """
+    Runs preprocessing + anomaly detection over many images in a process pool.
+
+    Returns a columnar result: one NumPy array per feature, row i belongs
+    to paths[i]. Unreadable images are kept as NaN rows with valid=False.
+    """
+    paths = collect_image_paths(source)
+    n = len(paths)
+
+    result = {
+        "paths": np.array(paths, dtype=object),
+        "valid": np.zeros(n, dtype=bool),
+    }
+    for column in FEATURE_COLUMNS:
+        result[column] = np.full(n, np.nan, dtype=np.float64)
+
+    if n == 0:
+        return result
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        rows = list(pool.map(_analyze_one, paths, chunksize=chunksize))
+
+    ok = np.array([row is not None for row in rows], dtype=bool)
+    result["valid"] = ok
+
+    if ok.any():
+        stacked = np.array([row for row in rows if row is not None], dtype=np.float64)
+        for j, column in enumerate(FEATURE_COLUMNS):
+            result[column][ok] = stacked[:, j]
+
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "data/thermal_images"
+
+    start = time.perf_counter()
+    batch = analyze_thermal_batch(target)
+    elapsed = time.perf_counter() - start
+
+    n_images = len(batch["paths"])
+    print(f"Analyzed {n_images} images in {elapsed:.2f}s "
+          f"({n_images / max(elapsed, 1e-9) * 60:.0f} images/min)")
+    for column in FEATURE_COLUMNS:
+        print(f"{column}: {batch[column]}")
@@ -0,0 +1,119 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+# Linear counts -> degrees C per camera: celsius = counts * gain + offset.
+# Unconfigured integer captures are taken as centikelvin counts (0.01 K
+# per count, as 16-bit radiometric cameras stream); unconfigured float
+# captures as already being degrees C.
+DEFAULT_CALIBRATION = {"gain": 0.01, "offset": -273.15}
+IDENTITY_CALIBRATION = {"gain": 1.0, "offset": 0.0}
+
+DEFAULT_CALIBRATION_PATH = os.environ.get("COPILOT_CAMERA_CALIBRATION")
+
+RAW_EXTENSIONS = (".raw", ".bin")
+
+
+def load_calibrations(path=DEFAULT_CALIBRATION_PATH):
+    """
+    {camera_id: {"gain": ..., "offset": ...}} from a JSON file (empty
+    when no file is configured)
+    """
+    if not path:
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def default_calibration(dtype):
+    return DEFAULT_CALIBRATION if np.issubdtype(dtype, np.integer) else IDENTITY_CALIBRATION
+
+
+def calibration_for(camera_id=None, calibrations=None, dtype=np.uint16):
+    """
+    The camera's configured calibration, else the default for captures
+    of this dtype (see default_calibration)
+    """
+    calibrations = load_calibrations() if calibrations is None else calibrations
+    if camera_id in calibrations:
+        return calibrations[camera_id]
+    return default_calibration(dtype)
+
+
+def read_radiometric(path, shape=None, dtype=np.uint16, offset=0):
+    """
+    Raw sensor counts, without conversion:
+    - .tif/.tiff: 16-bit or float32 TIFF, decoded at native depth
+    - .npy: memory-mapped, so large captures are paged in on demand
+    - .raw/.bin: headerless frames, memory-mapped with shape and dtype
+      (offset skips a file header)
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in (".tif", ".tiff"):
+        img = cv2.imread(path, cv2.IMREAD_UNCHANGED | cv2.IMREAD_ANYDEPTH)
+        if img is None:
+            raise ValueError("Image not found or invalid path")
+        if img.ndim == 3:
+            raise ValueError("Radiometric TIFF must be single-channel")
+        return img
+
+    if ext == ".npy":
+        return np.load(path, mmap_mode="r")
+
+    if ext in RAW_EXTENSIONS:
+        if shape is None:
+            raise ValueError("Raw radiometric files need shape=(height, width)")
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+
+    raise ValueError(f"Unsupported radiometric format {ext!r}")
+
+
+def counts_to_celsius(counts, calibration=None, out=None):
+    """
+    Applies the linear calibration (default: default_calibration of the
+    dtype) into a float32 buffer (out, or a new one). Float32 input with
+    the identity calibration is returned as is.
+    """
+    if calibration is None:
+        calibration = default_calibration(counts.dtype)
+    gain = float(calibration["gain"])
+    offset = float(calibration["offset"])
+
+    if out is None and counts.dtype == np.float32 and gain == 1.0 and offset == 0.0:
+        return counts
+
+    out = np.multiply(counts, np.float32(gain), out=out, dtype=np.float32, casting="unsafe")
+    if offset:
+        out += np.float32(offset)
+    return out
+
+
+def preprocess_radiometric(counts, calibration=None, denoise=True):
+    """
+    float32 degrees C frame for detect_thermal_anomaly: calibration, then
+    the same 5x5 Gaussian denoise as the 8-bit path, without min-max
+    normalization so absolute temperatures survive
+    """
+    celsius = counts_to_celsius(counts, calibration)
+    if not denoise:
+        return celsius
+
+    # Blur in place when calibration produced a private buffer; a
+    # read-only memmap/array passed through unchanged gets a new one
+    private = celsius is not counts and celsius.flags.writeable
+    return cv2.GaussianBlur(celsius, (5, 5), 0, dst=celsius if private else None)
+
+
+def load_radiometric_image(path, calibration=None, camera_id=None, denoise=True, **read_kwargs):
+    """
+    Radiometric counterpart of preprocess_thermal_image: path -> float32
+    frame in degrees C (calibration, else the camera's, else the default
+    for the file's dtype)
+    """
+    counts = read_radiometric(path, **read_kwargs)
+    if calibration is None:
+        calibration = calibration_for(camera_id, dtype=counts.dtype)
+    return preprocess_radiometric(counts, calibration, denoise=denoise)
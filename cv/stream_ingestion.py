@@ -0,0 +1,202 @@
+import os
+import queue
+import re
+import threading
+import time
+
+import cv2
+
+from cv.thermal_preprocessing import preprocess_thermal_frame
+from cv.anomaly_detection import detect_thermal_anomaly
+
+FRAME_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+_END_OF_STREAM = object()
+
+
+def _frame_number(filename):
+    numbers = re.findall(r"\d+", filename)
+    return (int(numbers[-1]) if numbers else -1, filename)
+
+
+def iter_video_frames(source, skip=0, decimate=1):
+    """
+    Yields (frame_index, timestamp_s, frame) from a video file or camera index.
+    Frames that are skipped or decimated away are grabbed but never decoded.
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise ValueError(f"Unable to open video source: {source}")
+
+    try:
+        frame_index = -1
+        while True:
+            if not cap.grab():
+                break
+            frame_index += 1
+
+            if frame_index < skip or (frame_index - skip) % decimate:
+                continue
+
+            ok, frame = cap.retrieve()
+            if not ok:
+                break
+
+            timestamp_s = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            yield frame_index, timestamp_s, frame
+    finally:
+        cap.release()
+
+
+def iter_frame_directory(directory, skip=0, decimate=1, fps=None):
+    """
+    Yields (frame_index, timestamp_s, frame) from a directory of numbered frames.
+    Only the frames that survive skip/decimation are read from disk.
+    """
+    names = sorted(
+        (n for n in os.listdir(directory) if n.lower().endswith(FRAME_EXTENSIONS)),
+        key=_frame_number
+    )
+
+    for frame_index in range(skip, len(names), decimate):
+        frame = cv2.imread(
+            os.path.join(directory, names[frame_index]), cv2.IMREAD_GRAYSCALE
+        )
+        if frame is None:
+            continue
+
+        timestamp_s = frame_index / fps if fps else None
+        yield frame_index, timestamp_s, frame
+
+
+def iter_frames(source, skip=0, decimate=1, fps=None):
+    """
+    Dispatches to the directory or video reader based on the source
+    """
+    if decimate < 1:
+        raise ValueError("decimate must be >= 1")
+
+    if isinstance(source, str) and os.path.isdir(source):
+        return iter_frame_directory(source, skip=skip, decimate=decimate, fps=fps)
+    return iter_video_frames(source, skip=skip, decimate=decimate)
+
+
+def _produce(frames, buffer, stop, drop_when_full, stats):
+    try:
+        for item in frames:
+            if stop.is_set():
+                break
+
+            if drop_when_full:
+                # Live camera: never stall the reader, discard the oldest frame
+                while True:
+                    try:
+                        buffer.put_nowait(item)
+                        break
+                    except queue.Full:
+                        try:
+                            buffer.get_nowait()
+                            stats["dropped_frames"] += 1
+                        except queue.Empty:
+                            pass
+            else:
+                # Recorded source: block until the consumer catches up
+                while not stop.is_set():
+                    try:
+                        buffer.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+    except Exception as exc:
+        stats["error"] = exc
+    finally:
+        buffer.put(_END_OF_STREAM)
+
+
+def stream_thermal_features(
+    source,
+    skip=0,
+    decimate=1,
+    fps=None,
+    queue_size=8,
+    drop_when_full=False,
+    feature_store=None,
+    asset_id=None,
+    store_batch_size=64,
+    trend_tracker=None
+):
+    """
+    Streams anomaly feature records from a video or frame directory.
+
+    Decoding runs in a reader thread feeding a bounded queue; preprocessing
+    and detection run in the consumer. Only feature records are yielded, so
+    memory stays bounded by queue_size frames regardless of stream length.
+
+    feature_store/asset_id: also persist every record to a
+    temporal.feature_store.FeatureStore, store_batch_size frames per write.
+    Frames are stamped with wall-clock start time + stream timestamp.
+
+    trend_tracker: a temporal.online_trend.TrendTracker updated with every
+    frame (O(1) per frame); its report is attached to each record as "trend".
+    """
+    if feature_store is not None and asset_id is None:
+        raise ValueError("asset_id is required when writing to a feature_store")
+
+    buffer = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    stats = {"dropped_frames": 0, "error": None}
+
+    reader = threading.Thread(
+        target=_produce,
+        args=(iter_frames(source, skip, decimate, fps), buffer, stop,
+              drop_when_full, stats),
+        daemon=True
+    )
+    reader.start()
+
+    started_at = time.time()
+    pending, pending_ts = [], []
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_STREAM:
+                break
+
+            frame_index, timestamp_s, frame = item
+            img = preprocess_thermal_frame(frame)
+            features, _ = detect_thermal_anomaly(img)
+
+            if feature_store is not None:
+                pending.append(features)
+                pending_ts.append(
+                    started_at + timestamp_s if timestamp_s is not None else time.time()
+                )
+                if len(pending) >= store_batch_size:
+                    feature_store.append_many(asset_id, pending, pending_ts)
+                    pending, pending_ts = [], []
+
+            record = {
+                "frame_index": frame_index,
+                "timestamp_s": timestamp_s,
+                "queue_depth": buffer.qsize(),
+                "dropped_frames": stats["dropped_frames"],
+                **features
+            }
+            if trend_tracker is not None:
+                record["trend"] = trend_tracker.update(features)
+            yield record
+    finally:
+        if pending:
+            feature_store.append_many(asset_id, pending, pending_ts)
+        stop.set()
+        # Drain so a blocked reader can observe the stop flag and exit
+        while reader.is_alive():
+            try:
+                buffer.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        reader.join()
+
+    if stats["error"] is not None:
+        raise stats["error"]
@@ -1,6 +1,50 @@
 import cv2
 import numpy as np
 
+def preprocess_thermal_frame(frame, inplace=False):
+    """
+    Normalizes an already-decoded thermal frame (grayscale or BGR).
+
+    inplace=True blurs and normalizes the frame in its own buffer; use it
+    only for frames nobody else holds (freshly decoded ones).
+    """
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        inplace = True  # cvtColor already returned a private copy
+
+    # Blur into the frame itself or a fresh buffer, then normalize that
+    # buffer in place: no intermediate copies either way
+    img = cv2.GaussianBlur(frame, (5, 5), 0, dst=frame if inplace else None)
+    cv2.normalize(img, img, 0, 255, cv2.NORM_MINMAX)
+
+    return img.astype(np.uint8, copy=False)
+
+def decode_thermal_image(data):
+    """
+    Decodes an encoded image (PNG/JPEG/... bytes, bytearray, memoryview or
+    1-D uint8 array, e.g. an upload buffer) to grayscale without touching
+    the filesystem. The buffer is wrapped, not copied, before decoding.
+    """
+    if isinstance(data, np.ndarray):
+        buffer = data.reshape(-1) if data.dtype == np.uint8 else data.view(np.uint8).reshape(-1)
+    else:
+        buffer = np.frombuffer(data, dtype=np.uint8)
+
+    img = cv2.imdecode(buffer, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        raise ValueError("Buffer is not a decodable image")
+    return img
+
+def preprocess_thermal_buffer(data):
+    """
+    In-memory counterpart of preprocess_thermal_image: an encoded image
+    buffer, or an already-decoded 2-D/3-D frame array
+    """
+    if isinstance(data, np.ndarray) and data.ndim >= 2:
+        return preprocess_thermal_frame(data)
+
+    return preprocess_thermal_frame(decode_thermal_image(data), inplace=True)
+
 def preprocess_thermal_image(image_path):
     """
     Loads and normalizes a thermal image
@@ -9,7 +53,4 @@ def preprocess_thermal_image(image_path):
     if img is None:
         raise ValueError("Image not found or invalid path")
 
-    img = cv2.GaussianBlur(img, (5, 5), 0)
-    img = cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX)
-
-    return img.astype(np.uint8)
+    return preprocess_thermal_frame(img, inplace=True)
@@ -0,0 +1,399 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from cv.anomaly_detection import (
+    detect_thermal_anomaly,
+    hotspot_threshold,
+    severity_reference,
+    severity_score,
+)
+from cv.batch_analysis import FEATURE_COLUMNS
+
+DEFAULT_TILE_SIZE = 512
+DEFAULT_OVERLAP = 64
+
+# A tile or ROI of plain background has a tiny std, so mean + 2 std alone
+# turns sensor noise into hundreds of hotspots. A hotspot must also stand
+# this far above its region's mean: intensity levels on normalized 8-bit
+# frames, degrees C on radiometric ones
+MIN_HOTSPOT_CONTRAST_LEVELS = 10.0
+MIN_HOTSPOT_CONTRAST_CELSIUS = 2.0
+MIN_HOTSPOT_AREA = 4
+
+
+def default_min_contrast(dtype):
+    return MIN_HOTSPOT_CONTRAST_LEVELS if dtype == np.uint8 else MIN_HOTSPOT_CONTRAST_CELSIUS
+
+
+# -------------------------
+# Regions
+# -------------------------
+def _tile_starts(length, tile, overlap):
+    # Fewest tiles that overlap by at least `overlap`, spread evenly so the
+    # last one is not a near-duplicate of its neighbour
+    if length <= tile:
+        return [0]
+    count = -(-(length - overlap) // (tile - overlap))
+    return [round(i * (length - tile) / (count - 1)) for i in range(count)]
+
+
+def _core_bounds(starts, tile, length):
+    # Each overlap is split down the middle, so every pixel lies in
+    # exactly one tile core
+    cuts = [(a + tile + b) // 2 for a, b in zip(starts, starts[1:])]
+    return list(zip([0] + cuts, cuts + [length]))
+
+
+def tile_grid(shape, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_OVERLAP):
+    """
+    Tiles covering an (H, W) frame, adjacent tiles sharing `overlap`
+    pixels: [{"tile": "r0c0", "bbox": (x, y, w, h), "core": (x0, y0, x1, y1)}]
+    """
+    height, width = shape[:2]
+    tile_h, tile_w = (tile_size, tile_size) if np.isscalar(tile_size) else tile_size
+    if overlap < 0 or overlap >= min(tile_h, tile_w):
+        raise ValueError("overlap must be >= 0 and smaller than the tile size")
+
+    ys = _tile_starts(height, tile_h, overlap)
+    xs = _tile_starts(width, tile_w, overlap)
+    y_cores = _core_bounds(ys, tile_h, height)
+    x_cores = _core_bounds(xs, tile_w, width)
+
+    return [
+        {
+            "tile": f"r{r}c{c}",
+            "bbox": (x, y, min(tile_w, width - x), min(tile_h, height - y)),
+            "core": (x_core[0], y_core[0], x_core[1], y_core[1]),
+        }
+        for r, (y, y_core) in enumerate(zip(ys, y_cores))
+        for c, (x, x_core) in enumerate(zip(xs, x_cores))
+    ]
+
+
+def roi_region(roi, shape):
+    """
+    (bbox, polygon) of an ROI given as an (x, y, w, h) rectangle or a
+    polygon [(x, y), ...] in frame coordinates, clipped to the frame
+    """
+    height, width = shape[:2]
+    points = np.asarray(roi, dtype=np.int32)
+
+    if points.ndim == 1 and len(points) == 4:
+        x, y, w, h = points
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, width), min(y + h, height)
+        polygon = None
+    elif points.ndim == 2 and points.shape[1] == 2 and len(points) >= 3:
+        x0, y0 = np.maximum(points.min(axis=0), 0)
+        x1, y1 = np.minimum(points.max(axis=0) + 1, (width, height))
+        polygon = points
+    else:
+        raise ValueError("ROI must be (x, y, w, h) or a polygon of >= 3 (x, y) points")
+
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"ROI {roi!r} lies outside the {width}x{height} frame")
+    return (int(x0), int(y0), int(x1 - x0), int(y1 - y0)), polygon
+
+
+# -------------------------
+# Per-region analysis
+# -------------------------
+def _box_mask(points, box):
+    x0, y0, x1, y1 = box
+    return (
+        (points[:, 0] >= x0) & (points[:, 0] < x1)
+        & (points[:, 1] >= y0) & (points[:, 1] < y1)
+    )
+
+
+def _clip(box, bounds):
+    # Intersection of two (x0, y0, x1, y1) boxes
+    return (max(box[0], bounds[0]), max(box[1], bounds[1]),
+            min(box[2], bounds[2]), min(box[3], bounds[3]))
+
+
+def _asset_parts(region, bbox, core, assets):
+    """
+    Pixel count, sum, sum of squares and max of every asset rectangle
+    inside this tile's core; summing parts over tiles gives exact
+    per-asset statistics with each pixel counted once
+    """
+    x, y, _, _ = bbox
+    parts = {}
+    for asset_id, (ax, ay, aw, ah) in assets.items():
+        box = _clip((ax, ay, ax + aw, ay + ah), core)
+        if box[2] <= box[0] or box[3] <= box[1]:
+            continue
+
+        sub = region[box[1] - y:box[3] - y, box[0] - x:box[2] - x]
+        parts[asset_id] = {
+            "box": box,
+            "pixels": sub.size,
+            "sum": float(sub.sum(dtype=np.float64)),
+            "sum_sq": float(np.square(sub, dtype=np.float64).sum()),
+            "max": float(sub.max()),
+        }
+    return parts
+
+
+def _asset_hotspots(img, bbox, parts, assets, thresholds, preprocess=None,
+                    min_area=MIN_HOTSPOT_AREA):
+    """
+    Hotspots of each asset part against the asset's own threshold, so a
+    motor body that is hot next to the background in this tile is not a
+    hotspot. Components are labelled over the whole tile (overlap
+    included) and attributed by centroid to the part's core box.
+    """
+    x, y, w, h = bbox
+    region = img[y:y + h, x:x + w]
+    if preprocess is not None:
+        region = preprocess(region)
+
+    counts = {}
+    for asset_id, part in parts.items():
+        ax, ay, aw, ah = assets[asset_id]
+        x0, y0, x1, y1 = _clip((ax, ay, ax + aw, ay + ah), (x, y, x + w, y + h))
+        sub = region[y0 - y:y1 - y, x0 - x:x1 - x]
+
+        hot = np.greater(sub, thresholds[asset_id]).view(np.uint8)
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(hot)
+        keep = stats[1:, cv2.CC_STAT_AREA] >= min_area
+        counts[asset_id] = int(_box_mask(centroids[1:][keep] + (x0, y0), part["box"]).sum())
+    return counts
+
+
+def _asset_thresholds(records, assets, min_contrast):
+    # Mean/std of every asset from its parts, as analyze_rois would see them
+    thresholds = {}
+    for asset_id in assets:
+        parts = [t["asset_parts"][asset_id] for t in records if asset_id in t["asset_parts"]]
+        if not parts:
+            continue
+        pixels = sum(p["pixels"] for p in parts)
+        mean = sum(p["sum"] for p in parts) / pixels
+        var = sum(p["sum_sq"] for p in parts) / pixels - mean ** 2
+        thresholds[asset_id] = hotspot_threshold(mean, np.sqrt(max(var, 0.0)), min_contrast)
+    return thresholds
+
+
+def _analyze_region(img, bbox, polygon=None, core=None, assets=None, preprocess=None,
+                    return_hotspot_stats=False, min_contrast=0.0, min_area=MIN_HOTSPOT_AREA):
+    """
+    Local statistics and hotspots of one tile/ROI. The region is a view
+    into img (a memmap is only paged in where it is read); preprocess, if
+    given, must return a new array rather than modify the view in place.
+    """
+    x, y, w, h = bbox
+    region = img[y:y + h, x:x + w]
+    if preprocess is not None:
+        region = preprocess(region)
+
+    mask = None
+    if polygon is not None:
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.fillPoly(mask, [(polygon - (x, y)).astype(np.int32)], 1)
+
+    # Tiles need the hotspot centroids too; take them from detect's own
+    # labelling instead of labelling the hotspot mask a second time
+    features, _ = detect_thermal_anomaly(
+        region, return_hotspot_stats=return_hotspot_stats or core is not None, mask=mask,
+        min_contrast=min_contrast, min_area=min_area,
+    )
+    hotspots = features["hotspots"] if return_hotspot_stats else features.pop("hotspots", None)
+    record = {"bbox": bbox, **features}
+    if hotspots is None:
+        return record
+
+    # Region -> frame coordinates
+    hotspots["centroid"] += (x, y)
+
+    if core is not None:
+        # Hotspots are attributed by centroid to the tile core they fall
+        # in, so one straddling a tile border is counted once
+        centroids = hotspots["centroid"]
+        record["core_hotspot_count"] = int(_box_mask(centroids, core).sum())
+        if assets:
+            record["asset_parts"] = _asset_parts(region, bbox, core, assets)
+            record["severity_reference"] = severity_reference(region.dtype)
+
+    return record
+
+
+def _map_regions(fn, jobs, workers):
+    # OpenCV releases the GIL in blur/statistics/labelling, so threads
+    # scale across cores without copying tiles into worker processes
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(lambda job: fn(**job), jobs))
+
+
+def analyze_rois(img, rois, workers=None, preprocess=None, return_hotspot_stats=False,
+                 min_contrast=None, min_area=MIN_HOTSPOT_AREA):
+    """
+    Per-asset features from named regions of one frame/panorama.
+
+    rois: {asset_id: (x, y, w, h) or [(x, y), ...] polygon}. Each ROI gets
+    its own mean/std threshold, so one hot machine does not mask the
+    others. Hotspots must also clear min_contrast (default_min_contrast
+    of the frame's dtype when None) and min_area. Returns
+    {asset_id: {"asset_id", "bbox", <features>}} in ROI order, ready for
+    interpret_motor_fault or FeatureStore.append.
+    """
+    if min_contrast is None:
+        min_contrast = default_min_contrast(img.dtype)
+    jobs = []
+    for asset_id, roi in rois.items():
+        bbox, polygon = roi_region(roi, img.shape)
+        jobs.append({
+            "img": img, "bbox": bbox, "polygon": polygon,
+            "preprocess": preprocess, "return_hotspot_stats": return_hotspot_stats,
+            "min_contrast": min_contrast, "min_area": min_area,
+        })
+
+    records = _map_regions(_analyze_region, jobs, workers)
+    return {
+        asset_id: {"asset_id": asset_id, **record}
+        for asset_id, record in zip(rois, records)
+    }
+
+
+def analyze_tiles(img, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_OVERLAP,
+                  workers=None, preprocess=None, assets=None,
+                  min_contrast=None, min_area=MIN_HOTSPOT_AREA):
+    """
+    Local features for every tile of a frame (see tile_grid); hotspots are
+    thresholded against their own tile's statistics, with the same
+    min_contrast/min_area floor as analyze_rois.
+
+    assets: optional {asset_id: ROI} as in analyze_rois (a polygon stands
+    for its bounding box here); each tile then also records the
+    asset_parts that merge_tiles_by_asset combines. Asset hotspots are
+    counted in a second pass against each asset's own statistics, so the
+    tiles only split the work and the counts match analyze_rois.
+    """
+    if min_contrast is None:
+        min_contrast = default_min_contrast(img.dtype)
+    if assets:
+        assets = {a: roi_region(roi, img.shape)[0] for a, roi in assets.items()}
+    tiles = tile_grid(img.shape, tile_size, overlap)
+    jobs = [
+        {"img": img, "bbox": t["bbox"], "core": t["core"], "assets": assets,
+         "preprocess": preprocess, "min_contrast": min_contrast, "min_area": min_area}
+        for t in tiles
+    ]
+    records = _map_regions(_analyze_region, jobs, workers)
+
+    if assets:
+        thresholds = _asset_thresholds(records, assets, min_contrast)
+        counted = [r for r in records if r["asset_parts"]]
+        jobs = [
+            {"img": img, "bbox": r["bbox"], "parts": r["asset_parts"], "assets": assets,
+             "thresholds": thresholds, "preprocess": preprocess, "min_area": min_area}
+            for r in counted
+        ]
+        for record, counts in zip(counted, _map_regions(_asset_hotspots, jobs, workers)):
+            for asset_id, count in counts.items():
+                record["asset_parts"][asset_id]["hotspots"] = count
+
+    return [
+        {"tile": t["tile"], "core": t["core"], **record}
+        for t, record in zip(tiles, records)
+    ]
+
+
+# -------------------------
+# Merging
+# -------------------------
+def merge_tiles_by_asset(tile_records, assets):
+    """
+    Per-asset records from analyze_tiles(..., assets=assets): mean and max
+    over exactly the asset's pixels, hotspot_count against the asset's
+    own threshold, and the tiles the asset spans
+    """
+    merged = {}
+    for asset_id in assets:
+        parts = [
+            (t, t["asset_parts"][asset_id])
+            for t in tile_records if asset_id in t.get("asset_parts", {})
+        ]
+        if not parts:
+            raise ValueError(f"Asset {asset_id!r} is outside the analyzed frame")
+
+        boxes = np.array([p["box"] for _, p in parts])
+        x0, y0 = boxes[:, :2].min(axis=0)
+        x1, y1 = boxes[:, 2:].max(axis=0)
+        pixels = sum(p["pixels"] for _, p in parts)
+        mean_temp = sum(p["sum"] for _, p in parts) / pixels
+        max_temp = max(p["max"] for _, p in parts)
+
+        merged[asset_id] = {
+            "asset_id": asset_id,
+            "bbox": (int(x0), int(y0), int(x1 - x0), int(y1 - y0)),
+            "mean_temperature": round(mean_temp, 2),
+            "max_temperature": round(max_temp, 2),
+            "temperature_delta": round(max_temp - mean_temp, 2),
+            "hotspot_count": sum(p["hotspots"] for _, p in parts),
+            "severity_score": severity_score(
+                max_temp, mean_temp, parts[0][0]["severity_reference"]
+            ),
+            "tiles": [t["tile"] for t, _ in parts],
+        }
+    return merged
+
+
+def records_to_columns(records):
+    """
+    {asset_id: record} -> columnar dict (asset_ids + FEATURE_COLUMNS),
+    the input format of guardrails.fleet_scoring.score_fleet
+    """
+    rows = list(records.values())
+    columns = {"asset_ids": np.array([r["asset_id"] for r in rows], dtype=object)}
+    for column in FEATURE_COLUMNS:
+        columns[column] = np.array([r[column] for r in rows], dtype=np.float64)
+    return columns
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    from cv.radiometric import load_radiometric_image
+    from cv.thermal_preprocessing import preprocess_thermal_image
+
+    parser = argparse.ArgumentParser(description="Per-asset analysis of a thermal panorama")
+    parser.add_argument("image")
+    parser.add_argument("--rois", default=None,
+                        help='JSON file {"asset_id": [x, y, w, h] or [[x, y], ...]}')
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP)
+    parser.add_argument("--tiled", action="store_true",
+                        help="Tile-local thresholds instead of one threshold per ROI")
+    parser.add_argument("--radiometric", action="store_true",
+                        help="16-bit TIFF / .npy capture, features in degrees C")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.radiometric:
+        img = load_radiometric_image(args.image)
+    else:
+        img = preprocess_thermal_image(args.image)
+
+    rois = None
+    if args.rois:
+        with open(args.rois, "r") as f:
+            rois = json.load(f)
+
+    start = time.perf_counter()
+    if rois and not args.tiled:
+        records = analyze_rois(img, rois, workers=args.workers)
+    else:
+        tiles = analyze_tiles(img, args.tile_size, args.overlap, workers=args.workers, assets=rois)
+        records = merge_tiles_by_asset(tiles, rois) if rois else {t["tile"]: t for t in tiles}
+    elapsed = time.perf_counter() - start
+
+    for name, record in records.items():
+        print(name, {c: record[c] for c in FEATURE_COLUMNS})
+    print(f"{len(records)} regions of a {img.shape[1]}x{img.shape[0]} frame in {elapsed:.3f}s")
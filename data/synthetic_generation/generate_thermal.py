@@ -1,74 +1,292 @@
+"""
+Synthetic motor thermal image generator.
+
+    python data/synthetic_generation/generate_thermal.py            # 15-image demo set
+    python data/synthetic_generation/generate_thermal.py --n 100000 --workers 8 \
+        --out /data/thermal_100k
+    python data/synthetic_generation/generate_thermal.py --n 100000 --format npy \
+        --out /data/thermal_100k_stack
+
+Every image is drawn from its own generator seeded with (seed, index), so a
+dataset is reproducible regardless of the number of workers. A labels
+manifest (labels.jsonl) records the fault type, placement and intensity of
+every painted hotspot.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import cv2
-import os
 
 IMG_SIZE = 256
 
-def base_motor_thermal():
+HERE = os.path.dirname(os.path.abspath(__file__))
+THERMAL_IMAGES_DIR = os.path.join(HERE, "..", "thermal_images")
+
+FAULT_TYPES = ("bearing_overheat", "misalignment")
+DEFAULT_FAULT_MIX = {"normal": 0.4, "bearing_overheat": 0.3, "misalignment": 0.3}
+
+
+def _rng(rng):
+    return rng if rng is not None else np.random.default_rng()
+
+
+def base_motor_thermal(size=IMG_SIZE, rng=None):
     """
     Simulates normal motor surface temperature distribution
     """
-    x = np.linspace(60, 110, IMG_SIZE)
-    gradient = np.tile(x, (IMG_SIZE, 1))
-    noise = np.random.normal(0, 2.5, (IMG_SIZE, IMG_SIZE))
-    return gradient + noise
+    rng = _rng(rng)
+    gradient = np.linspace(60, 110, size, dtype=np.float32)
+    noise = rng.normal(0, 2.5, (size, size)).astype(np.float32)
+    return gradient[None, :] + noise
 
-def add_bearing_overheat(img):
+
+def add_bearing_overheat(img, cx=190, cy=130, radius=22, intensity=75):
     """
     Localized circular hotspot → bearing overheating
     """
-    cx, cy = 190, 130
-    radius = 22
-
-    for x in range(IMG_SIZE):
-        for y in range(IMG_SIZE):
-            if (x - cx) ** 2 + (y - cy) ** 2 < radius ** 2:
-                img[y, x] += 75
+    yy, xx = np.ogrid[:img.shape[0], :img.shape[1]]
+    img[(xx - cx) ** 2 + (yy - cy) ** 2 < radius ** 2] += intensity
     return img
 
-def add_misalignment(img):
+
+def add_misalignment(img, center=(128, 128), axes=(65, 18), angle=25, temperature=190):
     """
     Elongated hotspot → shaft misalignment
     """
     cv2.ellipse(
         img,
-        center=(128, 128),
-        axes=(65, 18),
-        angle=25,
+        center=(int(center[0]), int(center[1])),
+        axes=(int(axes[0]), int(axes[1])),
+        angle=float(angle),
         startAngle=0,
         endAngle=360,
-        color=190,
+        color=float(temperature),
         thickness=-1
     )
     return img
 
+
+PAINTERS = {
+    "bearing_overheat": add_bearing_overheat,
+    "misalignment": add_misalignment,
+}
+
+
+def random_fault(fault, size, rng):
+    """
+    Random placement and intensity for one fault, scaled to the frame size
+    """
+    if fault == "bearing_overheat":
+        radius = rng.uniform(0.06, 0.12) * size
+        return {
+            "type": fault,
+            "cx": round(float(rng.uniform(radius, size - radius)), 1),
+            "cy": round(float(rng.uniform(radius, size - radius)), 1),
+            "radius": round(float(radius), 1),
+            "intensity": round(float(rng.uniform(40, 90)), 1),
+        }
+    if fault == "misalignment":
+        major = rng.uniform(0.18, 0.3) * size
+        return {
+            "type": fault,
+            "center": [int(rng.uniform(major, size - major)),
+                       int(rng.uniform(major, size - major))],
+            "axes": [int(major), int(rng.uniform(0.05, 0.09) * size)],
+            "angle": round(float(rng.uniform(0, 180)), 1),
+            "temperature": round(float(rng.uniform(150, 210)), 1),
+        }
+    raise ValueError(f"Unknown fault {fault!r}; expected one of {FAULT_TYPES}")
+
+
+def paint_fault(img, fault):
+    params = {k: v for k, v in fault.items() if k != "type"}
+    return PAINTERS[fault["type"]](img, **params)
+
+
 def save_image(img, path):
     img = np.clip(img, 0, 255).astype(np.uint8)
     cv2.imwrite(path, img)
 
-def generate_images():
-    os.makedirs("../thermal_images/motor_normal", exist_ok=True)
-    os.makedirs("../thermal_images/motor_bearing_overheat", exist_ok=True)
-    os.makedirs("../thermal_images/motor_misalignment", exist_ok=True)
 
-    # Normal motors
-    for i in range(5):
-        img = base_motor_thermal()
-        save_image(img, f"../thermal_images/motor_normal/normal_{i}.png")
+# -------------------------
+# Dataset engine
+# -------------------------
+def sample_faults(fault_mix, max_faults, size, rng):
+    """
+    Picks the image class from fault_mix; faulty images get 1..max_faults
+    hotspots drawn from the non-normal part of the mix
+    """
+    names = list(fault_mix)
+    weights = np.array([fault_mix[n] for n in names], dtype=np.float64)
+    label = names[rng.choice(len(names), p=weights / weights.sum())]
+    if label == "normal":
+        return []
+
+    fault_names = [n for n in names if n != "normal"]
+    fault_weights = np.array([fault_mix[n] for n in fault_names], dtype=np.float64)
+    count = int(rng.integers(1, max_faults + 1))
+    extra = [
+        fault_names[i]
+        for i in rng.choice(len(fault_names), size=count - 1, p=fault_weights / fault_weights.sum())
+    ]
+    return [random_fault(f, size, rng) for f in [label] + extra]
+
+
+def synthesize_image(index, size=IMG_SIZE, fault_mix=None, max_faults=1, seed=0):
+    """
+    Deterministic (seed, index) -> (uint8 image, label record)
+    """
+    rng = np.random.default_rng([seed, index])
+    faults = sample_faults(fault_mix or DEFAULT_FAULT_MIX, max_faults, size, rng)
+
+    img = base_motor_thermal(size, rng)
+    for fault in faults:
+        paint_fault(img, fault)
 
-    # Bearing overheating
-    for i in range(5):
-        img = base_motor_thermal()
-        img = add_bearing_overheat(img)
-        save_image(img, f"../thermal_images/motor_bearing_overheat/bearing_{i}.png")
+    label = {
+        "index": index,
+        "label": faults[0]["type"] if faults else "normal",
+        "faults": faults,
+    }
+    return np.clip(img, 0, 255).astype(np.uint8), label
 
-    # Shaft misalignment
-    for i in range(5):
-        img = base_motor_thermal()
-        img = add_misalignment(img)
-        save_image(img, f"../thermal_images/motor_misalignment/misalignment_{i}.png")
+
+def image_path(out_dir, index, shard_size=1000):
+    # Shard directories keep 100k-image datasets browsable
+    return os.path.join(
+        out_dir, "images", f"{index // shard_size:05d}", f"thermal_{index:07d}.png"
+    )
+
+
+def _write_chunk(task):
+    out_dir, indices, size, fault_mix, max_faults, seed, stack_path = task
+
+    stack = None
+    if stack_path is not None:
+        stack = np.load(stack_path, mmap_mode="r+")
+
+    labels = []
+    for index in indices:
+        img, label = synthesize_image(index, size, fault_mix, max_faults, seed)
+        if stack is not None:
+            stack[index] = img
+        else:
+            path = image_path(out_dir, index)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cv2.imwrite(path, img)
+            label["path"] = os.path.relpath(path, out_dir)
+        labels.append(label)
+
+    if stack is not None:
+        stack.flush()
+    return labels
+
+
+def generate_dataset(out_dir, n, size=IMG_SIZE, fault_mix=None, max_faults=1,
+                     seed=0, workers=None, output_format="png", chunk_size=256):
+    """
+    Writes n images (PNG files, or one uint8 (n, size, size) .npy stack
+    with output_format="npy") plus labels.jsonl, generating in parallel
+    worker processes. Returns the manifest path.
+    """
+    if output_format not in ("png", "npy"):
+        raise ValueError("output_format must be 'png' or 'npy'")
+    os.makedirs(out_dir, exist_ok=True)
+    fault_mix = fault_mix or DEFAULT_FAULT_MIX
+
+    stack_path = None
+    if output_format == "npy":
+        stack_path = os.path.join(out_dir, "images.npy")
+        # Allocate the stack once; workers fill their slices in place
+        stack = np.lib.format.open_memmap(
+            stack_path, mode="w+", dtype=np.uint8, shape=(n, size, size)
+        )
+        del stack
+
+    tasks = [
+        (out_dir, range(start, min(start + chunk_size, n)), size, fault_mix,
+         max_faults, seed, stack_path)
+        for start in range(0, n, chunk_size)
+    ]
+
+    manifest_path = os.path.join(out_dir, "labels.jsonl")
+    with open(manifest_path, "w") as manifest, ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() keeps chunk order, so the manifest is sorted by index
+        for labels in pool.map(_write_chunk, tasks):
+            for label in labels:
+                manifest.write(json.dumps(label) + "\n")
+
+    with open(os.path.join(out_dir, "dataset.json"), "w") as f:
+        json.dump({
+            "n": n, "size": size, "fault_mix": fault_mix, "max_faults": max_faults,
+            "seed": seed, "format": output_format,
+        }, f, indent=2)
+    return manifest_path
+
+
+def load_labels(out_dir):
+    with open(os.path.join(out_dir, "labels.jsonl"), "r") as f:
+        return [json.loads(line) for line in f]
+
+
+def generate_images(out_dir=THERMAL_IMAGES_DIR, seed=None):
+    """
+    The small demo set: 5 normal, 5 bearing-overheat, 5 misalignment
+    images with the classic fixed hotspot placement
+    """
+    rng = np.random.default_rng(seed)
+    classes = (
+        ("motor_normal", "normal", None),
+        ("motor_bearing_overheat", "bearing", add_bearing_overheat),
+        ("motor_misalignment", "misalignment", add_misalignment),
+    )
+
+    for folder, prefix, painter in classes:
+        os.makedirs(os.path.join(out_dir, folder), exist_ok=True)
+        for i in range(5):
+            img = base_motor_thermal(rng=rng)
+            if painter is not None:
+                img = painter(img)
+            save_image(img, os.path.join(out_dir, folder, f"{prefix}_{i}.png"))
 
     print("Synthetic motor thermal images generated successfully.")
 
+
+def parse_fault_mix(text):
+    """
+    "normal=0.4,bearing_overheat=0.3,misalignment=0.3"
+    """
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
 if __name__ == "__main__":
-    generate_images()
+    parser = argparse.ArgumentParser(description="Synthetic motor thermal images")
+    parser.add_argument("--n", type=int, default=None,
+                        help="Dataset size; omit to write the 15-image demo set")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--size", type=int, default=IMG_SIZE)
+    parser.add_argument("--fault-mix", type=parse_fault_mix, default=DEFAULT_FAULT_MIX)
+    parser.add_argument("--max-faults", type=int, default=1,
+                        help="Maximum hotspots painted on a faulty image")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=("png", "npy"), default="png")
+    args = parser.parse_args()
+
+    if args.n is None:
+        generate_images(args.out or THERMAL_IMAGES_DIR, seed=args.seed)
+    else:
+        manifest = generate_dataset(
+            args.out or os.path.join(HERE, "..", "synthetic_dataset"),
+            args.n, size=args.size, fault_mix=args.fault_mix,
+            max_faults=args.max_faults, seed=args.seed, workers=args.workers,
+            output_format=args.format
+        )
+        print(f"Wrote {args.n} images; labels in {manifest}")
@@ -1,98 +1,171 @@
 # demo.py
-from guardrails.safety_rules import apply_guardrails
-from llm.llama_inference import MaintenanceLLM
-from guardrails.decision_safety import decision_safety_engine
-from guardrails.risk_scoring import risk_aware_decision_engine
-from temporal.trend_analysis import analyze_trend
+import argparse
+import os
+import time
 
+# CV -> interpretation -> RAG -> prompt -> LLM -> guardrails -> trend,
+# run as one profiled pipeline (see pipeline/copilot.py)
+from pipeline.copilot import build_copilot_pipeline
+from pipeline.metrics import MetricsRecorder, format_breakdown
+from pipeline.overlapped import OverlappedPipeline
 
-# STEP 1: CV — Thermal preprocessing & anomaly detection
-from cv.thermal_preprocessing import preprocess_thermal_image
-from cv.anomaly_detection import detect_thermal_anomaly
+# RAG retrieval + LLM (warm model server)
+from llm.model_client import ModelClient
+from llm.model_server import DEFAULT_MODEL_PATH
+from llm.decision_cache import DecisionCache
 
-# STEP 2: Engineering fault interpretation
-from cv.fault_interpretation import interpret_motor_fault
 
-# STEP 3: RAG retrieval
-from rag.vector_store import MaintenanceVectorStore
+MODEL_PATH = DEFAULT_MODEL_PATH
 
-# STEP 4: Prompt builder
-from llm.prompt_templates import build_prompt
 
+def print_stream(chunks):
+    print("\n=== RAW LLM OUTPUT ===")
+    parts = []
+    for chunk in chunks:
+        print(chunk, end="", flush=True)
+        parts.append(chunk)
+    print()
+    return "".join(parts)
+
+
+def main(use_cache=True, refresh_cache=False, metrics_jsonl=None,
+         radiometric_path=None, camera_id=None, profile_memory=False):
+    # ---- WARM MODELS (server if running, else loaded once in-process) ----
+    client = ModelClient(
+        local_fallback=True,
+        model_path=MODEL_PATH,
+        n_threads=8,
+        n_gpu_layers=20
+    )
+
+    copilot = build_copilot_pipeline(
+        client,
+        decision_cache=DecisionCache(enabled=use_cache),
+        render_stream=print_stream,
+        namespace=MODEL_PATH,
+        recorder=MetricsRecorder(jsonl_path=metrics_jsonl),
+        profile_memory=profile_memory
+    )
 
-def main():
     # ---- INPUT IMAGE ----
+    # A radiometric capture gives features in degrees C instead of
+    # normalized 8-bit intensities
     image_path = "data/thermal_images/motor_bearing_overheat/bearing_0.png"
 
-    # ---- CV PIPELINE ----
-    img = preprocess_thermal_image(image_path)
-    features, _ = detect_thermal_anomaly(img)
+    ctx, metrics = copilot.run(
+        image_path=image_path,
+        radiometric_path=radiometric_path,
+        camera_id=camera_id,
+        query="Motor bearing overheating with localized hotspot and high temperature",
+        bypass_cache=refresh_cache
+    )
 
     print("\n=== Thermal Anomaly Features ===")
-    print(features)
-
-    # ---- ENGINEERING INTERPRETATION ----
-    fault_info = interpret_motor_fault(features)
+    print(ctx["features"])
 
     print("\n=== Engineering Interpretation ===")
-    for k, v in fault_info.items():
+    for k, v in ctx["fault_info"].items():
         print(f"{k}: {v}")
 
-    # ---- RAG RETRIEVAL ----
-    store = MaintenanceVectorStore()
-    query = "Motor bearing overheating with localized hotspot and high temperature"
-    retrieved_logs = store.retrieve(query)
-
     print("\n=== Retrieved Maintenance Incidents ===")
-    for r in retrieved_logs:
+    for r in ctx["retrieved_logs"]:
         print(r)
 
-    # ---- BUILD PROMPT ----
-    llm_prompt = build_prompt(features, fault_info, retrieved_logs)
+    if ctx["cached"] is not None:
+        print(f"\n=== CACHED DECISION ({ctx['cached']['age_s']:.0f}s old, LLM skipped) ===")
+        print(ctx["llm_response"])
+    else:
+        print("\n=== LLM PROMPT (Preview) ===")
+        print(ctx["prompt"])
 
-    print("\n=== LLM PROMPT (Preview) ===")
-    print(llm_prompt)
+    print("\n=== FINAL GUARDED DECISION (COPILOT OUTPUT) ===")
+    print(ctx["final_decision"].model_dump_json(indent=2))
 
-    # ---- LOCAL LLaMA INFERENCE ----
-    MODEL_PATH = (
-        "C:/llama-b7613-bin-win-cuda-12.4-x64/models/"
-        "mistral-7b-instruct-v0.2.Q4_K_M.gguf"
-    )
+    print("\n=== DECISION SAFETY REPORT ===")
+    print(ctx["safety_report"])
 
-    llm = MaintenanceLLM(
+    print("\n🚨🚨🚨 RISK AWARE DECISION REPORT 🚨🚨🚨")
+    for k, v in ctx["risk_report"].items():
+        print(f"{k}: {v}")
+
+    print("\n=== PIPELINE LATENCY BREAKDOWN ===")
+    print(format_breakdown(metrics))
+
+
+def run_fleet(image_source, use_cache=True, refresh_cache=False, metrics_jsonl=None):
+    """
+    Multi-asset run: CV and retrieval for the next images overlap with LLM
+    decoding of the current one (one asset per image, named after the file)
+    """
+    from cv.batch_analysis import collect_image_paths
+
+    client = ModelClient(
+        local_fallback=True,
         model_path=MODEL_PATH,
         n_threads=8,
         n_gpu_layers=20
     )
-
-    print("\n=== RAW LLM OUTPUT ===")
-    response = llm.generate(llm_prompt)
-    final_decision = apply_guardrails(response)
-    
-    print("\n=== FINAL GUARDED DECISION (COPILOT OUTPUT) ===")
-    print(final_decision.model_dump_json(indent=2))
-
-    safety_report = decision_safety_engine(
-    features=features,
-    fault_info=fault_info,
-    retrieved_logs=retrieved_logs,
-    llm_decision=final_decision.model_dump()
-    )
-    
-    print("\n=== DECISION SAFETY REPORT ===")
-    print(safety_report)
-    
-    risk_report = risk_aware_decision_engine(
-    fault_info=fault_info,
-    retrieved_logs=retrieved_logs,
-    final_decision=final_decision.model_dump()
+    copilot = build_copilot_pipeline(
+        client,
+        decision_cache=DecisionCache(enabled=use_cache),
+        namespace=MODEL_PATH,
+        recorder=MetricsRecorder(jsonl_path=metrics_jsonl)
     )
 
-    print("\n🚨🚨🚨 RISK AWARE DECISION REPORT 🚨🚨🚨")
-    for k, v in risk_report.items():
-        print(f"{k}: {v}")
-
+    image_paths = collect_image_paths(image_source)
+    inputs = [
+        {
+            "image_path": path,
+            "asset_id": os.path.splitext(os.path.basename(path))[0],
+            "bypass_cache": refresh_cache,
+        }
+        for path in image_paths
+    ]
+
+    print(f"\n=== FLEET RUN ({len(inputs)} assets, overlapped stages) ===")
+    print(f"{'asset':<28}{'fault':<22}{'risk':<10}{'escalate':<10}{'latency s':>10}")
+
+    started = time.perf_counter()
+    for ctx, metrics in OverlappedPipeline(copilot).run(inputs):
+        if metrics["status"] != "ok":
+            print(f"{ctx['asset_id']:<28}ERROR: {ctx['error']!r}")
+            continue
+        print(
+            f"{ctx['asset_id']:<28}{ctx['fault_info']['suspected_fault']:<22}"
+            f"{ctx['risk_report']['risk_level']:<10}"
+            f"{str(ctx['safety_report']['escalate_to_human']):<10}"
+            f"{metrics['total_wall_s']:>10.2f}"
+        )
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(inputs)} assets in {elapsed:.2f}s ({len(inputs) / max(elapsed, 1e-9):.2f} assets/s)")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Thermal maintenance copilot demo")
+    parser.add_argument("--no-decision-cache", action="store_true",
+                        help="Disable the decision cache entirely")
+    parser.add_argument("--refresh-decision-cache", action="store_true",
+                        help="Skip the cache lookup but store the fresh decision")
+    parser.add_argument("--metrics-jsonl", default=None,
+                        help="Append per-stage pipeline metrics to this JSON lines file")
+    parser.add_argument("--fleet", default=None,
+                        help="Directory/glob of thermal images to analyze as a fleet "
+                             "with overlapped CV, retrieval and LLM stages")
+    parser.add_argument("--radiometric", default=None,
+                        help="16-bit TIFF / .npy radiometric capture to analyze in degrees C")
+    parser.add_argument("--camera-id", default=None,
+                        help="Camera whose calibration (COPILOT_CAMERA_CALIBRATION) to apply")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Trace per-stage peak memory of the single-asset run")
+    args = parser.parse_args()
+
+    options = dict(
+        use_cache=not args.no_decision_cache,
+        refresh_cache=args.refresh_decision_cache,
+        metrics_jsonl=args.metrics_jsonl
+    )
+    if args.fleet:
+        run_fleet(args.fleet, **options)
+    else:
+        main(radiometric_path=args.radiometric, camera_id=args.camera_id,
+             profile_memory=args.profile_memory, **options)
@@ -1,31 +1,34 @@
 # guardrails/decision_safety.py
+from guardrails.rule_table import (
+    AGGRESSIVE_ACTIONS,
+    CONSERVATIVE_RISK_LEVELS,
+    DEFAULT_EVIDENCE,
+    EVIDENCE_TIERS,
+    SIGNAL_PLAUSIBILITY_RULES,
+    rule_matches,
+)
+
 
 def assess_signal_plausibility(features):
     issues = []
 
-    if features["temperature_delta"] > 250:
-        issues.append("Unrealistically high temperature delta")
-
-    if features["hotspot_count"] == 0 and features["severity_score"] > 2:
-        issues.append("High severity without detected hotspot")
+    for message, conditions in SIGNAL_PLAUSIBILITY_RULES:
+        if rule_matches(conditions, features):
+            issues.append(message)
 
     return issues
 
 
 def assess_evidence_strength(retrieved_logs):
-    if len(retrieved_logs) >= 3:
-        return "strong"
-    elif len(retrieved_logs) == 2:
-        return "moderate"
-    else:
-        return "weak"
+    for strength, min_logs in EVIDENCE_TIERS:
+        if len(retrieved_logs) >= min_logs:
+            return strength
+    return DEFAULT_EVIDENCE
 
 
 def assess_action_safety(severity, recommended_action):
-    aggressive_actions = ["replace", "shutdown"]
-
-    if severity in ["low", "medium"]:
-        for word in aggressive_actions:
+    if severity in CONSERVATIVE_RISK_LEVELS:
+        for word in AGGRESSIVE_ACTIONS:
             if word in recommended_action.lower():
                 return False
 
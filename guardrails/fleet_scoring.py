@@ -0,0 +1,230 @@
+# guardrails/fleet_scoring.py
+# Columnar counterparts of interpret_motor_fault, risk_aware_decision_engine
+# and decision_safety_engine. Inputs are mappings of equal-length columns
+# (a dict of NumPy arrays such as cv.batch_analysis output, or a pandas
+# DataFrame); every rule is evaluated once per column, not once per asset.
+import numpy as np
+
+from guardrails.risk_scoring import compute_risk_score
+from guardrails.rule_table import (
+    AGGRESSIVE_ACTIONS,
+    CONSERVATIVE_RISK_LEVELS,
+    DEFAULT_EVIDENCE,
+    DEFAULT_FAULT,
+    DEFAULT_IMPACT,
+    DEFAULT_RISK_LEVEL,
+    DEFAULT_SEVERITY_SCORE,
+    EVIDENCE_TIERS,
+    FAULT_RULES,
+    IMPACT_TIERS,
+    INVALID_FAULT,
+    NO_HISTORY_IMPACT,
+    RISK_LEVELS,
+    SEVERITY_SCORES,
+    SIGNAL_PLAUSIBILITY_RULES,
+    rule_matches,
+)
+
+FEATURE_FIELDS = ("hotspot_count", "severity_score", "temperature_delta")
+
+
+def _columns(features):
+    return {name: np.asarray(features[name]) for name in FEATURE_FIELDS}
+
+
+def invalid_rows(features):
+    """
+    Rows that cannot be scored: valid=False (cv.batch_analysis marks
+    unreadable images so) or a NaN in any feature
+    """
+    columns = _columns(features)
+    invalid = np.zeros(len(columns["severity_score"]), dtype=bool)
+    for values in columns.values():
+        invalid |= np.isnan(values.astype(np.float64))
+    if "valid" in features:
+        invalid |= ~np.asarray(features["valid"], dtype=bool)
+    return invalid
+
+
+def _tiered(values, tiers, default):
+    """
+    First-matching (label, minimum) tier per element, like the scalar loops
+    """
+    values = np.asarray(values)
+    return np.select(
+        [values >= minimum for _, minimum in tiers],
+        [label for label, _ in tiers],
+        default
+    )
+
+
+# -------------------------
+# Fault interpretation
+# -------------------------
+def interpret_motor_faults(features):
+    """
+    Vectorized interpret_motor_fault: suspected_fault and risk_level arrays.
+    Invalid rows (see invalid_rows) get INVALID_FAULT.
+    """
+    columns = _columns(features)
+    n = len(columns["severity_score"])
+
+    # Index of the first matching rule; len(FAULT_RULES) means the default
+    # and len(FAULT_RULES) + 1 an invalid row
+    rule_index = np.select(
+        [invalid_rows(features)]
+        + [np.broadcast_to(rule_matches(r["conditions"], columns), (n,)) for r in FAULT_RULES],
+        [len(FAULT_RULES) + 1] + list(range(len(FAULT_RULES))),
+        len(FAULT_RULES)
+    )
+
+    rules = list(FAULT_RULES) + [DEFAULT_FAULT, INVALID_FAULT]
+    return {
+        "suspected_fault": np.array([r["suspected_fault"] for r in rules])[rule_index],
+        "risk_level": np.array([r["risk_level"] for r in rules])[rule_index],
+    }
+
+
+# -------------------------
+# Risk scoring
+# -------------------------
+def map_severity_to_scores(risk_levels):
+    levels, inverse = np.unique(np.asarray(risk_levels, dtype=str), return_inverse=True)
+    scores = np.array(
+        [SEVERITY_SCORES.get(level.lower(), DEFAULT_SEVERITY_SCORE) for level in levels],
+        dtype=np.int64
+    )
+    return scores[inverse.reshape(-1)]
+
+
+def summarize_evidence(retrieved_logs_per_asset):
+    """
+    Per-asset (avg_downtime, avg_cost, n_logs) columns from lists of logs
+    """
+    n_logs = np.array([len(logs) for logs in retrieved_logs_per_asset], dtype=np.int64)
+    downtime = np.zeros(len(n_logs))
+    cost = np.zeros(len(n_logs))
+    for i, logs in enumerate(retrieved_logs_per_asset):
+        if logs:
+            downtime[i] = sum(r["downtime_hours"] for r in logs) / len(logs)
+            cost[i] = sum(r["repair_cost_usd"] for r in logs) / len(logs)
+    return downtime, cost, n_logs
+
+
+def estimate_impacts(avg_downtime, avg_cost, n_logs=None):
+    avg_downtime = np.asarray(avg_downtime, dtype=np.float64)
+    avg_cost = np.asarray(avg_cost, dtype=np.float64)
+
+    impact = np.select(
+        [(avg_downtime > d) | (avg_cost > c) for _, d, c in IMPACT_TIERS],
+        [score for score, _, _ in IMPACT_TIERS],
+        DEFAULT_IMPACT
+    )
+    if n_logs is not None:
+        impact = np.where(np.asarray(n_logs) == 0, NO_HISTORY_IMPACT, impact)
+    return impact
+
+
+def classify_risks(risk_scores):
+    return _tiered(risk_scores, RISK_LEVELS, DEFAULT_RISK_LEVEL)
+
+
+def risk_aware_decisions(risk_levels, avg_downtime, avg_cost, confidence, n_logs=None):
+    """
+    Vectorized risk_aware_decision_engine. confidence may be a scalar or a
+    column (e.g. the confidence of each asset's last guarded decision).
+    """
+    severity = map_severity_to_scores(risk_levels)
+    impact = estimate_impacts(avg_downtime, avg_cost, n_logs)
+    confidence = np.broadcast_to(np.asarray(confidence, dtype=np.float64), severity.shape)
+
+    risk_score = compute_risk_score(severity, impact, confidence)
+    return {
+        "severity_score": severity,
+        "impact_score": impact,
+        "uncertainty": np.round(1 - confidence, 2),
+        "risk_score": np.round(risk_score, 2),
+        "risk_level": classify_risks(risk_score),
+    }
+
+
+# -------------------------
+# Decision safety
+# -------------------------
+def assess_signal_plausibility_batch(features):
+    """
+    {issue message: bool array} for every plausibility rule
+    """
+    columns = _columns(features)
+    n = len(columns["severity_score"])
+    return {
+        message: np.broadcast_to(rule_matches(conditions, columns), (n,))
+        for message, conditions in SIGNAL_PLAUSIBILITY_RULES
+    }
+
+
+def assess_evidence_strengths(n_logs):
+    return _tiered(n_logs, EVIDENCE_TIERS, DEFAULT_EVIDENCE)
+
+
+def assess_action_safety_batch(risk_levels, recommended_actions):
+    actions = np.char.lower(np.asarray(recommended_actions, dtype=str))
+    aggressive = np.zeros(actions.shape, dtype=bool)
+    for word in AGGRESSIVE_ACTIONS:
+        aggressive |= np.char.find(actions, word) >= 0
+
+    conservative = np.isin(np.asarray(risk_levels, dtype=str), CONSERVATIVE_RISK_LEVELS)
+    return ~(conservative & aggressive)
+
+
+def decision_safety_batch(features, risk_levels, n_logs, recommended_actions=None):
+    """
+    Vectorized decision_safety_engine. Without recommended_actions (e.g. a
+    nightly re-score with no fresh LLM decision) every action counts as safe.
+    Invalid rows are always escalated.
+    """
+    issues = assess_signal_plausibility_batch(features)
+    signal_issue = np.zeros(len(np.asarray(risk_levels)), dtype=bool)
+    for flags in issues.values():
+        signal_issue |= flags
+
+    evidence = assess_evidence_strengths(n_logs)
+    if recommended_actions is None:
+        action_safe = np.ones(signal_issue.shape, dtype=bool)
+    else:
+        action_safe = assess_action_safety_batch(risk_levels, recommended_actions)
+
+    invalid = invalid_rows(features)
+    return {
+        "invalid": invalid,
+        "signal_issue": signal_issue,
+        "evidence_strength": evidence,
+        "action_safe": action_safe,
+        "escalate_to_human": invalid | signal_issue | (evidence == "weak") | ~action_safe,
+    }
+
+
+# -------------------------
+# One pass over the fleet
+# -------------------------
+def score_fleet(features, avg_downtime, avg_cost, n_logs, confidence=1.0,
+                recommended_actions=None):
+    """
+    Fault labels, risk scores and escalation flags for N assets as one
+    columnar dict. Rows with valid=False or NaN features are labelled
+    "invalid" and escalated rather than scored as normal operation.
+    """
+    faults = interpret_motor_faults(features)
+    risk = risk_aware_decisions(
+        faults["risk_level"], avg_downtime, avg_cost, confidence, n_logs
+    )
+    safety = decision_safety_batch(
+        features, faults["risk_level"], n_logs, recommended_actions
+    )
+
+    return {
+        "suspected_fault": faults["suspected_fault"],
+        "fault_risk_level": faults["risk_level"],
+        **risk,
+        **safety,
+    }
@@ -1,12 +1,17 @@
 # guardrails/risk_scoring.py
+from guardrails.rule_table import (
+    DEFAULT_IMPACT,
+    DEFAULT_RISK_LEVEL,
+    DEFAULT_SEVERITY_SCORE,
+    IMPACT_TIERS,
+    NO_HISTORY_IMPACT,
+    RISK_LEVELS,
+    SEVERITY_SCORES,
+)
+
 
 def map_severity_to_score(risk_level):
-    mapping = {
-        "low": 1,
-        "medium": 2,
-        "high": 3
-    }
-    return mapping.get(risk_level.lower(), 2)
+    return SEVERITY_SCORES.get(risk_level.lower(), DEFAULT_SEVERITY_SCORE)
 
 
 def estimate_impact(retrieved_logs):
@@ -14,19 +19,17 @@ def estimate_impact(retrieved_logs):
     Impact is estimated from historical downtime and repair cost.
     """
     if not retrieved_logs:
-        return 1  # minimal impact if no history
+        return NO_HISTORY_IMPACT  # minimal impact if no history
 
     avg_downtime = sum(r["downtime_hours"] for r in retrieved_logs) / len(retrieved_logs)
     avg_cost = sum(r["repair_cost_usd"] for r in retrieved_logs) / len(retrieved_logs)
 
     # Normalize impact roughly
-    impact_score = 1
-    if avg_downtime > 4 or avg_cost > 1000:
-        impact_score = 3
-    elif avg_downtime > 2 or avg_cost > 500:
-        impact_score = 2
+    for impact_score, downtime_above, cost_above in IMPACT_TIERS:
+        if avg_downtime > downtime_above or avg_cost > cost_above:
+            return impact_score
 
-    return impact_score
+    return DEFAULT_IMPACT
 
 
 def compute_risk_score(severity_score, impact_score, confidence):
@@ -35,12 +38,10 @@ def compute_risk_score(severity_score, impact_score, confidence):
 
 
 def classify_risk(risk_score):
-    if risk_score >= 7:
-        return "CRITICAL"
-    elif risk_score >= 4:
-        return "CAUTION"
-    else:
-        return "SAFE"
+    for risk_level, min_score in RISK_LEVELS:
+        if risk_score >= min_score:
+            return risk_level
+    return DEFAULT_RISK_LEVEL
 
 
 def risk_aware_decision_engine(fault_info, retrieved_logs, final_decision):
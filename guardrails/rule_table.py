@@ -0,0 +1,132 @@
+# guardrails/rule_table.py
+# Declarative thresholds shared by the per-asset rule functions and their
+# vectorized fleet counterparts (guardrails/fleet_scoring.py). Change a
+# threshold here and both paths follow.
+import operator
+
+OPS = {
+    "==": operator.eq,
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+}
+
+
+# ---- Fault interpretation (cv/fault_interpretation.py) ----
+# Checked in order; the first rule whose conditions all hold wins.
+FAULT_RULES = (
+    {
+        "suspected_fault": "bearing_overheating",
+        "risk_level": "high",
+        "conditions": (
+            ("hotspot_count", "==", 1),
+            ("severity_score", ">", 0.8),
+            ("temperature_delta", ">", 40),
+        ),
+        "engineering_reasoning": (
+            "A localized high-temperature region near the bearing zone "
+            "indicates excessive friction, likely caused by bearing wear "
+            "or lubrication failure."
+        ),
+        "recommended_next_step": (
+            "Inspect bearing condition and lubrication. "
+            "Plan bearing replacement if abnormal wear is confirmed."
+        ),
+    },
+    {
+        "suspected_fault": "shaft_misalignment",
+        "risk_level": "medium",
+        "conditions": (
+            ("hotspot_count", ">=", 1),
+            ("severity_score", ">", 0.4),
+            ("severity_score", "<=", 0.8),
+        ),
+        "engineering_reasoning": (
+            "Elongated or moderately severe thermal anomalies "
+            "suggest uneven load distribution, commonly caused by shaft misalignment."
+        ),
+        "recommended_next_step": (
+            "Perform shaft alignment check and vibration analysis."
+        ),
+    },
+)
+
+DEFAULT_FAULT = {
+    "suspected_fault": "normal_operation",
+    "risk_level": "low",
+    "engineering_reasoning": (
+        "Observed temperature variations are within acceptable operating limits."
+    ),
+    "recommended_next_step": (
+        "Continue routine monitoring."
+    ),
+}
+
+# Rows whose features could not be extracted (valid=False or NaN) in the
+# fleet path; never scored as normal operation
+INVALID_FAULT = {
+    "suspected_fault": "invalid",
+    "risk_level": "unknown",
+    "engineering_reasoning": (
+        "Thermal features could not be extracted from this capture."
+    ),
+    "recommended_next_step": (
+        "Re-capture the thermal image and have an engineer review the asset."
+    ),
+}
+
+
+# ---- Risk scoring (guardrails/risk_scoring.py) ----
+SEVERITY_SCORES = {"low": 1, "medium": 2, "high": 3}
+DEFAULT_SEVERITY_SCORE = 2
+
+# Impact when there is no historical evidence at all
+NO_HISTORY_IMPACT = 1
+# (impact, avg downtime above, avg cost above): either exceeding is enough
+IMPACT_TIERS = (
+    (3, 4, 1000),
+    (2, 2, 500),
+)
+DEFAULT_IMPACT = 1
+
+# (risk level, minimum risk score), highest first
+RISK_LEVELS = (
+    ("CRITICAL", 7),
+    ("CAUTION", 4),
+)
+DEFAULT_RISK_LEVEL = "SAFE"
+
+
+# ---- Decision safety (guardrails/decision_safety.py) ----
+SIGNAL_PLAUSIBILITY_RULES = (
+    ("Unrealistically high temperature delta", (
+        ("temperature_delta", ">", 250),
+    )),
+    ("High severity without detected hotspot", (
+        ("hotspot_count", "==", 0),
+        ("severity_score", ">", 2),
+    )),
+)
+
+# (evidence strength, minimum number of retrieved logs), strongest first
+EVIDENCE_TIERS = (
+    ("strong", 3),
+    ("moderate", 2),
+)
+DEFAULT_EVIDENCE = "weak"
+
+AGGRESSIVE_ACTIONS = ("replace", "shutdown")
+# Risk levels for which an aggressive action is considered unsafe
+CONSERVATIVE_RISK_LEVELS = ("low", "medium")
+
+
+def rule_matches(conditions, values):
+    """
+    AND of (field, op, threshold) conditions. Works on scalars and, since
+    the comparisons broadcast, on NumPy columns (returns a bool array).
+    """
+    matched = True
+    for field, op, threshold in conditions:
+        matched = matched & OPS[op](values[field], threshold)
+    return matched
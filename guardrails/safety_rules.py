@@ -1,6 +1,11 @@
+import json
 import re
 from guardrails.output_schema import MaintenanceDecision
 
+LOW_CONFIDENCE_ACTION = (
+    "Manual inspection required before any maintenance decision."
+)
+
 
 def _safe_float(value, default=0.5):
     try:
@@ -47,9 +52,7 @@ def apply_guardrails(llm_text: str) -> MaintenanceDecision:
     # ACTION GATING
     # ----------------------------
     if confidence < 0.6:
-        recommended_action = (
-            "Manual inspection required before any maintenance decision."
-        )
+        recommended_action = LOW_CONFIDENCE_ACTION
     else:
         recommended_action = (
             "Inspect bearing condition and lubrication. "
@@ -69,3 +72,40 @@ def apply_guardrails(llm_text: str) -> MaintenanceDecision:
         repair_cost_usd_max=1200,
         confidence=round(confidence, 2),
     )
+
+
+def _extract_json_object(llm_text):
+    start = llm_text.find("{")
+    if start == -1:
+        return None
+    payload, _ = json.JSONDecoder().raw_decode(llm_text[start:])
+    return payload
+
+
+def parse_structured_decision(llm_text: str) -> MaintenanceDecision:
+    """
+    Validate JSON output from schema-constrained generation and apply the
+    same confidence gating. Falls back to apply_guardrails on bad output.
+    This function MUST NEVER crash.
+    """
+    try:
+        payload = _extract_json_object(llm_text)
+        if not isinstance(payload, dict):
+            return apply_guardrails(llm_text)
+
+        payload["confidence"] = round(
+            _safe_float(payload.get("confidence")), 2
+        )
+        decision = MaintenanceDecision.model_validate(payload)
+    except Exception:
+        return apply_guardrails(llm_text)
+
+    # ----------------------------
+    # ACTION GATING
+    # ----------------------------
+    if decision.confidence < 0.6:
+        decision = decision.model_copy(
+            update={"recommended_action": LOW_CONFIDENCE_ACTION}
+        )
+
+    return decision
@@ -0,0 +1,225 @@
+import asyncio
+import concurrent.futures
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Extra wait for a result past the request's own deadline before a
+# synchronous caller stops waiting on the scheduler loop
+RESULT_GRACE_S = 1.0
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class SchedulerStopped(RuntimeError):
+    pass
+
+
+class _Request:
+    __slots__ = ("prompt", "structured", "deadline", "future")
+
+    def __init__(self, prompt, structured, deadline, future):
+        self.prompt = prompt
+        self.structured = structured
+        self.deadline = deadline
+        self.future = future
+
+
+class DecisionScheduler:
+    """
+    Groups concurrent decision requests into batched decoding passes.
+
+    Requests wait at most max_wait_ms for companions, batches hold at most
+    max_batch_size prompts, and a request whose deadline has passed is
+    failed with DeadlineExceeded instead of being decoded.
+
+    The backend must provide generate_batch(prompts, structured=False) or,
+    failing that, generate(prompt, structured=False).
+    """
+
+    def __init__(self, backend, max_batch_size=8, max_wait_ms=20):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+
+        self._queue = None
+        self._worker = None
+        self._executor = None
+        self._batch = []  # taken off the queue, not yet answered
+
+        self.queue_depth_histogram = Counter()
+        self.batch_size_histogram = Counter()
+        self.completed = 0
+        self.expired = 0
+        self.failed = 0
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            # One decode at a time; the backend owns the model
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the batching loop; queued and in-flight requests fail with
+        SchedulerStopped instead of waiting forever
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._executor.shutdown(wait=False)
+
+            pending, self._batch = self._batch, []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            for request in pending:
+                if not request.future.done():
+                    self.failed += 1
+                    request.future.set_exception(SchedulerStopped("decision scheduler stopped"))
+
+    # -------------------------
+    # API
+    # -------------------------
+    async def submit(self, prompt, structured=False, deadline_s=None):
+        """
+        Queues one prompt and returns its generated text.
+        deadline_s: seconds from now after which the caller gives up.
+        """
+        await self.start()
+        loop = asyncio.get_running_loop()
+
+        deadline = loop.time() + deadline_s if deadline_s is not None else None
+        request = _Request(prompt, structured, deadline, loop.create_future())
+
+        self.queue_depth_histogram[self._queue.qsize()] += 1
+        await self._queue.put(request)
+
+        if deadline is None:
+            return await request.future
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(request.future), max(deadline - loop.time(), 0)
+            )
+        except asyncio.TimeoutError:
+            request.future.cancel()  # the batcher skips it from now on
+            raise DeadlineExceeded(f"decision not ready within {deadline_s}s") from None
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "completed": self.completed,
+            "expired": self.expired,
+            "failed": self.failed,
+            "queue_depth_histogram": dict(sorted(self.queue_depth_histogram.items())),
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+        }
+
+    # -------------------------
+    # Batching loop
+    # -------------------------
+    async def _collect_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = self._batch = [await self._queue.get()]
+        flush_at = loop.time() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            remaining = flush_at - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _generate(self, prompts, structured):
+        if hasattr(self.backend, "generate_batch"):
+            return self.backend.generate_batch(prompts, structured=structured)
+        return [self.backend.generate(p, structured=structured) for p in prompts]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+
+            live = []
+            for request in batch:
+                if request.future.done():
+                    continue  # caller went away
+                if request.deadline is not None and loop.time() >= request.deadline:
+                    self.expired += 1
+                    request.future.set_exception(DeadlineExceeded("deadline passed in queue"))
+                    continue
+                live.append(request)
+
+            # Structured and free-form prompts decode with different settings
+            for structured in (False, True):
+                group = [r for r in live if r.structured == structured]
+                if not group:
+                    continue
+
+                self.batch_size_histogram[len(group)] += 1
+                try:
+                    texts = await loop.run_in_executor(
+                        self._executor, self._generate, [r.prompt for r in group], structured
+                    )
+                except Exception as exc:
+                    self.failed += len(group)
+                    for request in group:
+                        if not request.future.done():
+                            request.future.set_exception(exc)
+                    continue
+
+                for request, text in zip(group, texts):
+                    if not request.future.done():
+                        request.future.set_result(text)
+                        self.completed += 1
+
+            self._batch = []
+
+
+class BackgroundScheduler:
+    """
+    Runs a DecisionScheduler on its own event loop thread so synchronous
+    code (e.g. the threaded model server) can submit to it.
+    """
+
+    def __init__(self, backend, **scheduler_kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.scheduler = DecisionScheduler(backend, **scheduler_kwargs)
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def generate(self, prompt, structured=False, deadline_s=None):
+        future = asyncio.run_coroutine_threadsafe(
+            self.scheduler.submit(prompt, structured=structured, deadline_s=deadline_s),
+            self.loop
+        )
+        # submit enforces the deadline itself; the grace period only bounds
+        # the wait when the loop thread cannot answer (stopped or wedged)
+        timeout = deadline_s + RESULT_GRACE_S if deadline_s is not None else None
+        try:
+            return future.result(timeout=timeout)
+        except DeadlineExceeded:
+            raise
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"decision not ready within {deadline_s}s") from None
+
+    def stats(self):
+        return self.scheduler.stats()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.scheduler.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from rag.log_keys import record_key
+
+DEFAULT_CACHE_PATH = os.environ.get("COPILOT_DECISION_CACHE", "decision_cache.sqlite3")
+
+# Quantization step per anomaly feature. Frames of a stable machine differ
+# by sensor noise well below these steps, so they map to the same key.
+FEATURE_STEPS = {
+    "mean_temperature": 1.0,
+    "max_temperature": 1.0,
+    "temperature_delta": 1.0,
+    "severity_score": 0.02,
+}
+
+
+def quantize_features(anomaly_features, steps=None):
+    """
+    Canonical form of the anomaly features: stepped values for the
+    continuous features, exact values for counts and labels. Per-hotspot
+    details (lists/dicts) are left out of the key.
+    """
+    steps = FEATURE_STEPS if steps is None else steps
+    quantized = {}
+    for name, value in anomaly_features.items():
+        if isinstance(value, (list, tuple, dict)):
+            continue
+        step = steps.get(name)
+        if step and isinstance(value, (int, float)):
+            quantized[name] = int(round(float(value) / step))
+        else:
+            quantized[name] = value
+    return quantized
+
+
+def decision_cache_key(anomaly_features, fault_interpretation, retrieved_logs,
+                       namespace="", steps=None):
+    """
+    sha256 over the quantized features, the suspected fault label and the
+    identities of the retrieved logs (order-insensitive).
+    namespace: separates entries of different models / prompt versions.
+    """
+    if isinstance(fault_interpretation, dict):
+        fault_label = fault_interpretation.get("suspected_fault")
+    else:
+        fault_label = fault_interpretation
+
+    canonical = json.dumps({
+        "namespace": namespace,
+        "features": quantize_features(anomaly_features, steps),
+        "fault": fault_label,
+        "logs": sorted(record_key(log) for log in retrieved_logs),
+    }, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DecisionCache:
+    """
+    Bounded SQLite store of guarded decisions.
+
+    Entries expire ttl_s seconds after they were written; beyond max_entries
+    the least recently read entries are evicted. enabled=False turns every
+    call into a no-op; get(..., bypass=True) skips the lookup but the
+    fresh decision is still stored by put().
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_s=7 * 24 * 3600,
+                 max_entries=10000, enabled=True):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            # Streamlit reruns the script on other threads
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                "key TEXT PRIMARY KEY, decision TEXT NOT NULL, raw_text TEXT, "
+                "created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS decisions_last_access "
+                "ON decisions(last_access)"
+            )
+            self._conn.commit()
+
+    # -------------------------
+    # API
+    # -------------------------
+    def get(self, key, bypass=False):
+        """
+        Returns {"decision": MaintenanceDecision, "raw_text", "age_s"} or None
+        """
+        if not self.enabled or bypass:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT decision, raw_text, created FROM decisions WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is not None and now - row[2] > self.ttl_s:
+                self._conn.execute("DELETE FROM decisions WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE decisions SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        # pydantic is only needed once there is a hit to rebuild
+        from guardrails.output_schema import MaintenanceDecision
+
+        return {
+            "decision": MaintenanceDecision.model_validate_json(row[0]),
+            "raw_text": row[1],
+            "age_s": round(now - row[2], 3),
+        }
+
+    def put(self, key, decision, raw_text=None):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO decisions "
+                "(key, decision, raw_text, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, decision.model_dump_json(), raw_text, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute(
+            "DELETE FROM decisions WHERE created < ?", (now - self.ttl_s,)
+        )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM decisions WHERE key IN ("
+                "SELECT key FROM decisions ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM decisions")
+            self._conn.commit()
+
+    def stats(self):
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                (entries,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM decisions"
+                ).fetchone()
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self.enabled = False
@@ -1,12 +1,32 @@
-from llama_cpp import Llama
+from collections import OrderedDict
+
+from llama_cpp import Llama, LlamaGrammar
+
+from llm.prompt_templates import SYSTEM_HEADER
+from llm.structured_output import JsonObjectTracker, decision_grammar_schema
+
+
+def _common_prefix_len(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
 
 class MaintenanceLLM:
+    # generate_batch decodes its prompts one after another, so grouping
+    # requests only delays them (see llm.model_server)
+    batched_decoding = False
+
     def __init__(
         self,
         model_path,
         n_ctx=4096,
         n_threads=8,
-        n_gpu_layers=0  # keep 0 for CPU; increase if GPU works
+        n_gpu_layers=0,  # keep 0 for CPU; increase if GPU works
+        prefix_cache_size=4
     ):
         self.llm = Llama(
             model_path=model_path,
@@ -16,12 +36,121 @@ class MaintenanceLLM:
             verbose=False
         )
 
-    def generate(self, prompt):
-        response = self.llm(
-            prompt,
-            max_tokens=350,
-            temperature=0.2,
-            top_p=0.9,
-            stop=["</s>"]
-        )
+        # Saved KV states of static prompt headers: prefix text -> (tokens, state)
+        self.prefix_cache_size = prefix_cache_size
+        self._prefix_states = OrderedDict()
+        self.prefill_stats = {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "prefill_tokens_saved": 0,
+            "last_prefill_tokens_saved": 0,
+        }
+        self._decision_grammar = None
+
+    def _evaluated_tokens(self):
+        return list(self.llm.input_ids[: self.llm.n_tokens])
+
+    def _prime_prefix(self, prefix):
+        """
+        Leaves the context holding the evaluated prefix. Returns the prefix
+        tokens and whether the prefill came from a saved state.
+        """
+        entry = self._prefix_states.get(prefix)
+
+        if entry is None:
+            tokens = self.llm.tokenize(prefix.encode("utf-8"), add_bos=True)
+            self.llm.reset()
+            self.llm.eval(tokens)
+            entry = (tokens, self.llm.save_state())
+
+            self._prefix_states[prefix] = entry
+            while len(self._prefix_states) > self.prefix_cache_size:
+                self._prefix_states.popitem(last=False)
+            return tokens, False
+
+        self._prefix_states.move_to_end(prefix)
+        tokens, state = entry
+        # The context may still hold this prefix from the previous call
+        if self._evaluated_tokens()[: len(tokens)] != list(tokens):
+            self.llm.load_state(state)
+        return tokens, True
+
+    def _prepare(self, prompt, prefix):
+        """
+        Restores the cached header state and records prefill savings
+        """
+        if prefix is None and prompt.startswith(SYSTEM_HEADER):
+            prefix = SYSTEM_HEADER
+
+        prompt_tokens = self.llm.tokenize(prompt.encode("utf-8"), add_bos=True)
+
+        saved = 0
+        if prefix and self.prefix_cache_size > 0:
+            prefix_tokens, hit = self._prime_prefix(prefix)
+            if hit:
+                # llama.cpp skips every prompt token already in the context
+                saved = _common_prefix_len(prefix_tokens, prompt_tokens)
+
+        self.prefill_stats["calls"] += 1
+        self.prefill_stats["prompt_tokens"] += len(prompt_tokens)
+        self.prefill_stats["prefill_tokens_saved"] += saved
+        self.prefill_stats["last_prefill_tokens_saved"] = saved
+
+    def _completion_kwargs(self, structured):
+        kwargs = {
+            "max_tokens": 350,
+            "temperature": 0.2,
+            "top_p": 0.9,
+            "stop": ["</s>"],
+        }
+        if structured:
+            if self._decision_grammar is None:
+                self._decision_grammar = LlamaGrammar.from_json_schema(
+                    decision_grammar_schema(), verbose=False
+                )
+            kwargs["grammar"] = self._decision_grammar
+        return kwargs
+
+    def generate(self, prompt, prefix=None, structured=False):
+        """
+        prefix: static prompt header whose KV state is cached and reused;
+        defaults to the copilot system header when the prompt starts with it.
+        structured: constrain output to the MaintenanceDecision JSON schema.
+        """
+        if structured:
+            return "".join(self.generate_stream(prompt, prefix, structured)).strip()
+
+        self._prepare(prompt, prefix)
+        response = self.llm(prompt, **self._completion_kwargs(False))
         return response["choices"][0]["text"].strip()
+
+    def generate_stream(self, prompt, prefix=None, structured=False):
+        """
+        Yields text chunks as tokens are decoded. In structured mode decoding
+        stops as soon as the JSON object is complete.
+        """
+        self._prepare(prompt, prefix)
+        tracker = JsonObjectTracker() if structured else None
+
+        stream = self.llm(prompt, stream=True, **self._completion_kwargs(structured))
+        try:
+            for chunk in stream:
+                text = chunk["choices"][0]["text"]
+                if tracker is not None:
+                    text = text[:tracker.feed(text)]
+                if text:
+                    yield text
+                if tracker is not None and tracker.complete:
+                    break
+        finally:
+            stream.close()
+
+    def generate_batch(self, prompts, structured=False):
+        """
+        Decodes a batch of prompts for the request scheduler.
+
+        The high-level llama.cpp binding has one sequence per context, so the
+        batch runs back to back (every prompt after the first reuses the
+        evaluated system header); this is not batched decoding.
+        """
+        return [self.generate(p, structured=structured) for p in prompts]
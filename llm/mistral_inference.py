@@ -1,19 +1,94 @@
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from threading import Event, Thread
+
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
+)
 import torch
 
+from llm.structured_output import JsonObjectTracker
+
 MODEL_NAME = "mistralai/Mistral-7B-Instruct-v0.2"
 
+
+class _JsonCompleteCriteria(StoppingCriteria):
+    """
+    Stops decoding once the streamed JSON object has closed
+    """
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return self.tracker.complete
+
+
+class _CancelledCriteria(StoppingCriteria):
+    """
+    Stops decoding once the consumer of a stream has gone away
+    """
+
+    def __init__(self, cancelled):
+        self.cancelled = cancelled
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return self.cancelled.is_set()
+
+
+class _BatchJsonCompleteCriteria(StoppingCriteria):
+    """
+    Per-sequence stop flags for a padded batch: a row is done once its
+    generated text holds a complete JSON object. Every row keeps its own
+    tracker and is fed only the tokens added since the previous step.
+    """
+
+    def __init__(self, tokenizer, prompt_length, batch_size):
+        self.tokenizer = tokenizer
+        self.trackers = [JsonObjectTracker() for _ in range(batch_size)]
+        self.fed = [prompt_length] * batch_size
+
+    def __call__(self, input_ids, scores, **kwargs):
+        for row, tracker in enumerate(self.trackers):
+            if tracker.complete:
+                continue
+            text = self.tokenizer.decode(input_ids[row, self.fed[row]:], skip_special_tokens=True)
+            if text.endswith("\ufffd"):
+                continue  # partial UTF-8 character: wait for the rest of it
+            tracker.feed(text)
+            self.fed[row] = input_ids.shape[1]
+
+        done = [tracker.complete for tracker in self.trackers]
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+
 class MaintenanceLLM:
+    # generate_batch runs one padded generate() over all prompts
+    batched_decoding = True
+
     def __init__(self):
         self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        # Left padding so every row of a batch ends at the generation point
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
         self.model = AutoModelForCausalLM.from_pretrained(
             MODEL_NAME,
             torch_dtype=torch.float16,
             device_map="auto"
         )
 
-    def generate(self, prompt):
+    def generate(self, prompt, structured=False):
+        """
+        Returns only the generated continuation (prompt excluded)
+        """
+        if structured:
+            return "".join(self.generate_stream(prompt, structured=True)).strip()
+
         inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+        prompt_length = inputs["input_ids"].shape[1]
 
         with torch.no_grad():
             output = self.model.generate(
@@ -23,4 +98,84 @@ class MaintenanceLLM:
                 do_sample=False
             )
 
-        return self.tokenizer.decode(output[0], skip_special_tokens=True)
+        return self.tokenizer.decode(output[0, prompt_length:], skip_special_tokens=True).strip()
+
+    def generate_stream(self, prompt, structured=False):
+        """
+        Yields decoded text as it is produced (prompt excluded). In structured
+        mode generation stops as soon as the JSON object is complete; it
+        also stops when the consumer closes the generator early.
+        """
+        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+        streamer = TextIteratorStreamer(
+            self.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+
+        tracker = JsonObjectTracker() if structured else None
+        cancelled = Event()
+        stopping = StoppingCriteriaList([_CancelledCriteria(cancelled)])
+        if tracker is not None:
+            stopping.append(_JsonCompleteCriteria(tracker))
+
+        def _run():
+            with torch.no_grad():
+                self.model.generate(
+                    **inputs,
+                    max_new_tokens=350,
+                    temperature=0.2,
+                    do_sample=False,
+                    streamer=streamer,
+                    stopping_criteria=stopping
+                )
+
+        worker = Thread(target=_run, daemon=True)
+        worker.start()
+
+        try:
+            for text in streamer:
+                if tracker is not None:
+                    if tracker.complete:
+                        continue  # drain the last chunk(s) after the stop
+                    text = text[:tracker.feed(text)]
+                if text:
+                    yield text
+        finally:
+            # A closed or failed consumer ends decoding at the next token
+            cancelled.set()
+            worker.join()
+
+    def generate_batch(self, prompts, structured=False):
+        """
+        One padded generate() call for the whole batch; returns only the
+        generated continuation of each prompt
+        """
+        inputs = self.tokenizer(
+            prompts, return_tensors="pt", padding=True
+        ).to(self.model.device)
+        prompt_length = inputs["input_ids"].shape[1]
+
+        stopping = StoppingCriteriaList(
+            [_BatchJsonCompleteCriteria(self.tokenizer, prompt_length, len(prompts))]
+            if structured else []
+        )
+
+        with torch.no_grad():
+            output = self.model.generate(
+                **inputs,
+                max_new_tokens=350,
+                temperature=0.2,
+                do_sample=False,
+                pad_token_id=self.tokenizer.pad_token_id,
+                stopping_criteria=stopping
+            )
+
+        texts = self.tokenizer.batch_decode(
+            output[:, prompt_length:], skip_special_tokens=True
+        )
+        if structured:
+            trimmed = []
+            for text in texts:
+                tracker = JsonObjectTracker()
+                trimmed.append(text[:tracker.feed(text)])
+            texts = trimmed
+        return [t.strip() for t in texts]
@@ -0,0 +1,218 @@
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from llm.model_server import DEFAULT_HOST, DEFAULT_PORT, ModelRegistry
+
+DEFAULT_SERVER_URL = os.environ.get(
+    "COPILOT_MODEL_SERVER_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+)
+
+# In-process fallback registries survive Streamlit reruns (module stays imported)
+_LOCAL_REGISTRIES = {}
+_LOCAL_REGISTRIES_LOCK = threading.Lock()
+
+
+class ModelServerUnavailable(RuntimeError):
+    pass
+
+
+class ModelServerUnreachable(ModelServerUnavailable):
+    """
+    Nothing is listening: the only case where local_fallback loads the
+    models in-process
+    """
+
+
+def _transport_error(exc, base_url):
+    """
+    Maps a connection-level failure. Only a refused connection means there
+    is no server; a dropped connection or read timeout mid-request means
+    the server exists but the request failed, and must not trigger a
+    second in-process model load.
+    """
+    reason = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+    if isinstance(reason, ConnectionRefusedError):
+        return ModelServerUnreachable(
+            f"No model server at {base_url}. "
+            "Start one with: python -m llm.model_server"
+        )
+    return ModelServerUnavailable(f"model server request failed: {reason!r}")
+
+
+# Raised by urlopen/read for failures below HTTP (HTTPError is handled first)
+_TRANSPORT_ERRORS = (urllib.error.URLError, ConnectionError, TimeoutError, http.client.HTTPException)
+
+
+class ModelClient:
+    """
+    Thin client for llm.model_server.
+
+    With local_fallback=True, the models are loaded once into this process
+    when no server is reachable, so single-shot scripts keep working.
+    """
+
+    def __init__(
+        self,
+        base_url=DEFAULT_SERVER_URL,
+        timeout=600,
+        local_fallback=False,
+        **registry_kwargs
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.local_fallback = local_fallback
+        self.registry_kwargs = registry_kwargs
+        self._local = None
+
+    # -------------------------
+    # Transport
+    # -------------------------
+    def _request(self, path, payload=None):
+        data = None
+        headers = {}
+        if payload is not None:
+            data = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            try:
+                body = json.loads(exc.read() or b"{}")
+            except ValueError:
+                body = {}
+            raise ModelServerUnavailable(
+                body.get("error", f"model server returned HTTP {exc.code}")
+            ) from exc
+        except _TRANSPORT_ERRORS as exc:
+            raise _transport_error(exc, self.base_url) from exc
+
+    def _stream(self, path, payload):
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            resp = urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as exc:
+            try:
+                body = json.loads(exc.read() or b"{}")
+            except ValueError:
+                body = {}
+            raise ModelServerUnavailable(
+                body.get("error", f"model server returned HTTP {exc.code}")
+            ) from exc
+        except _TRANSPORT_ERRORS as exc:
+            raise _transport_error(exc, self.base_url) from exc
+
+        with resp:
+            try:
+                for line in resp:
+                    message = json.loads(line)
+                    if message.get("done"):
+                        return
+                    if "error" in message:
+                        raise ModelServerUnavailable(message["error"])
+                    yield message["token"]
+            except _TRANSPORT_ERRORS as exc:
+                raise _transport_error(exc, self.base_url) from exc
+
+    def _local_registry(self):
+        if self._local is None:
+            key = tuple(sorted(self.registry_kwargs.items()))
+            # Concurrent first calls (pipeline workers) must load only once
+            with _LOCAL_REGISTRIES_LOCK:
+                if key not in _LOCAL_REGISTRIES:
+                    registry = ModelRegistry(**self.registry_kwargs)
+                    registry.load()
+                    _LOCAL_REGISTRIES[key] = registry
+            self._local = _LOCAL_REGISTRIES[key]
+        return self._local
+
+    def _call(self, path, payload, local_fn):
+        if self._local is not None:
+            return local_fn(self._local)
+        try:
+            return self._request(path, payload)
+        except ModelServerUnreachable:
+            if not self.local_fallback:
+                raise
+            return local_fn(self._local_registry())
+
+    # -------------------------
+    # API
+    # -------------------------
+    def health(self):
+        if self._local is not None:
+            return self._local.health()
+        return self._request("/health")
+
+    def wait_until_ready(self, timeout=600, poll_s=1.0):
+        deadline = time.time() + timeout
+        while True:
+            try:
+                health = self.health()
+            except ModelServerUnreachable:
+                health = {"status": "starting"}
+
+            if health["status"] == "ready":
+                return health
+            if health["status"] == "error":
+                raise ModelServerUnavailable(health["error"])
+            if time.time() >= deadline:
+                raise ModelServerUnavailable(
+                    f"model server not ready after {timeout}s ({health['status']})"
+                )
+            time.sleep(poll_s)
+
+    def retrieve(self, query_text, top_k=3, filters=None):
+        return self._call(
+            "/retrieve",
+            {"query": query_text, "top_k": top_k, "filters": filters},
+            lambda reg: {"results": reg.retrieve(query_text, top_k=top_k, filters=filters)}
+        )["results"]
+
+    def retrieve_many(self, query_texts, top_k=3, filters=None):
+        return self._call(
+            "/retrieve_many",
+            {"queries": list(query_texts), "top_k": top_k, "filters": filters},
+            lambda reg: {
+                "results": reg.retrieve_many(query_texts, top_k=top_k, filters=filters)
+            }
+        )["results"]
+
+    def generate(self, prompt, structured=False):
+        return self._call(
+            "/generate",
+            {"prompt": prompt, "structured": structured},
+            lambda reg: {"text": reg.generate(prompt, structured=structured)}
+        )["text"]
+
+    def generate_stream(self, prompt, structured=False):
+        """
+        Yields text chunks as the model decodes them
+        """
+        payload = {"prompt": prompt, "structured": structured}
+        if self._local is None:
+            stream = self._stream("/generate_stream", payload)
+            try:
+                first = next(stream, None)
+            except ModelServerUnreachable:
+                if not self.local_fallback:
+                    raise
+                self._local_registry()
+            else:
+                if first is not None:
+                    yield first
+                yield from stream
+                return
+
+        yield from self._local.generate_stream(prompt, structured=structured)
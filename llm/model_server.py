@@ -0,0 +1,312 @@
+"""
+Long-lived local inference service.
+
+Loads the FAISS/SentenceTransformer store and the llama.cpp model once and
+serves retrieval and generation over localhost HTTP
+(/health, /retrieve, /retrieve_many, /generate, /generate_stream):
+
+    python -m llm.model_server --model-path path/to/model.gguf
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_MODEL_PATH = (
+    "C:/llama-b7613-bin-win-cuda-12.4-x64/models/"
+    "mistral-7b-instruct-v0.2.Q4_K_M.gguf"
+)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+WARMUP_QUERY = "Motor bearing overheating with localized hotspot"
+
+
+class ModelRegistry:
+    """
+    Owns the heavy models and reports their warm-up state
+    """
+
+    def __init__(
+        self,
+        model_path=DEFAULT_MODEL_PATH,
+        n_threads=8,
+        n_gpu_layers=20,
+        index_path="rag/maintenance.index",
+        json_path="data/maintenance_logs.json",
+        mmap_index=False,
+        max_batch_size=1,
+        max_wait_ms=20
+    ):
+        if max_batch_size > 1:
+            from llm.llama_inference import MaintenanceLLM
+            if not MaintenanceLLM.batched_decoding:
+                # Its generate_batch decodes sequentially: a batch would
+                # only add max_wait_ms and queueing to every request
+                raise ValueError(
+                    "max_batch_size > 1 needs batched decoding, which the "
+                    "llama.cpp backend does not do; use max_batch_size=1"
+                )
+
+        self.model_path = model_path
+        self.n_threads = n_threads
+        self.n_gpu_layers = n_gpu_layers
+        self.index_path = index_path
+        self.json_path = json_path
+        self.mmap_index = mmap_index
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self.store = None
+        self.llm = None
+        self.scheduler = None
+        self.status = {"vector_store": "pending", "llm": "pending"}
+        self.error = None
+        self.started_at = time.time()
+        self.ready = threading.Event()
+
+        # llama.cpp contexts are not safe for concurrent calls
+        self._llm_lock = threading.Lock()
+
+    def load(self):
+        from rag.vector_store import MaintenanceVectorStore
+        from llm.llama_inference import MaintenanceLLM
+
+        try:
+            self.status["vector_store"] = "loading"
+            self.store = MaintenanceVectorStore(
+                index_path=self.index_path,
+                json_path=self.json_path,
+                mmap=self.mmap_index
+            )
+            self.store.retrieve(WARMUP_QUERY)
+            self.status["vector_store"] = "ready"
+
+            self.status["llm"] = "loading"
+            self.llm = MaintenanceLLM(
+                model_path=self.model_path,
+                n_threads=self.n_threads,
+                n_gpu_layers=self.n_gpu_layers
+            )
+            if self.max_batch_size > 1:
+                from llm.batch_scheduler import BackgroundScheduler
+                self.scheduler = BackgroundScheduler(
+                    self,  # generate_batch below holds the LLM lock
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_wait_ms
+                )
+            self.status["llm"] = "ready"
+        except Exception as exc:
+            for name, state in self.status.items():
+                if state == "loading":
+                    self.status[name] = "error"
+            self.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.ready.set()
+
+    def load_in_background(self):
+        def _run():
+            try:
+                self.load()
+            except Exception:
+                pass  # surfaced through health()
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        return thread
+
+    def health(self):
+        if self.error:
+            overall = "error"
+        elif all(s == "ready" for s in self.status.values()):
+            overall = "ready"
+        else:
+            overall = "warming"
+
+        health = {
+            "status": overall,
+            "models": dict(self.status),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "error": self.error,
+        }
+        if self.status["vector_store"] == "ready":
+            health["embedding_cache"] = self.store.cache_info()
+        if self.status["llm"] == "ready":
+            health["prefill"] = dict(self.llm.prefill_stats)
+        if self.scheduler is not None:
+            health["scheduler"] = self.scheduler.stats()
+        return health
+
+    def _require(self, name):
+        if self.status[name] != "ready":
+            raise RuntimeError(f"{name} is not ready ({self.status[name]})")
+
+    def retrieve(self, query_text, top_k=3, filters=None):
+        self._require("vector_store")
+        return self.store.retrieve(query_text, top_k=top_k, filters=filters)
+
+    def retrieve_many(self, query_texts, top_k=3, filters=None):
+        self._require("vector_store")
+        return self.store.retrieve_many(query_texts, top_k=top_k, filters=filters)
+
+    def generate(self, prompt, structured=False):
+        self._require("llm")
+        if self.scheduler is not None:
+            # Concurrent requests are grouped into batched decoding passes
+            return self.scheduler.generate(prompt, structured=structured)
+        with self._llm_lock:
+            return self.llm.generate(prompt, structured=structured)
+
+    def generate_batch(self, prompts, structured=False):
+        with self._llm_lock:
+            return self.llm.generate_batch(prompts, structured=structured)
+
+    def generate_stream(self, prompt, structured=False):
+        self._require("llm")
+        with self._llm_lock:
+            yield from self.llm.generate_stream(prompt, structured=structured)
+
+
+def _make_handler(registry):
+    class ModelRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def _stream_tokens(self, chunks):
+            """
+            Newline-delimited JSON: {"token": ...} per chunk, then {"done": true}
+            """
+            first = next(chunks, None)  # surfaces "not ready" as a normal 503
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            try:
+                if first is not None:
+                    self.wfile.write(json.dumps({"token": first}).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                for chunk in chunks:
+                    self.wfile.write(json.dumps({"token": chunk}).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                self.wfile.write(b'{"done": true}\n')
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away
+            except Exception as exc:
+                # Headers are sent: report the failure in-band
+                error = {"error": f"{type(exc).__name__}: {exc}"}
+                self.wfile.write(json.dumps(error).encode("utf-8") + b"\n")
+            finally:
+                chunks.close()  # releases the LLM lock if the client went away
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, registry.health())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            try:
+                payload = self._read_json()
+                if self.path == "/retrieve":
+                    results = registry.retrieve(
+                        payload["query"],
+                        top_k=int(payload.get("top_k", 3)),
+                        filters=payload.get("filters")
+                    )
+                    self._send_json(200, {"results": results})
+                elif self.path == "/retrieve_many":
+                    results = registry.retrieve_many(
+                        list(payload["queries"]),
+                        top_k=int(payload.get("top_k", 3)),
+                        filters=payload.get("filters")
+                    )
+                    self._send_json(200, {"results": results})
+                elif self.path == "/generate":
+                    text = registry.generate(
+                        payload["prompt"], structured=bool(payload.get("structured"))
+                    )
+                    self._send_json(200, {"text": text})
+                elif self.path == "/generate_stream":
+                    self._stream_tokens(registry.generate_stream(
+                        payload["prompt"], structured=bool(payload.get("structured"))
+                    ))
+                else:
+                    self._send_json(404, {"error": "not found"})
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away; nothing to answer
+            except TimeoutError as exc:
+                # batch_scheduler.DeadlineExceeded
+                self._send_json(504, {"error": f"{type(exc).__name__}: {exc}"})
+            except RuntimeError as exc:
+                self._send_json(503, {**registry.health(), "error": str(exc)})
+            except (KeyError, ValueError) as exc:
+                self._send_json(400, {"error": f"bad request: {exc}"})
+            except Exception as exc:
+                # Any backend failure is answered, never a dropped connection
+                # (which clients would mistake for a missing server)
+                self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def log_message(self, format, *args):
+            pass  # keep the console for model logs
+
+    return ModelRequestHandler
+
+
+def serve(registry, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), _make_handler(registry))
+    registry.load_in_background()
+    print(f"Model server listening on http://{host}:{port} (warming up...)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm model server for the copilot")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--n-threads", type=int, default=8)
+    parser.add_argument("--n-gpu-layers", type=int, default=20)
+    parser.add_argument("--index-path", default="rag/maintenance.index")
+    parser.add_argument("--json-path", default="data/maintenance_logs.json")
+    parser.add_argument("--mmap-index", action="store_true",
+                        help="memory-map the FAISS index and record store")
+    parser.add_argument("--max-batch-size", type=int, default=1,
+                        help="> 1 batches concurrent /generate requests "
+                             "(refused: the llama.cpp backend decodes one sequence at a time)")
+    parser.add_argument("--max-wait-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        registry = ModelRegistry(
+            model_path=args.model_path,
+            n_threads=args.n_threads,
+            n_gpu_layers=args.n_gpu_layers,
+            index_path=args.index_path,
+            json_path=args.json_path,
+            mmap_index=args.mmap_index,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    serve(registry, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
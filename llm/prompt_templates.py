@@ -1,6 +1,24 @@
-def build_prompt(anomaly_features, fault_interpretation, retrieved_logs):
+# Static instruction block shared by every prompt. Kept as the literal
+# prefix so llama.cpp can reuse its evaluated KV state across requests.
+SYSTEM_HEADER = """
+You are an industrial maintenance decision-support copilot.
+You must rely ONLY on the provided anomaly data and historical incidents.
+Do NOT invent facts. If uncertain, state uncertainty.
+"""
+
+
+# Output instruction for schema-constrained (JSON) generation
+STRUCTURED_RESPONSE_INSTRUCTION = """Respond with ONLY one JSON object with these keys:
+failure_mode, reasoning, recommended_action, downtime_hours_min,
+downtime_hours_max, repair_cost_usd_min, repair_cost_usd_max, confidence.
+"""
+
+
+def build_prompt(anomaly_features, fault_interpretation, retrieved_logs, structured=False):
     """
-    Builds a grounded prompt for the maintenance decision copilot
+    Builds a grounded prompt for the maintenance decision copilot.
+    structured=True asks for a MaintenanceDecision JSON object instead of
+    bullet points.
     """
 
     evidence_text = ""
@@ -14,11 +32,7 @@ def build_prompt(anomaly_features, fault_interpretation, retrieved_logs):
             f"- Repair cost USD: {log['repair_cost_usd']}\n"
         )
 
-    prompt = f"""
-You are an industrial maintenance decision-support copilot.
-You must rely ONLY on the provided anomaly data and historical incidents.
-Do NOT invent facts. If uncertain, state uncertainty.
-
+    prompt = SYSTEM_HEADER + f"""
 Thermal anomaly features:
 {anomaly_features}
 
@@ -36,6 +50,9 @@ TASK:
 5. Estimate repair cost range (USD)
 6. Provide confidence level (0–1)
 
-Respond in structured bullet points.
 """
+    if structured:
+        prompt += STRUCTURED_RESPONSE_INSTRUCTION
+    else:
+        prompt += "Respond in structured bullet points.\n"
     return prompt
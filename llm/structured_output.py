@@ -0,0 +1,58 @@
+import json
+
+from guardrails.output_schema import MaintenanceDecision
+
+
+def decision_json_schema():
+    """
+    JSON schema of the guarded decision, used to constrain generation
+    """
+    return MaintenanceDecision.model_json_schema()
+
+
+def decision_grammar_schema():
+    return json.dumps(decision_json_schema())
+
+
+class JsonObjectTracker:
+    """
+    Incrementally tracks brace depth (string/escape aware) over streamed
+    text so generation can stop the moment the top-level object closes.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        """
+        Consumes a chunk; returns the number of characters that belong to
+        the object (the whole chunk unless the object closed inside it)
+        """
+        for i, ch in enumerate(text):
+            if self.complete:
+                return i
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"' and self.started:
+                self._in_string = True
+            elif ch == "{":
+                self.started = True
+                self.depth += 1
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    return i + 1
+        return len(text)
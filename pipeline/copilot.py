@@ -0,0 +1,160 @@
+from cv.fault_interpretation import interpret_motor_fault
+from guardrails.decision_safety import decision_safety_engine
+from guardrails.risk_scoring import risk_aware_decision_engine
+from llm.decision_cache import decision_cache_key
+from llm.prompt_templates import build_prompt
+from pipeline.lazy import lazy_module
+from pipeline.orchestrator import Pipeline, Stage
+
+# cv2, pydantic and numpy are imported by the first stage that needs them,
+# so building the pipeline (every Streamlit rerun) stays cheap
+thermal_preprocessing = lazy_module("cv.thermal_preprocessing")
+anomaly_detection = lazy_module("cv.anomaly_detection")
+safety_rules = lazy_module("guardrails.safety_rules")
+trend_analysis = lazy_module("temporal.trend_analysis")
+radiometric = lazy_module("cv.radiometric")
+
+HEAVY_MODULES = (
+    thermal_preprocessing, anomaly_detection, safety_rules, trend_analysis,
+)
+
+DEFAULT_QUERY = "Motor bearing overheating with localized hotspot"
+DEFAULT_FILTERS = {"equipment_type": "motor"}
+
+# Frames per asset fed to the trend analysis
+TREND_WINDOW = 50
+
+
+def _join_stream(chunks):
+    return "".join(chunks)
+
+
+def build_copilot_pipeline(
+    client,
+    decision_cache=None,
+    feature_store=None,
+    render_stream=None,
+    namespace="",
+    trend_window=TREND_WINDOW,
+    recorder=None,
+    profile_memory=False
+):
+    """
+    The full decision pipeline shared by demo.py and app/ui.py:
+    preprocess -> detect -> store -> interpret -> retrieve -> cache ->
+    prompt -> llm -> guardrails -> safety -> risk -> trend.
+
+    client: llm.model_client.ModelClient (retrieval + generation).
+    render_stream(chunks) -> text displays the streamed LLM output
+    (st.write_stream in the UI, a print loop in the demo).
+
+    Run inputs: image_path, image_bytes (an encoded upload buffer, or a
+    decoded frame array) or radiometric_path (16-bit TIFF / .npy / raw
+    capture, calibrated to degrees C with the optional calibration dict or
+    camera_id), plus optional asset_id, query, filters,
+    bypass_cache and feature_history (used when there is no feature store).
+
+    profile_memory: per-stage tracemalloc peaks; for single-run profiling
+    only, as peaks are not isolated per session (see Pipeline).
+    """
+    render_stream = render_stream or _join_stream
+
+    # ---- CV ----
+    def preprocess(ctx):
+        if ctx.get("radiometric_path"):
+            return {"img": radiometric.load_radiometric_image(
+                ctx["radiometric_path"],
+                calibration=ctx.get("calibration"),
+                camera_id=ctx.get("camera_id")
+            )}
+        if ctx.get("image_bytes") is not None:
+            return {"img": thermal_preprocessing.preprocess_thermal_buffer(ctx["image_bytes"])}
+        return {"img": thermal_preprocessing.preprocess_thermal_image(ctx["image_path"])}
+
+    def detect(ctx):
+        features, _ = anomaly_detection.detect_thermal_anomaly(ctx["img"])
+        return {"features": features}
+
+    def store_features(ctx):
+        feature_store.append(ctx["asset_id"], ctx["features"])
+
+    def interpret(ctx):
+        return {"fault_info": interpret_motor_fault(ctx["features"])}
+
+    # ---- RAG ----
+    def retrieve(ctx):
+        return {"retrieved_logs": client.retrieve(
+            ctx.get("query", DEFAULT_QUERY),
+            filters=ctx.get("filters", DEFAULT_FILTERS)
+        )}
+
+    # ---- LLM ----
+    def cache_lookup(ctx):
+        key = decision_cache_key(
+            ctx["features"], ctx["fault_info"], ctx["retrieved_logs"],
+            namespace=namespace
+        )
+        cached = decision_cache.get(key, bypass=ctx.get("bypass_cache", False))
+        if cached is None:
+            return {"cache_key": key, "cached": None}
+        return {"cache_key": key, "cached": cached, "llm_response": cached["raw_text"]}
+
+    def prompt(ctx):
+        return {"prompt": build_prompt(
+            ctx["features"], ctx["fault_info"], ctx["retrieved_logs"], structured=True
+        )}
+
+    def llm(ctx):
+        return {"llm_response": render_stream(
+            client.generate_stream(ctx["prompt"], structured=True)
+        )}
+
+    # ---- Guardrails ----
+    def guardrails(ctx):
+        if ctx.get("cached") is not None:
+            return {"final_decision": ctx["cached"]["decision"]}
+
+        final_decision = safety_rules.parse_structured_decision(ctx["llm_response"])
+        if decision_cache is not None:
+            decision_cache.put(ctx["cache_key"], final_decision, ctx["llm_response"])
+        return {"final_decision": final_decision}
+
+    def safety(ctx):
+        return {"safety_report": decision_safety_engine(
+            ctx["features"], ctx["fault_info"], ctx["retrieved_logs"],
+            ctx["final_decision"].model_dump()
+        )}
+
+    def risk(ctx):
+        return {"risk_report": risk_aware_decision_engine(
+            ctx["fault_info"], ctx["retrieved_logs"],
+            ctx["final_decision"].model_dump()
+        )}
+
+    # ---- Temporal ----
+    def trend(ctx):
+        if feature_store is not None and ctx.get("asset_id"):
+            history = feature_store.history(ctx["asset_id"], limit=trend_window)
+        else:
+            history = ctx.get("feature_history", [])
+        return {"trend_report": trend_analysis.analyze_trend(history)}
+
+    def not_cached(ctx):
+        return ctx.get("cached") is None
+
+    stages = [
+        Stage("preprocess", preprocess),
+        Stage("detect", detect),
+        Stage("store_features", store_features,
+              when=lambda ctx: feature_store is not None and bool(ctx.get("asset_id"))),
+        Stage("interpret", interpret),
+        Stage("retrieve", retrieve),
+        Stage("cache_lookup", cache_lookup, when=lambda ctx: decision_cache is not None),
+        Stage("prompt", prompt, when=not_cached),
+        Stage("llm", llm, when=not_cached),
+        Stage("guardrails", guardrails),
+        Stage("safety", safety),
+        Stage("risk", risk),
+        Stage("trend", trend),
+    ]
+    return Pipeline(stages, recorder=recorder, profile_memory=profile_memory)
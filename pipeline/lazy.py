@@ -0,0 +1,62 @@
+import importlib
+import threading
+import time
+
+# Seconds spent importing each lazy module, filled on first use
+IMPORT_TIMES = {}
+
+
+class LazyModule:
+    """
+    Module stand-in that imports the real module on first attribute
+    access, so heavy dependencies (cv2, pydantic, numpy, ...) are paid for
+    by the stage that first needs them instead of at startup
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    IMPORT_TIMES[self._name] = round(time.perf_counter() - start, 6)
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+def preload(*modules):
+    """
+    Imports lazy modules on a background thread (e.g. once the UI has
+    rendered) so the first analysis does not pay for them either
+    """
+    def _run():
+        for module in modules:
+            try:
+                module.load()
+            except ImportError:
+                pass  # surfaced when the stage itself runs
+
+    thread = threading.Thread(target=_run, name="lazy-preload", daemon=True)
+    thread.start()
+    return thread
+
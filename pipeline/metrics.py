@@ -0,0 +1,167 @@
+import json
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRIC_PREFIX = "copilot_pipeline"
+
+
+class MetricsRecorder:
+    """
+    Sink for Pipeline run metrics.
+
+    Every run is appended as one JSON line to jsonl_path (if given) and
+    folded into per-stage totals that prometheus_text() renders in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, jsonl_path=None, keep_last=50):
+        self.jsonl_path = jsonl_path
+        self.keep_last = keep_last
+        self.runs = []
+
+        self._lock = threading.Lock()
+        self._runs_total = defaultdict(int)  # status -> count
+        self._stage_totals = defaultdict(
+            lambda: {"count": 0, "skipped": 0, "errors": 0, "wall_s": 0.0,
+                     "cpu_s": 0.0, "last_peak_mem_bytes": 0}
+        )
+        self._total_wall_s = 0.0
+
+    def record(self, metrics):
+        with self._lock:
+            self.runs.append(metrics)
+            del self.runs[:-self.keep_last]
+
+            self._runs_total[metrics["status"]] += 1
+            self._total_wall_s += metrics["total_wall_s"]
+            for entry in metrics["stages"]:
+                totals = self._stage_totals[entry["stage"]]
+                if entry["status"] == "skipped":
+                    totals["skipped"] += 1
+                    continue
+                if entry["status"] == "error":
+                    totals["errors"] += 1
+                totals["count"] += 1
+                totals["wall_s"] += entry["wall_s"]
+                totals["cpu_s"] += entry["cpu_s"]
+                if entry["peak_mem_bytes"] is not None:
+                    totals["last_peak_mem_bytes"] = entry["peak_mem_bytes"]
+
+            if self.jsonl_path:
+                with open(self.jsonl_path, "a") as f:
+                    f.write(json.dumps(metrics) + "\n")
+
+    def last_run(self):
+        with self._lock:
+            return self.runs[-1] if self.runs else None
+
+    def prometheus_text(self):
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_runs_total Pipeline runs by final status.",
+            f"# TYPE {p}_runs_total counter",
+        ]
+        with self._lock:
+            for status, count in sorted(self._runs_total.items()):
+                lines.append(f'{p}_runs_total{{status="{status}"}} {count}')
+
+            lines += [
+                f"# HELP {p}_run_wall_seconds_total Wall-clock time of all runs.",
+                f"# TYPE {p}_run_wall_seconds_total counter",
+                f"{p}_run_wall_seconds_total {self._total_wall_s:.6f}",
+            ]
+
+            series = (
+                ("stage_runs_total", "counter", "Executed stage runs.", "count"),
+                ("stage_skipped_total", "counter", "Skipped stage runs.", "skipped"),
+                ("stage_errors_total", "counter", "Stage runs that raised.", "errors"),
+                ("stage_wall_seconds_total", "counter", "Stage wall-clock time.", "wall_s"),
+                ("stage_cpu_seconds_total", "counter", "Stage process CPU time.", "cpu_s"),
+                ("stage_peak_memory_bytes", "gauge",
+                 "Traced peak memory of the last stage run.", "last_peak_mem_bytes"),
+            )
+            for name, kind, help_text, key in series:
+                lines.append(f"# HELP {p}_{name} {help_text}")
+                lines.append(f"# TYPE {p}_{name} {kind}")
+                for stage, totals in self._stage_totals.items():
+                    value = totals[key]
+                    value = f"{value:.6f}" if isinstance(value, float) else str(value)
+                    lines.append(f'{p}_{name}{{stage="{stage}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host="127.0.0.1", port=9108):
+        """
+        Serves GET /metrics (Prometheus text) and GET /metrics.json (last
+        runs) from a daemon thread; returns the server
+        """
+        recorder = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = recorder.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    with recorder._lock:
+                        body = json.dumps(recorder.runs).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def waterfall_rows(metrics):
+    """
+    Stage intervals (ms from run start) for a waterfall chart
+    """
+    return [
+        {
+            "stage": entry["stage"],
+            "start_ms": round(entry["start_s"] * 1000, 3),
+            "end_ms": round((entry["start_s"] + entry["wall_s"]) * 1000, 3),
+            "wall_ms": round(entry["wall_s"] * 1000, 3),
+            "cpu_ms": round(entry["cpu_s"] * 1000, 3),
+            "peak_mem_kb": (
+                round(entry["peak_mem_bytes"] / 1024, 1)
+                if entry["peak_mem_bytes"] is not None else None
+            ),
+            "status": entry["status"],
+        }
+        for entry in metrics["stages"]
+    ]
+
+
+def format_breakdown(metrics):
+    """
+    Plain-text latency table for terminals
+    """
+    total = metrics["total_wall_s"] or 1e-12
+    lines = [f"{'stage':<16}{'wall ms':>10}{'cpu ms':>10}{'share':>8}{'peak KiB':>11}"]
+    for row in waterfall_rows(metrics):
+        if row["status"] == "skipped":
+            lines.append(f"{row['stage']:<16}{'skipped':>10}")
+            continue
+        peak = f"{row['peak_mem_kb']:.1f}" if row["peak_mem_kb"] is not None else "-"
+        share = row["wall_ms"] / 1000 / total
+        lines.append(
+            f"{row['stage']:<16}{row['wall_ms']:>10.1f}{row['cpu_ms']:>10.1f}"
+            f"{share:>8.1%}{peak:>11}"
+        )
+    lines.append(f"{'total':<16}{total * 1000:>10.1f}")
+    return "\n".join(lines)
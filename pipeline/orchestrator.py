@@ -0,0 +1,146 @@
+import threading
+import time
+import tracemalloc
+import uuid
+
+# Runs currently relying on tracing started by a Pipeline; concurrent runs
+# (e.g. two UI sessions sharing one pipeline) keep it on until the last ends
+_tracing_runs = 0
+_tracing_lock = threading.Lock()
+
+
+def new_run_metrics():
+    return {
+        "run_id": uuid.uuid4().hex,
+        "started_at": time.time(),
+        "status": "ok",
+        "stages": [],
+    }
+
+
+def _start_tracing():
+    global _tracing_runs
+    with _tracing_lock:
+        if _tracing_runs == 0 and tracemalloc.is_tracing():
+            return False  # traced by someone else; leave it alone
+        if _tracing_runs == 0:
+            tracemalloc.start()
+        _tracing_runs += 1
+        return True
+
+
+def _stop_tracing():
+    global _tracing_runs
+    with _tracing_lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0:
+            tracemalloc.stop()
+
+
+class Stage:
+    """
+    One named pipeline step.
+
+    fn(ctx) reads what earlier stages put in the shared context dict and
+    returns a dict of new entries (or None). when(ctx), if given, decides
+    whether the stage runs at all; skipped stages still show up in the
+    metrics.
+    """
+
+    def __init__(self, name, fn, when=None):
+        self.name = name
+        self.fn = fn
+        self.when = when
+
+
+class Pipeline:
+    """
+    Runs stages in order over a common context and records, per stage,
+    wall-clock time, CPU time and peak traced memory.
+
+    cpu_s is measured with cpu_clock, process CPU time by default, so it
+    includes worker threads the stage waits on (e.g. llama.cpp decode
+    threads). With profile_memory, peak_mem_bytes is the
+    tracemalloc high-water mark during the stage: Python objects and NumPy
+    buffers, not memory allocated inside native libraries.
+
+    profile_memory is off by default: tracing slows every allocation, and
+    tracemalloc is process-global, so while several runs overlap (UI
+    sessions, concurrent pipelines) each stage's peak includes the other
+    runs' allocations and their reset_peak() calls. Enable it for one run
+    at a time, as the profiling entry points do.
+    """
+
+    def __init__(self, stages, recorder=None, profile_memory=False,
+                 cpu_clock=time.process_time):
+        self.stages = list(stages)
+        self.recorder = recorder
+        self.profile_memory = profile_memory
+        self.cpu_clock = cpu_clock
+
+    def run(self, ctx=None, **inputs):
+        """
+        Returns (ctx, metrics). A stage error is recorded in the metrics
+        (status "error") and then re-raised.
+        """
+        ctx = dict(ctx or {}, **inputs)
+        metrics = new_run_metrics()
+
+        started_tracing = self.profile_memory and _start_tracing()
+
+        t0 = time.perf_counter()
+        try:
+            for stage in self.stages:
+                self.run_stage(stage, ctx, metrics, t0)
+        except Exception:
+            metrics["status"] = "error"
+            raise
+        finally:
+            metrics["total_wall_s"] = round(time.perf_counter() - t0, 6)
+            if started_tracing:
+                _stop_tracing()
+            if self.recorder is not None:
+                self.recorder.record(metrics)
+
+        return ctx, metrics
+
+    def run_stage(self, stage, ctx, metrics, t0):
+        """
+        Runs one stage on ctx and appends its entry to metrics["stages"];
+        t0 is the perf_counter() origin of the run
+        """
+        entry = {
+            "stage": stage.name,
+            "start_s": round(time.perf_counter() - t0, 6),
+            "wall_s": 0.0,
+            "cpu_s": 0.0,
+            "peak_mem_bytes": None,
+            "status": "ok",
+        }
+        metrics["stages"].append(entry)
+
+        if stage.when is not None and not stage.when(ctx):
+            entry["status"] = "skipped"
+            return
+
+        tracing = self.profile_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+
+        wall = time.perf_counter()
+        cpu = self.cpu_clock()
+        try:
+            result = stage.fn(ctx)
+        except Exception as exc:
+            entry["status"] = "error"
+            entry["error"] = repr(exc)
+            raise
+        finally:
+            entry["wall_s"] = round(time.perf_counter() - wall, 6)
+            entry["cpu_s"] = round(self.cpu_clock() - cpu, 6)
+            if tracing:
+                entry["peak_mem_bytes"] = max(tracemalloc.get_traced_memory()[1] - base, 0)
+
+        if result:
+            ctx.update(result)
@@ -0,0 +1,168 @@
+import queue
+import threading
+import time
+
+from pipeline.orchestrator import Pipeline, new_run_metrics
+
+# Worker groups for the copilot pipeline (pipeline/copilot.py): CPU-bound
+# CV and embedding work overlaps with decoding on the single LLM worker
+DEFAULT_GROUPS = (
+    ("cv", ("preprocess", "detect", "store_features", "interpret"), 2),
+    ("rag", ("retrieve", "cache_lookup", "prompt"), 1),
+    ("llm", ("llm",), 1),
+    ("post", ("guardrails", "safety", "risk", "trend"), 1),
+)
+
+_END = object()
+
+
+def _put(buffer, item, stop):
+    # Blocking put that still notices a cancelled run
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class OverlappedPipeline:
+    """
+    Multi-asset execution mode of a Pipeline.
+
+    The stages are split into worker groups connected by bounded queues,
+    so while the LLM worker decodes asset i, the CV and retrieval workers
+    are already processing assets i+1, i+2, ... Fleet throughput is then
+    bounded by the slowest group (normally the LLM) instead of the sum of
+    all stage latencies.
+
+    groups: (name, stage names, worker count) in pipeline order; every
+    stage must belong to exactly one group. Stage metrics use per-thread
+    CPU time, and memory profiling is off (tracemalloc's peak is global
+    and meaningless with concurrent stages).
+    """
+
+    def __init__(self, pipeline, groups=DEFAULT_GROUPS, queue_size=4, recorder=None):
+        by_name = {stage.name: stage for stage in pipeline.stages}
+        ordered = [name for _, names, _ in groups for name in names]
+        if ordered != [stage.name for stage in pipeline.stages]:
+            raise ValueError(
+                "groups must cover every pipeline stage exactly once, in order: "
+                f"{[stage.name for stage in pipeline.stages]}"
+            )
+
+        self.groups = [
+            (name, [by_name[n] for n in names], workers)
+            for name, names, workers in groups
+        ]
+        self.queue_size = queue_size
+        self.recorder = recorder if recorder is not None else pipeline.recorder
+        self._runner = Pipeline(
+            pipeline.stages, profile_memory=False, cpu_clock=time.thread_time
+        )
+
+    def _worker(self, stages, inbox, outbox, stop, last_worker, downstream):
+        while not stop.is_set():
+            try:
+                item = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if item is _END:
+                # The last worker of a group to finish closes the next queue
+                if last_worker():
+                    for _ in range(downstream):
+                        _put(outbox, _END, stop)
+                return
+
+            ctx, metrics, t0 = item
+            if metrics["status"] == "ok":
+                try:
+                    for stage in stages:
+                        self._runner.run_stage(stage, ctx, metrics, t0)
+                except Exception as exc:
+                    # Later groups pass the failed asset through untouched
+                    metrics["status"] = "error"
+                    ctx["error"] = exc
+
+            if not _put(outbox, item, stop):
+                return
+
+    def run(self, inputs, ordered=False):
+        """
+        Yields (ctx, metrics) per input dict as assets complete (in input
+        order with ordered=True). A failing asset is yielded with
+        metrics["status"] == "error" and the exception in ctx["error"];
+        the other assets keep flowing. If the inputs iterator itself raises,
+        the assets read before it are still yielded, then the exception is
+        re-raised here.
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.groups) + 1)]
+        threads = []
+        feed_error = []
+
+        def feed():
+            try:
+                for index, item in enumerate(inputs):
+                    ctx = dict(item, asset_index=index)
+                    if not _put(queues[0], (ctx, new_run_metrics(), time.perf_counter()), stop):
+                        return
+            except BaseException as exc:
+                feed_error.append(exc)
+            finally:
+                # Always close the first queue, or the consumer waits forever
+                for _ in range(self.groups[0][2]):
+                    _put(queues[0], _END, stop)
+
+        threads.append(threading.Thread(target=feed, daemon=True))
+
+        for g, (name, stages, workers) in enumerate(self.groups):
+            remaining = [workers]
+            lock = threading.Lock()
+
+            def last_worker(remaining=remaining, lock=lock):
+                with lock:
+                    remaining[0] -= 1
+                    return remaining[0] == 0
+
+            downstream = self.groups[g + 1][2] if g + 1 < len(self.groups) else 1
+            for w in range(workers):
+                threads.append(threading.Thread(
+                    target=self._worker,
+                    args=(stages, queues[g], queues[g + 1], stop, last_worker, downstream),
+                    name=f"pipeline-{name}-{w}",
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        pending = {}
+        next_index = 0
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _END:
+                    if feed_error:
+                        raise feed_error[0]
+                    break
+
+                ctx, metrics, t0 = item
+                metrics["total_wall_s"] = round(time.perf_counter() - t0, 6)
+                if self.recorder is not None:
+                    self.recorder.record(metrics)
+
+                if not ordered:
+                    yield ctx, metrics
+                    continue
+
+                pending[ctx["asset_index"]] = (ctx, metrics)
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=5)
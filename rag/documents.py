@@ -0,0 +1,15 @@
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def log_to_document(log):
+    # Convert each record to text (important for retrieval quality)
+    return (
+        f"Equipment: {log['equipment_type']}. "
+        f"Thermal pattern: {log['thermal_pattern']}. "
+        f"Observed temperature: {log['observed_temperature']}. "
+        f"Failure mode: {log['failure_mode']}. "
+        f"Root cause: {log['root_cause']}. "
+        f"Action taken: {log['action_taken']}. "
+        f"Downtime hours: {log['downtime_hours']}. "
+        f"Repair cost USD: {log['repair_cost_usd']}."
+    )
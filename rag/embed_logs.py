@@ -1,47 +1,298 @@
+import hashlib
 import json
+import os
+import shutil
+import tempfile
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
 
+from rag.documents import EMBEDDING_MODEL, log_to_document
+from rag.log_keys import content_hash, record_key
+from rag.index_factory import (
+    DEFAULT_NLIST,
+    build_index,
+    has_ids,
+    ids_drift_on_remove,
+    index_type_of,
+    needs_retraining,
+    supports_remove,
+)
+from rag.record_store import RecordStore, write_record_store
+from rag.metadata_filter import (
+    add_to_filter_index,
+    build_filter_index,
+    load_filter_index,
+    remove_from_filter_index,
+    write_filter_index,
+)
+
+def sidecar_paths(index_path):
+    """
+    Record store (packed data + id/offset table), content-hash manifest and
+    metadata filter index stored next to the index
+    """
+    base, _ = os.path.splitext(index_path)
+    return (
+        base + ".records.bin",
+        base + ".records.npy",
+        base + ".manifest.json",
+        base + ".filters.json",
+    )
+
+
+def generations_dir(index_path):
+    return index_path + ".generations"
+
+
+def pointer_path(index_path):
+    return index_path + ".current"
+
+
+def resolve_index_path(index_path):
+    """
+    Index file of the published generation named by the pointer file, or
+    index_path itself for an index written before generations existed.
+    Resolve once per load so the index and its sidecars come from the
+    same generation.
+    """
+    try:
+        with open(pointer_path(index_path), "r") as f:
+            generation = json.load(f)["generation"]
+    except FileNotFoundError:
+        return index_path
+    return os.path.join(generations_dir(index_path), generation, os.path.basename(index_path))
+
+
+def _publish_generation(index_path, index, records, filter_index, manifest):
+    """
+    Writes the index and its sidecars into a fresh generation directory,
+    then repoints index_path at it with a single atomic os.replace.
+    The generation it replaces is kept for readers that resolved the old
+    pointer mid-swap; older ones are deleted.
+    """
+    root = generations_dir(index_path)
+    os.makedirs(root, exist_ok=True)
+    generation = os.path.basename(tempfile.mkdtemp(prefix="gen-", dir=root))
+
+    path = os.path.join(root, generation, os.path.basename(index_path))
+    records_data, records_index, manifest_path, filters_path = sidecar_paths(path)
+    faiss.write_index(index, path)
+    write_record_store(records, records_data, records_index)
+    write_filter_index(filter_index, filters_path)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    previous = resolve_index_path(index_path)
+    os.replace(_write_tmp_json(pointer_path(index_path), {"generation": generation}),
+               pointer_path(index_path))
+
+    keep = {generation, os.path.basename(os.path.dirname(previous))}
+    for name in os.listdir(root):
+        if name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def faiss_id(key):
+    """
+    Maps a record key to a non-negative int64 FAISS ID
+    """
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & 0x7FFFFFFFFFFFFFFF
+
+
+def _keyed_logs(logs, id_field):
+    keyed = {}
+    for log in logs:
+        key = record_key(log, id_field)
+        # Identical ID-less records would collide; number the repeats
+        candidate, n = key, 1
+        while candidate in keyed:
+            n += 1
+            candidate = f"{key}#{n}"
+        keyed[candidate] = log
+    return keyed
+
+
+def _write_tmp_json(path, payload):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    return tmp_path
+
+
+def _diff_manifest(old_entries, hashes):
+    """
+    (removed, added) record keys between the manifest and the current corpus;
+    a changed record appears in both
+    """
+    removed = [k for k in old_entries if old_entries[k]["hash"] != hashes.get(k)]
+    added = [k for k in hashes if k not in old_entries or old_entries[k]["hash"] != hashes[k]]
+    return removed, added
+
+
+def _stored_manifest(index_path):
+    # Manifest of the published index, {} when there is none
+    manifest_path = sidecar_paths(resolve_index_path(index_path))[2]
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def _load_previous(index_path, index_type):
+    index_path = resolve_index_path(index_path)
+    paths = (index_path,) + sidecar_paths(index_path)
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    records_data, records_index, manifest_path, filters_path = sidecar_paths(index_path)
+
+    index = faiss.read_index(index_path)
+    if not has_ids(index):
+        return None  # legacy positional index: rebuild
+    if ids_drift_on_remove(index):
+        return None  # ID-mapped IVF from an older build: rebuild
+    if index_type_of(index) != index_type:
+        return None  # index type changed: rebuild
+
+    # Carry unchanged records over as raw bytes, no JSON round trip
+    store = RecordStore(records_data, records_index)
+    records = dict(store.items_raw())
+    store.close()
+
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    if len(records) != index.ntotal:
+        return None  # index and sidecar out of sync: rebuild
+
+    filter_index = load_filter_index(filters_path, as_sets=True)
+    return index, records, manifest, filter_index
+
+
 def embed_maintenance_logs(
     json_path="data/maintenance_logs.json",
-    index_path="rag/maintenance.index"
+    index_path="rag/maintenance.index",
+    incremental=False,
+    id_field="log_id",
+    index_type=None,
+    **index_params
 ):
+    """
+    Embeds maintenance logs into an ID-mapped FAISS index.
+
+    index_type is one of rag.index_factory.INDEX_TYPES; index_params
+    (nlist, pq_m, hnsw_m, ...) are passed to build_index. Both default to
+    what the existing index's manifest records, else a flat index.
+
+    With incremental=True only records whose content hash changed since the
+    last run are re-embedded; deleted records are removed from the index.
+    IVF centroids trained on an earlier build are kept until the corpus
+    supports twice their nlist, then the index is retrained. HNSW cannot
+    delete, so changes that remove records from an HNSW index trigger a
+    rebuild.
+    The index, record store, manifest and metadata filter index are
+    written to a new generation directory that the pointer file
+    <index_path>.current is then switched to (see resolve_index_path).
+    An emptied corpus publishes an empty index rather than leaving the
+    last one in place.
+    """
     # Load maintenance logs
     with open(json_path, "r") as f:
         logs = json.load(f)
+    current = _keyed_logs(logs, id_field)
+    hashes = {key: content_hash(log) for key, log in current.items()}
+
+    stored = _stored_manifest(index_path)
+    if index_type is None:
+        index_type = stored.get("index_type", "flat")
+    if not index_params and stored.get("index_type") == index_type:
+        index_params = stored.get("index_params", {})
+
+    previous = None
+    if incremental:
+        previous = _load_previous(index_path, index_type)
+
+    if previous is None:
+        index, records, old_entries, filter_index = None, {}, {}, build_filter_index([])
+    else:
+        index, records, manifest, filter_index = previous
+        old_entries = manifest["entries"]
+
+    # Diff against the manifest
+    removed, added = _diff_manifest(old_entries, hashes)
+    dimension = index.d if index is not None else None
+    if index is not None and (
+        (removed and not supports_remove(index_type))
+        or needs_retraining(index, len(current), index_params.get("nlist", DEFAULT_NLIST))
+    ):
+        previous, index, records, old_entries = None, None, {}, {}
+        filter_index = build_filter_index([])
+        removed, added = _diff_manifest(old_entries, hashes)
+
+    if index is not None and removed:
+        remove_ids = np.array([old_entries[k]["id"] for k in removed], dtype=np.int64)
+        index.remove_ids(remove_ids)
+        remove_from_filter_index(filter_index, remove_ids)
+        for fid in remove_ids:
+            records.pop(int(fid), None)
+
+    if added:
+        # Load embedding model
+        model = SentenceTransformer(EMBEDDING_MODEL)
+
+        # Generate embeddings
+        documents = [log_to_document(current[k]) for k in added]
+        embeddings = model.encode(documents, convert_to_numpy=True).astype(np.float32)
+        add_ids = np.array([faiss_id(k) for k in added], dtype=np.int64)
+
+        # Create FAISS index (trained on the full corpus for IVF types)
+        if index is None:
+            index = build_index(index_type, embeddings, **index_params)
+        index.add_with_ids(embeddings, add_ids)
+
+        for k, fid in zip(added, add_ids):
+            records[int(fid)] = current[k]
+        add_to_filter_index(filter_index, ((fid, current[k]) for k, fid in zip(added, add_ids)))
+
+    if index is None:
+        if not os.path.exists(resolve_index_path(index_path)):
+            print("No maintenance logs to embed.")
+            return {"added": 0, "removed": 0, "total": 0}
+        # Every log is gone: replace the stale index with an empty one (a
+        # flat one, as IVF cannot train on nothing)
+        if dimension is None:
+            dimension = SentenceTransformer(EMBEDDING_MODEL).get_sentence_embedding_dimension()
+        index_type = "flat"
+        index = build_index(index_type, np.empty((0, dimension), dtype=np.float32))
+
+    if previous is not None and not added and not removed:
+        print("Maintenance index already up to date.")
+        return {"added": 0, "removed": 0, "total": index.ntotal}
+
+    entries = {k: {"id": faiss_id(k), "hash": hashes[k]} for k in current}
+
+    _publish_generation(
+        index_path, index, records, filter_index,
+        {"id_field": id_field, "index_type": index_type, "index_params": index_params,
+         "entries": entries}
+    )
+
+    print(
+        f"Maintenance logs embedded: {len(added)} added/updated, "
+        f"{len(removed)} removed, {index.ntotal} total."
+    )
+    return {"added": len(added), "removed": len(removed), "total": index.ntotal}
 
-    # Convert each record to text (important for retrieval quality)
-    documents = []
-    for log in logs:
-        text = (
-            f"Equipment: {log['equipment_type']}. "
-            f"Thermal pattern: {log['thermal_pattern']}. "
-            f"Observed temperature: {log['observed_temperature']}. "
-            f"Failure mode: {log['failure_mode']}. "
-            f"Root cause: {log['root_cause']}. "
-            f"Action taken: {log['action_taken']}. "
-            f"Downtime hours: {log['downtime_hours']}. "
-            f"Repair cost USD: {log['repair_cost_usd']}."
-        )
-        documents.append(text)
-
-    # Load embedding model
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-
-    # Generate embeddings
-    embeddings = model.encode(documents, convert_to_numpy=True)
-
-    # Create FAISS index
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(embeddings)
-
-    # Save index
-    faiss.write_index(index, index_path)
-
-    print("Maintenance logs embedded and FAISS index created.")
-    return documents
 
 if __name__ == "__main__":
-    embed_maintenance_logs()
+    import argparse
+    from rag.index_factory import INDEX_TYPES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default=None,
+                        help="Default: the existing index's type, else flat")
+    args = parser.parse_args()
+
+    embed_maintenance_logs(incremental=args.incremental, index_type=args.index_type)
@@ -0,0 +1,157 @@
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+DEFAULT_NLIST = 1024
+
+# Map the index file instead of reading it, so the codes stay in the page
+# cache. IO_FLAG_MMAP_IFC maps flat, HNSW and IVF storage alike; combined
+# with IO_FLAG_MMAP it makes IVF loads fail ("mmap only supported for File
+# objects"). Older faiss builds without it fall back to IO_FLAG_MMAP.
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+# faiss warns below ~39 training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def _clamp_nlist(nlist, n_train):
+    return max(1, min(nlist, n_train // _MIN_POINTS_PER_CENTROID))
+
+
+def _clamp_pq_nbits(nbits, n_train):
+    # PQ trains 2**nbits centroids per sub-quantizer
+    per_centroid = max(n_train // _MIN_POINTS_PER_CENTROID, 2)
+    return max(1, min(nbits, int(np.log2(per_centroid))))
+
+
+def build_index(
+    index_type,
+    training_vectors,
+    nlist=DEFAULT_NLIST,
+    pq_m=16,
+    pq_nbits=8,
+    hnsw_m=32,
+    ef_construction=200
+):
+    """
+    Creates (and trains, if needed) an ID-carrying FAISS index of the given
+    type. IVF parameters are clamped so small corpora still train.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"index_type must be one of {INDEX_TYPES}, got {index_type!r}")
+
+    training_vectors = np.ascontiguousarray(training_vectors, dtype=np.float32)
+    n_train, dimension = training_vectors.shape
+
+    if index_type == "flat":
+        base = faiss.IndexFlatL2(dimension)
+    elif index_type == "hnsw":
+        base = faiss.IndexHNSWFlat(dimension, hnsw_m)
+        base.hnsw.efConstruction = ef_construction
+    elif index_type == "ivf_flat":
+        quantizer = faiss.IndexFlatL2(dimension)
+        base = faiss.IndexIVFFlat(quantizer, dimension, _clamp_nlist(nlist, n_train))
+    else:
+        if dimension % pq_m:
+            raise ValueError(f"pq_m={pq_m} must divide the embedding dimension {dimension}")
+        quantizer = faiss.IndexFlatL2(dimension)
+        base = faiss.IndexIVFPQ(
+            quantizer, dimension, _clamp_nlist(nlist, n_train),
+            pq_m, _clamp_pq_nbits(pq_nbits, n_train)
+        )
+
+    if not base.is_trained:
+        base.train(training_vectors)
+
+    if isinstance(base, faiss.IndexIVF):
+        # IVF stores IDs in its inverted lists. Wrapped in IndexIDMap, the
+        # map's id_map is compacted by remove_ids while the lists are not
+        # renumbered, and every later search returns shifted IDs.
+        return base
+    return faiss.IndexIDMap(base)
+
+
+def _base(index):
+    return faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+
+
+def has_ids(index):
+    """
+    True when search returns record IDs rather than row positions: an
+    IndexIDMap or a native IVF index (False for the legacy positional index)
+    """
+    return isinstance(index, (faiss.IndexIDMap, faiss.IndexIVF))
+
+
+def ids_drift_on_remove(index):
+    """
+    True for an IVF index wrapped in IndexIDMap (written before build_index
+    returned IVF indexes bare): remove_ids corrupts its ID mapping
+    """
+    return isinstance(index, faiss.IndexIDMap) and isinstance(_base(index), faiss.IndexIVF)
+
+
+def index_type_of(index):
+    """
+    Reverse of build_index: the INDEX_TYPES name of a (possibly ID-mapped) index
+    """
+    index = _base(index)
+
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    return "flat"
+
+
+def needs_retraining(index, n_vectors, nlist=DEFAULT_NLIST):
+    """
+    True for an IVF index whose nlist was clamped for a smaller corpus
+    once n_vectors supports at least twice as many lists
+    """
+    base = _base(index)
+    if not isinstance(base, faiss.IndexIVF):
+        return False
+    return _clamp_nlist(nlist, n_vectors) >= 2 * base.nlist
+
+
+def supports_remove(index_type):
+    # HNSW graphs cannot delete nodes; IVF removes natively (see build_index)
+    return index_type != "hnsw"
+
+
+def configure_search(index, nprobe=None, ef_search=None):
+    """
+    Applies query-time accuracy/speed knobs where the index supports them
+    """
+    base = _base(index)
+
+    if nprobe is not None and isinstance(base, faiss.IndexIVF):
+        base.nprobe = nprobe
+    if ef_search is not None and isinstance(base, faiss.IndexHNSW):
+        base.hnsw.efSearch = ef_search
+    return index
+
+
+def filtered_search_parameters(index, ids):
+    """
+    SearchParameters restricting a search to the given IDs, carrying over
+    the index's current nprobe / efSearch (the parameter objects would
+    otherwise reset them to defaults)
+    """
+    base = _base(index)
+    selector = faiss.IDSelectorBatch(np.ascontiguousarray(ids, dtype=np.int64))
+
+    if isinstance(base, faiss.IndexIVF):
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=base.nprobe)
+    elif isinstance(base, faiss.IndexHNSW):
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=base.hnsw.efSearch)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+
+    # The parameter object does not own the selector; keep it alive
+    params.selector_ref = selector
+    return params
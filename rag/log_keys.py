@@ -0,0 +1,16 @@
+import hashlib
+import json
+
+
+def content_hash(log):
+    canonical = json.dumps(log, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def record_key(log, id_field="log_id"):
+    """
+    Stable identity of a log: its CMMS ID when present, else its content
+    """
+    if log.get(id_field) is not None:
+        return str(log[id_field])
+    return "sha256:" + content_hash(log)
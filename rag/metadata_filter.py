@@ -0,0 +1,85 @@
+import json
+from functools import reduce
+
+import numpy as np
+
+# Structured log fields that can be used to pre-filter retrieval
+FILTER_FIELDS = ("equipment_type", "failure_mode", "thermal_pattern")
+
+
+def build_filter_index(items):
+    """
+    Inverted index {field: {value: set(ids)}} from (id, record) pairs
+    """
+    filter_index = {field: {} for field in FILTER_FIELDS}
+    add_to_filter_index(filter_index, items)
+    return filter_index
+
+
+def add_to_filter_index(filter_index, items):
+    for record_id, record in items:
+        for field in FILTER_FIELDS:
+            value = record.get(field)
+            if value is not None:
+                filter_index[field].setdefault(str(value), set()).add(int(record_id))
+
+
+def remove_from_filter_index(filter_index, record_ids):
+    record_ids = {int(i) for i in record_ids}
+    for values in filter_index.values():
+        for value in list(values):
+            values[value] -= record_ids
+            if not values[value]:
+                del values[value]
+
+
+def write_filter_index(filter_index, path):
+    with open(path, "w") as f:
+        json.dump({
+            field: {value: sorted(ids) for value, ids in values.items()}
+            for field, values in filter_index.items()
+        }, f)
+
+
+def freeze_filter_index(filter_index):
+    """
+    Read-optimized copy: sorted int64 arrays instead of sets
+    """
+    return {
+        field: {value: np.array(sorted(ids), dtype=np.int64) for value, ids in values.items()}
+        for field, values in filter_index.items()
+    }
+
+
+def load_filter_index(path, as_sets=False):
+    with open(path, "r") as f:
+        raw = json.load(f)
+
+    convert = set if as_sets else (lambda ids: np.array(ids, dtype=np.int64))
+    return {
+        field: {value: convert(ids) for value, ids in values.items()}
+        for field, values in raw.items()
+    }
+
+
+def select_ids(filter_index, filters):
+    """
+    Candidate IDs matching all filters (AND across fields, OR across the
+    values listed for one field). Returns None when there is nothing to filter.
+    """
+    if not filters:
+        return None
+
+    per_field = []
+    for field, wanted in filters.items():
+        if field not in filter_index:
+            raise ValueError(f"Cannot filter on {field!r}; supported: {FILTER_FIELDS}")
+
+        values = [wanted] if isinstance(wanted, str) else list(wanted)
+        matches = [filter_index[field].get(str(v)) for v in values]
+        matches = [np.asarray(m, dtype=np.int64) for m in matches if m is not None]
+        per_field.append(
+            np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+        )
+
+    return reduce(np.intersect1d, per_field)
@@ -0,0 +1,89 @@
+import json
+import mmap
+import os
+
+import numpy as np
+
+# One row per record, sorted by id so lookups are a binary search
+INDEX_DTYPE = np.dtype([("id", "<i8"), ("offset", "<u8"), ("length", "<u4")])
+
+
+def _encode(record):
+    if isinstance(record, (bytes, bytearray, memoryview)):
+        return bytes(record)
+    return json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+
+def write_record_store(records, data_path, index_path):
+    """
+    Packs {id: record} into a data file of concatenated JSON blobs plus a
+    sorted (id, offset, length) table. Records may be dicts or raw bytes
+    already in the packed format.
+    """
+    ids = sorted(records)
+    table = np.zeros(len(ids), dtype=INDEX_DTYPE)
+
+    offset = 0
+    with open(data_path, "wb") as f:
+        for row, record_id in enumerate(ids):
+            blob = _encode(records[record_id])
+            f.write(blob)
+            table[row] = (record_id, offset, len(blob))
+            offset += len(blob)
+
+    # np.save appends .npy to names without it; write through a handle
+    with open(index_path, "wb") as f:
+        np.save(f, table)
+
+
+class RecordStore:
+    """
+    Read-only, memory-mapped record store.
+
+    Nothing is parsed at open time; get() decodes a single record. Pages
+    are shared through the OS page cache between processes.
+    """
+
+    def __init__(self, data_path, index_path):
+        self.table = np.load(index_path, mmap_mode="r")
+        self._ids = self.table["id"]
+
+        self._file = open(data_path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b""
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, record_id):
+        return self._row(record_id) is not None
+
+    def _row(self, record_id):
+        pos = int(np.searchsorted(self._ids, record_id))
+        if pos < len(self._ids) and self._ids[pos] == record_id:
+            return pos
+        return None
+
+    def raw(self, record_id):
+        row = self._row(record_id)
+        if row is None:
+            raise KeyError(record_id)
+        offset = int(self.table["offset"][row])
+        return self._data[offset:offset + int(self.table["length"][row])]
+
+    def get(self, record_id):
+        return json.loads(self.raw(record_id))
+
+    def ids(self):
+        return np.asarray(self._ids)
+
+    def items_raw(self):
+        for record_id, offset, length in self.table:
+            yield int(record_id), self._data[int(offset):int(offset) + int(length)]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
@@ -1,29 +1,187 @@
 import faiss
 from sentence_transformers import SentenceTransformer
 import json
+import os
+import threading
 import numpy as np
+from collections import OrderedDict
+
+from rag.embed_logs import EMBEDDING_MODEL, resolve_index_path, sidecar_paths
+from rag.index_factory import (
+    MMAP_FLAGS,
+    configure_search,
+    filtered_search_parameters,
+    has_ids,
+    index_type_of,
+)
+from rag.metadata_filter import (
+    build_filter_index,
+    freeze_filter_index,
+    load_filter_index,
+    select_ids,
+)
+from rag.record_store import RecordStore
+
+
+def normalize_query(query_text):
+    """
+    Cache key for a query: case- and whitespace-insensitive
+    (all-MiniLM-L6-v2 is an uncased model, so the embedding is unchanged)
+    """
+    return " ".join(query_text.lower().split())
+
 
 class MaintenanceVectorStore:
     def __init__(
         self,
         index_path="rag/maintenance.index",
-        json_path="data/maintenance_logs.json"
+        json_path="data/maintenance_logs.json",
+        cache_size=1024,
+        nprobe=None,
+        ef_search=None,
+        mmap=False
     ):
-        self.index = faiss.read_index(index_path)
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        index_path = resolve_index_path(index_path)
+        self.index = faiss.read_index(index_path, MMAP_FLAGS if mmap else 0)
+        self.index_type = index_type_of(self.index)
+        configure_search(self.index, nprobe=nprobe, ef_search=ef_search)
+        self.model = SentenceTransformer(EMBEDDING_MODEL)
+
+        # ID-mapped index: records are read on demand from the record store.
+        # Legacy positional index: FAISS row i is logs[i].
+        self.index_path = index_path
+        self.records = self._load_records(index_path)
+        if self.records is None:
+            with open(json_path, "r") as f:
+                self.logs = json.load(f)
+
+        # Metadata inverted index, loaded on the first filtered query
+        self._filter_index = None
+
+        # LRU query-embedding cache
+        self.cache_size = cache_size
+        self._embedding_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _load_records(self, index_path):
+        records_data, records_index, _, _ = sidecar_paths(index_path)
+        if not has_ids(self.index) or not os.path.exists(records_index):
+            return None
+
+        records = RecordStore(records_data, records_index)
+        if len(records) != self.index.ntotal:
+            records.close()
+            raise ValueError(
+                f"{records_index} does not match {index_path} "
+                f"({len(records)} records vs {self.index.ntotal} vectors); "
+                "re-run rag/embed_logs.py"
+            )
+        return records
+
+    def _record(self, idx):
+        if self.records is not None:
+            return self.records.get(int(idx))
+        return self.logs[idx]
+
+    def filter_index(self):
+        if self._filter_index is None:
+            filters_path = sidecar_paths(self.index_path)[3]
+            if self.records is not None and os.path.exists(filters_path):
+                self._filter_index = load_filter_index(filters_path)
+            elif self.records is None:
+                self._filter_index = freeze_filter_index(
+                    build_filter_index(enumerate(self.logs))
+                )
+            else:
+                raise ValueError(
+                    f"{filters_path} is missing; re-run rag/embed_logs.py "
+                    "to enable filtered retrieval"
+                )
+        return self._filter_index
+
+    def cache_info(self):
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._embedding_cache),
+            "max_size": self.cache_size,
+        }
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._embedding_cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+
+    def encode_queries(self, query_texts):
+        """
+        Returns a (n, dim) float32 matrix; cache misses are encoded
+        together in a single forward pass
+        """
+        keys = [normalize_query(q) for q in query_texts]
+
+        # The LRU is shared by concurrent callers (server threads, overlapped
+        # pipeline workers); the encode itself runs outside the lock
+        found = {}
+        missing = []
+        seen = set()
+        with self._cache_lock:
+            for key in keys:
+                if key in found:
+                    self.cache_hits += 1
+                elif key in self._embedding_cache:
+                    self._embedding_cache.move_to_end(key)
+                    found[key] = self._embedding_cache[key]
+                    self.cache_hits += 1
+                elif key not in seen:
+                    seen.add(key)
+                    missing.append(key)
+                    self.cache_misses += 1
+                else:
+                    self.cache_hits += 1  # duplicate within this batch
+
+        if missing:
+            new_embeddings = self.model.encode(missing, convert_to_numpy=True)
+            found.update(zip(missing, new_embeddings))
+
+        embeddings = np.stack([found[key] for key in keys]).astype(np.float32)
+
+        if self.cache_size > 0 and missing:
+            with self._cache_lock:
+                for key in missing:
+                    self._embedding_cache[key] = found[key]
+                    self._embedding_cache.move_to_end(key)
+                while len(self._embedding_cache) > self.cache_size:
+                    self._embedding_cache.popitem(last=False)
+
+        return embeddings
+
+    def retrieve_many(self, query_texts, top_k=3, filters=None):
+        """
+        Batch retrieval: one encode pass and one FAISS search for all queries.
 
-        with open(json_path, "r") as f:
-            self.logs = json.load(f)
+        filters, e.g. {"equipment_type": "motor", "failure_mode": [...]},
+        restrict the search inside FAISS to matching log IDs.
+        """
+        if not query_texts:
+            return []
 
-    def retrieve(self, query_text, top_k=3):
-        query_embedding = self.model.encode(
-            [query_text], convert_to_numpy=True
-        )
+        params = None
+        candidate_ids = select_ids(self.filter_index(), filters) if filters else None
+        if candidate_ids is not None:
+            if len(candidate_ids) == 0:
+                return [[] for _ in query_texts]
+            params = filtered_search_parameters(self.index, candidate_ids)
 
-        distances, indices = self.index.search(query_embedding, top_k)
+        query_embeddings = self.encode_queries(query_texts)
+        distances, indices = self.index.search(query_embeddings, top_k, params=params)
 
-        results = []
-        for idx in indices[0]:
-            results.append(self.logs[idx])
+        return [
+            [self._record(idx) for idx in row if idx != -1]
+            for row in indices
+        ]
 
-        return results
+    def retrieve(self, query_text, top_k=3, filters=None):
+        return self.retrieve_many([query_text], top_k=top_k, filters=filters)[0]
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_STORE_PATH = os.environ.get("COPILOT_FEATURE_STORE", "feature_store.sqlite3")
+
+# Stored per frame; same names as detect_thermal_anomaly's features
+STORE_COLUMNS = (
+    "mean_temperature",
+    "max_temperature",
+    "temperature_delta",
+    "hotspot_count",
+    "severity_score",
+)
+
+_AGGREGATES = {"mean": "AVG", "min": "MIN", "max": "MAX"}
+
+
+class FeatureStore:
+    """
+    Persistent per-asset time series of anomaly features (SQLite).
+
+    Rows are clustered on (asset_id, ts) in a WITHOUT ROWID table, so the
+    history of one asset over a time range is a single contiguous index
+    scan. Writing the same (asset_id, ts) twice keeps the latest values,
+    which makes re-ingesting a recording idempotent.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        # Streamlit reruns the script on other threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            "asset_id TEXT NOT NULL, ts REAL NOT NULL, "
+            "mean_temperature REAL, max_temperature REAL, temperature_delta REAL, "
+            "hotspot_count INTEGER, severity_score REAL, "
+            "PRIMARY KEY (asset_id, ts)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def append(self, asset_id, features, ts=None):
+        self.append_many(asset_id, [features], [time.time() if ts is None else ts])
+
+    def append_many(self, asset_id, feature_rows, timestamps):
+        """
+        Writes many frames of one asset in a single transaction
+        """
+        rows = [
+            (str(asset_id), float(ts), *(f.get(c) for c in STORE_COLUMNS))
+            for f, ts in zip(feature_rows, timestamps)
+        ]
+        placeholders = ", ".join("?" * (2 + len(STORE_COLUMNS)))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO features (asset_id, ts, {', '.join(STORE_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+            self._conn.commit()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def _columnar(self, rows, names):
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        return {
+            name: np.asarray(values, dtype=np.float64)
+            for name, values in zip(names, columns)
+        }
+
+    def query(self, asset_id, start=None, end=None, columns=STORE_COLUMNS, limit=None):
+        """
+        Frames of one asset with start <= ts < end, oldest first, as a
+        columnar dict {"ts": array, column: array, ...}. limit keeps the
+        most recent frames.
+        """
+        for c in columns:
+            if c not in STORE_COLUMNS:
+                raise ValueError(f"Unknown feature column {c!r}; stored: {STORE_COLUMNS}")
+
+        sql = f"SELECT ts, {', '.join(columns)} FROM features WHERE asset_id = ?"
+        params = [str(asset_id)]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < ?"
+            params.append(end)
+
+        if limit is not None:
+            sql = f"SELECT * FROM ({sql} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+            params.append(int(limit))
+        else:
+            sql += " ORDER BY ts"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return self._columnar(rows, ("ts",) + tuple(columns))
+
+    def downsample(self, asset_id, bucket_s, start=None, end=None,
+                   columns=STORE_COLUMNS, agg="mean"):
+        """
+        One row per bucket_s-wide time bucket (aggregated in SQLite), with
+        "ts" the bucket start and "frames" the number of frames in it
+        """
+        if agg not in _AGGREGATES:
+            raise ValueError(f"agg must be one of {tuple(_AGGREGATES)}")
+        for c in columns:
+            if c not in STORE_COLUMNS:
+                raise ValueError(f"Unknown feature column {c!r}; stored: {STORE_COLUMNS}")
+
+        func = _AGGREGATES[agg]
+        bucket = "CAST(ts / ? AS INTEGER)"
+        sql = (
+            f"SELECT {bucket} * ? AS bucket_ts, COUNT(*), "
+            + ", ".join(f"{func}({c})" for c in columns)
+            + " FROM features WHERE asset_id = ?"
+        )
+        params = [float(bucket_s), float(bucket_s), str(asset_id)]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < ?"
+            params.append(end)
+        sql += " GROUP BY bucket_ts ORDER BY bucket_ts"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return self._columnar(rows, ("ts", "frames") + tuple(columns))
+
+    def history(self, asset_id, limit=None):
+        """
+        Most recent frames as the list-of-dicts feature_history that
+        temporal.trend_analysis.analyze_trend expects, oldest first
+        """
+        data = self.query(asset_id, limit=limit)
+        return [
+            {c: data[c][i].item() for c in ("ts",) + STORE_COLUMNS}
+            for i in range(len(data["ts"]))
+        ]
+
+    def assets(self):
+        # Skip-scan over the primary key: one seek per asset instead of a
+        # full scan of every stored frame
+        with self._lock:
+            rows = self._conn.execute(
+                "WITH RECURSIVE a(id) AS ("
+                "SELECT MIN(asset_id) FROM features UNION ALL "
+                "SELECT (SELECT MIN(asset_id) FROM features WHERE asset_id > a.id) "
+                "FROM a WHERE a.id IS NOT NULL) "
+                "SELECT id FROM a WHERE id IS NOT NULL"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def count(self, asset_id):
+        with self._lock:
+            (n,) = self._conn.execute(
+                "SELECT COUNT(*) FROM features WHERE asset_id = ?", (str(asset_id),)
+            ).fetchone()
+        return n
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,232 @@
+import numpy as np
+
+from temporal.trend_analysis import (
+    WORSENING_SEVERITY_SLOPE,
+    WORSENING_TEMPERATURE_SLOPE,
+)
+
+URGENCY_ORDER = ("high", "medium", "low", "insufficient_data")
+
+
+# Signals an RUL can be estimated for. There is no default failure limit:
+# a fault rule's trigger (e.g. severity > 0.8) is not one, and healthy
+# 8-bit frames already score above it.
+RUL_SIGNALS = ("severity_score", "temperature_delta")
+
+
+# -------------------------
+# Ragged histories
+# -------------------------
+def ragged_from_histories(histories, x_field=None):
+    """
+    Packs per-asset lists of feature dicts (analyze_trend input) into
+    flat columns plus per-asset lengths
+    """
+    lengths = np.array([len(h) for h in histories], dtype=np.int64)
+    ragged = {
+        "lengths": lengths,
+        "severity_score": np.array(
+            [f["severity_score"] for h in histories for f in h], dtype=np.float64
+        ),
+        "temperature_delta": np.array(
+            [f["temperature_delta"] for h in histories for f in h], dtype=np.float64
+        ),
+    }
+    if x_field is not None:
+        ragged["x"] = np.array([f[x_field] for h in histories for f in h], dtype=np.float64)
+    return ragged
+
+
+def ragged_from_store(feature_store, asset_ids=None, start=None, end=None, limit=None):
+    """
+    Reads the history of many assets from a temporal.feature_store.FeatureStore.
+    Returns (asset_ids, ragged) with x = timestamps in seconds.
+    """
+    asset_ids = feature_store.assets() if asset_ids is None else list(asset_ids)
+    columns = ("severity_score", "temperature_delta")
+    parts = [
+        feature_store.query(a, start=start, end=end, columns=columns, limit=limit)
+        for a in asset_ids
+    ]
+
+    def concat(name):
+        arrays = [p[name] for p in parts]
+        return np.concatenate(arrays) if arrays else np.empty(0)
+
+    return asset_ids, {
+        "lengths": np.array([len(p["ts"]) for p in parts], dtype=np.int64),
+        "x": concat("ts"),
+        "severity_score": concat("severity_score"),
+        "temperature_delta": concat("temperature_delta"),
+    }
+
+
+def _sample_index(lengths):
+    # 0..n-1 within every asset, like analyze_trend's range(len(history))
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.arange(lengths.sum(), dtype=np.float64) - starts
+
+
+# -------------------------
+# Vectorized fits
+# -------------------------
+def fit_ragged_slopes(y, lengths, x=None):
+    """
+    Ordinary least-squares line per asset for all assets at once.
+
+    y, x: flat arrays holding every asset's samples back to back;
+    lengths: samples per asset. Without x the sample index is used.
+    Assets with fewer than 2 samples (or constant x) get NaN slopes.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    y = np.asarray(y, dtype=np.float64)
+    x = _sample_index(lengths) if x is None else np.asarray(x, dtype=np.float64)
+
+    n_assets = len(lengths)
+    group = np.repeat(np.arange(n_assets), lengths)
+
+    def group_sum(values):
+        return np.bincount(group, weights=values, minlength=n_assets)
+
+    n = lengths.astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = group_sum(x) / n
+        mean_y = group_sum(y) / n
+
+        # Centered sums: stable even when x is an epoch timestamp
+        dx = x - mean_x[group]
+        dy = y - mean_y[group]
+        sxx = group_sum(dx * dx)
+        sxy = group_sum(dx * dy)
+
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+
+        residual = y - (intercept[group] + slope[group] * x)
+        dof = n - 2
+        residual_var = np.where(dof > 0, group_sum(residual * residual) / dof, np.nan)
+        slope_se = np.sqrt(residual_var / sxx)
+
+    last = np.cumsum(lengths) - 1
+    has_data = lengths > 0
+    x_last = np.full(n_assets, np.nan)
+    x_last[has_data] = x[last[has_data]]
+
+    return {
+        "samples": lengths,
+        "slope": slope,
+        "intercept": intercept,
+        "slope_se": slope_se,
+        "x_last": x_last,
+        "level": intercept + slope * x_last,  # fitted value at the last sample
+    }
+
+
+def estimate_rul(fit, threshold, z=1.96):
+    """
+    Time (in x units) until the fitted line reaches threshold, with bounds
+    from slope +/- z standard errors. inf = not heading for the threshold.
+    The lower bound (fast degradation) is the pessimistic estimate.
+    """
+    slope, level, se = fit["slope"], fit["level"], fit["slope_se"]
+    remaining = np.maximum(threshold - level, 0.0)
+
+    def time_to_threshold(rate):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(rate > 0, remaining / rate, np.inf)
+        t = np.where(remaining == 0, 0.0, t)
+        return np.where(np.isnan(slope), np.nan, t)
+
+    # With fewer than 3 samples there is no residual error; the bounds
+    # collapse onto the point estimate
+    se = np.nan_to_num(se, nan=0.0)
+    return {
+        "rul": time_to_threshold(slope),
+        "rul_lower": time_to_threshold(slope + z * se),
+        "rul_upper": time_to_threshold(slope - z * se),
+    }
+
+
+def classify_trends(severity_slope, temp_slope):
+    """
+    Vectorized temporal.trend_analysis.classify_trend
+    """
+    worsening = (severity_slope > WORSENING_SEVERITY_SLOPE) & (temp_slope > WORSENING_TEMPERATURE_SLOPE)
+    slow = severity_slope > 0
+    missing = np.isnan(severity_slope) | np.isnan(temp_slope)
+
+    trend = np.select(
+        [missing, worsening, slow],
+        ["insufficient_data", "worsening", "slow_worsening"],
+        "stable"
+    )
+    urgency = np.select(
+        [missing, worsening, slow],
+        ["insufficient_data", "high", "medium"],
+        "low"
+    )
+    return trend, urgency
+
+
+# -------------------------
+# Fleet ranking
+# -------------------------
+def rank_fleet_trends(asset_ids, ragged, threshold, signal="severity_score",
+                      z=1.96, min_samples=3):
+    """
+    "What fails next": slopes, trend labels and RUL for every asset, as a
+    columnar dict sorted by the pessimistic RUL (soonest first), then by
+    urgency. Assets with fewer than min_samples samples sort last.
+
+    threshold: the failure limit of `signal`, configured for the fleet, in
+    the units the features were extracted in. severity_score is a ratio;
+    temperature_delta is in intensity levels for min-max normalized 8-bit
+    frames (0-255, where healthy motors already show ~100+) or degrees C
+    for radiometric frames (cv.radiometric). RUL is the time until the
+    fitted trend reaches it.
+
+    ragged: {"lengths", "severity_score", "temperature_delta", optional "x"}
+    (see ragged_from_histories / ragged_from_store). RUL and level are
+    fitted against x (in x units, e.g. seconds); the trend/urgency labels
+    and the reported slopes are fitted against the sample index, the
+    units of analyze_trend's per-sample thresholds.
+    """
+    if signal not in RUL_SIGNALS:
+        raise ValueError(f"signal must be one of {RUL_SIGNALS}")
+    if threshold is None or not np.isfinite(threshold):
+        raise ValueError(f"threshold must be the configured failure limit of {signal}")
+
+    lengths = np.asarray(ragged["lengths"], dtype=np.int64)
+    x = ragged.get("x")
+    severity_fit = fit_ragged_slopes(ragged["severity_score"], lengths)
+    temperature_fit = fit_ragged_slopes(ragged["temperature_delta"], lengths)
+    signal_fit = severity_fit if signal == "severity_score" else temperature_fit
+    if x is not None:
+        signal_fit = fit_ragged_slopes(ragged[signal], lengths, x)
+
+    rul = estimate_rul(signal_fit, threshold, z)
+    too_short = lengths < min_samples
+    for key in rul:
+        rul[key] = np.where(too_short, np.nan, rul[key])
+
+    trend, urgency = classify_trends(severity_fit["slope"], temperature_fit["slope"])
+    trend = np.where(too_short, "insufficient_data", trend)
+    urgency = np.where(too_short, "insufficient_data", urgency)
+
+    urgency_rank = np.select(
+        [urgency == u for u in URGENCY_ORDER], np.arange(len(URGENCY_ORDER))
+    )
+    # lexsort: last key is primary; NaN RULs sort after every number
+    order = np.lexsort((urgency_rank, np.nan_to_num(rul["rul_lower"], nan=np.inf), too_short))
+
+    return {
+        "asset_id": np.asarray(asset_ids, dtype=object)[order],
+        "samples": lengths[order],
+        "severity_slope": severity_fit["slope"][order],
+        "temperature_slope": temperature_fit["slope"][order],
+        "trend": trend[order],
+        "urgency": urgency[order],
+        "level": signal_fit["level"][order],
+        "threshold": threshold,
+        **{key: values[order] for key, values in rul.items()},
+    }
@@ -0,0 +1,177 @@
+import math
+from collections import deque
+
+from temporal.trend_analysis import insufficient_trend_report, trend_report
+
+
+class OnlineSlope:
+    """
+    Least-squares slope of y over x, updated in O(1) per observation.
+
+    Keeps weighted means and centered co-moments (Welford/West updates)
+    rather than raw power sums, and measures x from the first observation,
+    so x can be an ever-growing frame counter or epoch timestamp without
+    cancellation.
+
+    window: only the last `window` observations count (None = all).
+    decay: per-observation forgetting factor in (0, 1]; 1 = plain OLS.
+    Both together give an exponentially weighted sliding window.
+    """
+
+    def __init__(self, window=None, decay=1.0):
+        if window is not None and window < 2:
+            raise ValueError("window must be >= 2")
+        if not 0.0 < decay <= 1.0:
+            raise ValueError("decay must be in (0, 1]")
+
+        self.window = window
+        self.decay = decay
+        # Weight an observation has left when it slides out of the window
+        self._exit_weight = decay ** window if window is not None else None
+        self._values = deque() if window is not None else None
+
+        self.n = 0
+        self.x0 = None  # x origin: the first observation
+        self.weight = 0.0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxx = 0.0
+        self.cxy = 0.0
+
+    def update(self, x, y):
+        if self.x0 is None:
+            self.x0 = float(x)
+        x, y = float(x) - self.x0, float(y)
+
+        # Age everything seen so far, then add the new point with weight 1
+        self.weight = self.decay * self.weight + 1.0
+        self.cxx *= self.decay
+        self.cxy *= self.decay
+
+        dx = x - self.mean_x
+        self.mean_x += dx / self.weight
+        self.mean_y += (y - self.mean_y) / self.weight
+        self.cxx += dx * (x - self.mean_x)
+        self.cxy += dx * (y - self.mean_y)
+        self.n += 1
+
+        if self._values is not None:
+            self._values.append((x, y))
+            if len(self._values) > self.window:
+                self._remove(*self._values.popleft(), self._exit_weight)
+
+    def _remove(self, x, y, w):
+        # Exact inverse of adding (x, y) with weight w
+        weight = self.weight - w
+        mean_x = (self.weight * self.mean_x - w * x) / weight
+        self.cxx -= w * (x - mean_x) * (x - self.mean_x)
+        self.cxy -= w * (x - mean_x) * (y - self.mean_y)
+        self.mean_y = (self.weight * self.mean_y - w * y) / weight
+        self.mean_x = mean_x
+        self.weight = weight
+        self.n -= 1
+
+    @property
+    def slope(self):
+        if self.n < 2 or self.cxx <= 0.0:
+            return 0.0
+        return self.cxy / self.cxx
+
+
+class Cusum:
+    """
+    Two-sided tabular CUSUM change-point detector.
+
+    The in-control mean and standard deviation are learned from the first
+    `warmup` samples (and again after every alarm). k and h are in units
+    of that standard deviation: drift allowance and alarm threshold.
+    Only the last max_change_points alarms are kept, so a long-running
+    stream does not grow without bound.
+    """
+
+    def __init__(self, k=0.5, h=5.0, warmup=20, min_std=1e-6, max_change_points=100):
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.min_std = min_std
+        self.change_points = deque(maxlen=max_change_points)
+        self._reset_baseline()
+
+    def _reset_baseline(self):
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.high = 0.0
+        self.low = 0.0
+
+    def update(self, y, index=None):
+        """
+        Returns "increase" / "decrease" when a shift is detected, else None
+        """
+        y = float(y)
+
+        if self._count < self.warmup:
+            self._count += 1
+            delta = y - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (y - self._mean)
+            return None
+
+        std = max(math.sqrt(self._m2 / max(self._count - 1, 1)), self.min_std)
+        z = (y - self._mean) / std
+        self.high = max(0.0, self.high + z - self.k)
+        self.low = max(0.0, self.low - z - self.k)
+
+        if self.high > self.h or self.low > self.h:
+            direction = "increase" if self.high > self.h else "decrease"
+            self.change_points.append((index, direction))
+            self._reset_baseline()
+            return direction
+        return None
+
+
+class TrendTracker:
+    """
+    Streaming replacement for analyze_trend on one asset: O(1) work per
+    frame, same report format and trend labels, plus CUSUM change points
+    on severity_score and temperature_delta.
+
+    By default x is the sample number, which reproduces analyze_trend's
+    np.polyfit over range(n); pass x (e.g. a timestamp) to update() to fit
+    against time instead.
+    """
+
+    def __init__(self, window=None, decay=1.0, cusum_k=0.5, cusum_h=5.0,
+                 cusum_warmup=20):
+        self.severity = OnlineSlope(window, decay)
+        self.temperature = OnlineSlope(window, decay)
+        self.severity_cusum = Cusum(cusum_k, cusum_h, cusum_warmup)
+        self.temperature_cusum = Cusum(cusum_k, cusum_h, cusum_warmup)
+        self.samples = 0
+
+    def update(self, features, x=None):
+        x = self.samples if x is None else x
+        self.severity.update(x, features["severity_score"])
+        self.temperature.update(x, features["temperature_delta"])
+
+        changes = {}
+        for name, detector in (
+            ("severity_score", self.severity_cusum),
+            ("temperature_delta", self.temperature_cusum),
+        ):
+            direction = detector.update(features[name], index=x)
+            if direction is not None:
+                changes[name] = direction
+
+        self.samples += 1
+        return self.report(changes)
+
+    def report(self, changes=None):
+        if self.severity.n < 2:
+            report = insufficient_trend_report()
+        else:
+            report = trend_report(self.severity.slope, self.temperature.slope)
+
+        report["samples"] = self.severity.n
+        report["change_detected"] = changes or {}
+        return report
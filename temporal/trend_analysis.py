@@ -1,34 +1,34 @@
 from typing import List, Dict
 import numpy as np
 
+# Slopes (per sample) above which a trend counts as rapidly worsening
+WORSENING_SEVERITY_SLOPE = 0.2
+WORSENING_TEMPERATURE_SLOPE = 5
 
-def analyze_trend(feature_history: List[Dict]) -> Dict:
-    """
-    Analyze temporal trends in thermal anomaly features.
-    """
 
-    if len(feature_history) < 2:
-        return {
-            "trend": "insufficient_data",
-            "urgency": "low",
-            "explanation": "Not enough historical data to determine trend."
-        }
-
-    severity_scores = [f["severity_score"] for f in feature_history]
-    temp_deltas = [f["temperature_delta"] for f in feature_history]
+def insufficient_trend_report() -> Dict:
+    return {
+        "trend": "insufficient_data",
+        "urgency": "low",
+        "explanation": "Not enough historical data to determine trend."
+    }
 
-    severity_slope = np.polyfit(range(len(severity_scores)), severity_scores, 1)[0]
-    temp_slope = np.polyfit(range(len(temp_deltas)), temp_deltas, 1)[0]
 
-    if severity_slope > 0.2 and temp_slope > 5:
-        trend = "worsening"
-        urgency = "high"
+def classify_trend(severity_slope, temp_slope):
+    """
+    Maps the two slopes to (trend, urgency); shared by the batch fit below
+    and the online estimator in temporal/online_trend.py
+    """
+    if severity_slope > WORSENING_SEVERITY_SLOPE and temp_slope > WORSENING_TEMPERATURE_SLOPE:
+        return "worsening", "high"
     elif severity_slope > 0:
-        trend = "slow_worsening"
-        urgency = "medium"
+        return "slow_worsening", "medium"
     else:
-        trend = "stable"
-        urgency = "low"
+        return "stable", "low"
+
+
+def trend_report(severity_slope, temp_slope) -> Dict:
+    trend, urgency = classify_trend(severity_slope, temp_slope)
 
     return {
         "trend": trend,
@@ -40,3 +40,20 @@ def analyze_trend(feature_history: List[Dict]) -> Dict:
             f"{trend.replace('_', ' ')} pattern over time."
         )
     }
+
+
+def analyze_trend(feature_history: List[Dict]) -> Dict:
+    """
+    Analyze temporal trends in thermal anomaly features.
+    """
+
+    if len(feature_history) < 2:
+        return insufficient_trend_report()
+
+    severity_scores = [f["severity_score"] for f in feature_history]
+    temp_deltas = [f["temperature_delta"] for f in feature_history]
+
+    severity_slope = np.polyfit(range(len(severity_scores)), severity_scores, 1)[0]
+    temp_slope = np.polyfit(range(len(temp_deltas)), temp_deltas, 1)[0]
+
+    return trend_report(severity_slope, temp_slope)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from cv.anomaly_detection import detect_thermal_anomaly
+
+
+def test_uint8_severity_is_the_plain_ratio_below_a_mean_of_one():
+    img = np.zeros((100, 100), dtype=np.uint8)
+    img[:5, :10] = 2  # mean 0.01
+
+    features, _ = detect_thermal_anomaly(img)
+
+    mean_temp, max_temp = img.mean(), img.max()
+    assert features["severity_score"] == float(round((max_temp - mean_temp) / mean_temp, 2))
+
+
+def test_black_frame_scores_zero():
+    for dtype in (np.uint8, np.float32):
+        features, _ = detect_thermal_anomaly(np.zeros((10, 10), dtype=dtype))
+        assert features["severity_score"] == 0.0
+
+
+def test_celsius_frame_near_zero_scores_its_delta():
+    img = np.full((10, 10), -0.2, dtype=np.float32)
+    img[0, 0] = 3.0
+
+    features, _ = detect_thermal_anomaly(img)
+
+    assert features["severity_score"] == features["temperature_delta"]
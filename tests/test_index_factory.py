@@ -0,0 +1,98 @@
+import faiss
+import numpy as np
+import pytest
+
+from rag.index_factory import (
+    INDEX_TYPES,
+    MMAP_FLAGS,
+    build_index,
+    configure_search,
+    filtered_search_parameters,
+    index_type_of,
+    supports_remove,
+)
+
+
+def _corpus(n=4000, dimension=32, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dimension)).astype(np.float32)
+    ids = np.arange(n, dtype=np.int64) * 7 + 1000
+    return vectors, ids
+
+
+@pytest.mark.parametrize("index_type", [t for t in INDEX_TYPES if supports_remove(t)])
+def test_search_after_remove_returns_the_right_ids(index_type):
+    vectors, ids = _corpus()
+    index = build_index(index_type, vectors, nlist=16, pq_m=8)
+    index.add_with_ids(vectors, ids)
+    configure_search(index, nprobe=16)
+
+    index.remove_ids(ids[:500])
+    assert index.ntotal == len(ids) - 500
+
+    # Each query is a stored vector: its own ID must come back first
+    _, found = index.search(vectors[500:600], 1)
+    assert (found[:, 0] == ids[500:600]).mean() >= 0.95
+    assert not np.isin(found, ids[:500]).any()
+
+
+@pytest.mark.parametrize("index_type", [t for t in INDEX_TYPES if supports_remove(t)])
+def test_remove_then_re_add_keeps_ids(index_type):
+    # A changed record is a remove plus an add under the same ID
+    vectors, ids = _corpus()
+    index = build_index(index_type, vectors, nlist=16, pq_m=8)
+    index.add_with_ids(vectors, ids)
+    configure_search(index, nprobe=16)
+
+    index.remove_ids(ids[:100])
+    index.add_with_ids(vectors[:100], ids[:100])
+
+    _, found = index.search(vectors[:200], 1)
+    assert (found[:, 0] == ids[:200]).mean() >= 0.95
+
+
+@pytest.mark.parametrize("index_type", INDEX_TYPES)
+def test_filtered_search_only_returns_selected_ids(index_type):
+    vectors, ids = _corpus()
+    index = build_index(index_type, vectors, nlist=16, pq_m=8)
+    index.add_with_ids(vectors, ids)
+    configure_search(index, nprobe=16, ef_search=64)
+    if supports_remove(index_type):
+        index.remove_ids(ids[:500])
+
+    allowed = ids[1000:1200]
+    params = filtered_search_parameters(index, allowed)
+    _, found = index.search(vectors[1000:1010], 5, params=params)
+    assert np.isin(found[found >= 0], allowed).all()
+    assert (found[:, 0] == ids[1000:1010]).mean() >= 0.9
+
+
+def test_round_trip_keeps_ids(tmp_path):
+    vectors, ids = _corpus()
+    for index_type in INDEX_TYPES:
+        index = build_index(index_type, vectors, nlist=16, pq_m=8)
+        index.add_with_ids(vectors, ids)
+        if supports_remove(index_type):
+            index.remove_ids(ids[:500])
+
+        path = str(tmp_path / f"{index_type}.index")
+        faiss.write_index(index, path)
+        loaded = configure_search(faiss.read_index(path), nprobe=16, ef_search=64)
+
+        _, found = loaded.search(vectors[600:610], 1)
+        assert (found[:, 0] == ids[600:610]).mean() >= 0.9, index_type
+
+
+@pytest.mark.parametrize("index_type", INDEX_TYPES)
+def test_mmap_load(tmp_path, index_type):
+    vectors, ids = _corpus()
+    index = build_index(index_type, vectors, nlist=16, pq_m=8)
+    index.add_with_ids(vectors, ids)
+    path = str(tmp_path / f"{index_type}.index")
+    faiss.write_index(index, path)
+
+    loaded = configure_search(faiss.read_index(path, MMAP_FLAGS), nprobe=16, ef_search=64)
+    assert index_type_of(loaded) == index_type
+    assert loaded.ntotal == len(ids)
+
+    _, found = loaded.search(vectors[:10], 1)
+    assert (found[:, 0] == ids[:10]).mean() >= 0.9
@@ -0,0 +1,42 @@
+import cv2
+import numpy as np
+import pytest
+
+from cv.tiled_analysis import analyze_rois, analyze_tiles, merge_tiles_by_asset
+
+
+def _panorama(seed=0):
+    # Noisy, blurred 4K bay of 20 warm motors, each with one hot bearing
+    rng = np.random.default_rng(seed)
+    img = (25 + rng.normal(0, 0.5, (2160, 3840))).astype(np.float32)
+    rois = {}
+    for i in range(20):
+        r, c = divmod(i, 5)
+        x, y = 200 + c * 700, 150 + r * 500
+        img[y:y + 200, x:x + 300] += 12
+        cv2.circle(img, (x + 220, y + 60), 15, 60.0, -1)
+        rois[f"motor_{i}"] = [x - 40, y - 40, 380, 280]
+    return cv2.GaussianBlur(img, (7, 7), 2), rois
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.uint8])
+def test_tiled_and_roi_modes_find_one_hotspot_per_motor(dtype):
+    img, rois = _panorama()
+    if dtype == np.uint8:
+        img = cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+
+    by_roi = analyze_rois(img, rois)
+    by_tile = merge_tiles_by_asset(analyze_tiles(img, assets=rois), rois)
+
+    for asset_id in rois:
+        assert by_roi[asset_id]["hotspot_count"] == 1
+        assert by_tile[asset_id]["hotspot_count"] == 1
+        assert by_tile[asset_id]["max_temperature"] == by_roi[asset_id]["max_temperature"]
+
+
+def test_background_tiles_have_no_hotspots():
+    img, _ = _panorama()
+    tiles = analyze_tiles(img)
+    # The right-most column of tiles lies beyond the last motor
+    background = [t for t in tiles if t["bbox"][0] > 3300]
+    assert background and all(t["hotspot_count"] == 0 for t in background)